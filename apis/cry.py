@@ -1,18 +1,29 @@
 # apis/cry.py
-from fastapi import APIRouter, Depends, Query, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
+from typing import Optional
 
 from auth.auth_bearer import JWTBearer
-from services.cry import cry_service
+from apis.etag import PetDataETag
+from services.cry import async_cry_service
+from services.cry_predict import cry_predict
+from services.cry_predict_cache import predict_cache
+from services.cry_inspect_cache import inspect_cache
+from services.cry_job import cry_job_service
 from schemas.cry import *
-from db import get_db_session
+from enums.inspect import InspectGranularityEnum
+from db import get_api_db_session
+from utils.async_db import DBSession
 from error.exceptions import *
 from error.handler import handle_http_exceptions
+from utils.response import cry_response
+from utils.fields import parse_fields
 
 router = APIRouter(
     prefix="/cry",
     tags=["cry"],
+    default_response_class=ORJSONResponse,
     responses={404: {"description": "Not found"}},
 )
 
@@ -21,104 +32,222 @@ router = APIRouter(
 @handle_http_exceptions
 async def create_cry_endpoint(
         create_cry_input: CreateCryInput,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> CreateCryOutput:
-    cry = await cry_service.create_cry(db, create_cry_input, user_id).to_korean()
-    return CreateCryOutput(cry=cry, success=True, message="Cry created successfully")
+    cry = await async_cry_service.create_cry(db, create_cry_input, user_id)
+    return cry_response(CreateCryOutput(cry=cry, success=True, message="Cry created successfully"))
+
+
+@router.post("/bulk", dependencies=[Depends(JWTBearer())], response_model=BulkCreateCryOutput)
+@handle_http_exceptions
+async def bulk_create_cries_endpoint(
+        bulk_create_cry_input: BulkCreateCryInput,
+        idempotency_key: Optional[str] = Header(
+            None, alias="Idempotency-Key", max_length=128,
+            description="Retries with the same key return the first result instead of inserting again"),
+        db: DBSession = Depends(get_api_db_session),
+        user_id: str = Depends(JWTBearer())) -> BulkCreateCryOutput:
+    results, replayed = await async_cry_service.bulk_create_cries(
+        db, bulk_create_cry_input.cries, user_id, idempotency_key)
+    created = sum(result.status == 'created' for result in results)
+    return BulkCreateCryOutput(results=results, created=created, rejected=len(results) - created,
+                               replayed=replayed, success=True, message=f"{created} cries created")
 
 
 @router.get("/cry/{cry_id}", dependencies=[Depends(JWTBearer())], response_model=GetCryOutput)
 @handle_http_exceptions
-def get_cry_endpoint(
+async def get_cry_endpoint(
         cry_id: int,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> GetCryOutput:
-    cry = cry_service.get_cry_by_id(db, cry_id, user_id).to_korean()
-    return GetCryOutput(cry=cry, success=True, message="Cry fetched successfully")
+    cry = await async_cry_service.get_cry_by_id(db, cry_id, user_id)
+    return cry_response(GetCryOutput(cry=cry, success=True, message="Cry fetched successfully"))
 
 
-@router.get("/pet/{pet_id}", dependencies=[Depends(JWTBearer())], response_model=GetPetCriesOutput)
+@router.get("/pet/{pet_id}", dependencies=[Depends(JWTBearer()), Depends(PetDataETag())], response_model=GetPetCriesOutput)
 @handle_http_exceptions
-def get_pet_cries_endpoint(
+async def get_pet_cries_endpoint(
         pet_id: int,
-        db: Session = Depends(get_db_session),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default and maximum apply)"),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated cry fields to return, e.g. id,time,state,intensity (default: all)"),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> GetPetCriesOutput:
-    cries = cry_service.get_all_cries_by_pet(db, pet_id, user_id)
-    for i in range(len(cries)):
-        cries[i] = cries[i].to_korean()
-    return GetPetCriesOutput(cries=cries, success=True, message="Cries fetched successfully")
+    fields = parse_fields(fields, CRY_FIELDS)
+    cries, next_cursor = await async_cry_service.get_all_cries_by_pet(db, pet_id, user_id, cursor, limit, fields)
+    return cry_response(GetPetCriesOutput(
+        cries=cries, next_cursor=next_cursor, success=True, message="Cries fetched successfully"), fields)
 
 
-@router.get("/search/state", dependencies=[Depends(JWTBearer())], response_model=GetCriesWithStateOutput)
+@router.get("/search/state", dependencies=[Depends(JWTBearer()), Depends(PetDataETag())], response_model=GetCriesWithStateOutput)
 @handle_http_exceptions
-def get_pets_with_state_endpoint(
+async def get_pets_with_state_endpoint(
         pet_id: int = Query(..., description="ID of the pet"),
         query_state: str = Query(..., description="State to filter cries"),
-        db: Session = Depends(get_db_session),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default and maximum apply)"),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated cry fields to return, e.g. id,time,state,intensity (default: all)"),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> GetCriesWithStateOutput:
-    cries = cry_service.get_pets_with_state(
-        db, pet_id, query_state, user_id)
-    for i in range(len(cries)):
-        cries[i] = cries[i].to_korean()
-    return GetCriesWithStateOutput(cries=cries, success=True, message="Cries fetched successfully")
+    fields = parse_fields(fields, CRY_FIELDS)
+    cries, next_cursor = await async_cry_service.get_pets_with_state(
+        db, pet_id, query_state, user_id, cursor, limit, fields)
+    return cry_response(GetCriesWithStateOutput(
+        cries=cries, next_cursor=next_cursor, success=True, message="Cries fetched successfully"), fields)
 
 
-@router.get("/search/time", dependencies=[Depends(JWTBearer())], response_model=GetCriesBetweenTimeOutput)
+@router.get("/search/time", dependencies=[Depends(JWTBearer()), Depends(PetDataETag())], response_model=GetCriesBetweenTimeOutput)
 @handle_http_exceptions
-def get_pets_between_time_endpoint(
+async def get_pets_between_time_endpoint(
         pet_id: int = Query(..., description="ID of the pet"),
         start_time: datetime = Query(...,
                                      description="Start time in ISO format"),
         end_time: datetime = Query(..., description="End time in ISO format"),
-        db: Session = Depends(get_db_session),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default and maximum apply)"),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated cry fields to return, e.g. id,time,state,intensity (default: all)"),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> GetCriesBetweenTimeOutput:
-    cries = cry_service.get_pets_between_time(
-        db, pet_id, start_time, end_time, user_id)
-    for i in range(len(cries)):
-        cries[i] = cries[i].to_korean()
-    return GetCriesBetweenTimeOutput(cries=cries, success=True, message="Cries fetched successfully")
+    fields = parse_fields(fields, CRY_FIELDS)
+    cries, next_cursor = await async_cry_service.get_pets_between_time(
+        db, pet_id, start_time, end_time, user_id, cursor, limit, fields)
+    return cry_response(GetCriesBetweenTimeOutput(
+        cries=cries, next_cursor=next_cursor, success=True, message="Cries fetched successfully"), fields)
 
 
-@router.get("/inspect", dependencies=[Depends(JWTBearer())])
+@router.get("/changes", dependencies=[Depends(JWTBearer()), Depends(PetDataETag())], response_model=GetCryChangesOutput)
+@handle_http_exceptions
+async def get_cry_changes_endpoint(
+        pet_id: int = Query(..., description="ID of the pet"),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous sync (omit for a full sync)"),
+        limit: Optional[int] = Query(
+            None, ge=1, description="Page size (server default and maximum apply)"),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated cry fields to return, e.g. id,time,state,intensity (default: all)"),
+        db: DBSession = Depends(get_api_db_session),
+        user_id: str = Depends(JWTBearer())) -> GetCryChangesOutput:
+    fields = parse_fields(fields, CRY_FIELDS)
+    cries, deleted, next_cursor, has_more = await async_cry_service.get_cry_changes(
+        db, pet_id, user_id, cursor, limit, fields)
+    return cry_response(GetCryChangesOutput(
+        cries=cries, deleted=deleted, next_cursor=next_cursor, has_more=has_more,
+        success=True, message="Cry changes fetched successfully"), fields)
+
+
+@router.get("/inspect", dependencies=[Depends(JWTBearer()), Depends(PetDataETag(daily=True))])
 @handle_http_exceptions
-def inspect_cry_endpoint(
+async def inspect_cry_endpoint(
         pet_id: int = Query(..., description="ID of the pet"),
-        db: Session = Depends(get_db_session),
+        window: int = Query(
+            30, description="Analysis window in days (7, 30, 90 or 365)"),
+        granularity: InspectGranularityEnum = Query(
+            InspectGranularityEnum.DAILY, description="Bucket size of the cry frequency (hourly, daily or weekly)"),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())):
-    inspect_result = cry_service.inspect_cry(db, pet_id, user_id)
+    inspect_result = await async_cry_service.inspect_cry(
+        db, pet_id, user_id, window, granularity.value)
     return {"success": True, "message": "Cry inspected successfully", "result": inspect_result}
 
 
+@router.get("/stats/live", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+async def get_live_cry_stats_endpoint(
+        pet_id: int = Query(..., description="ID of the pet"),
+        db: DBSession = Depends(get_api_db_session),
+        user_id: str = Depends(JWTBearer())):
+    live_stats = await async_cry_service.get_live_stats(db, pet_id, user_id)
+    return {"success": True, "message": "Live cry stats fetched successfully", "result": live_stats}
+
+
+@router.get("/inspect/cache", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+def get_inspect_cache_stats_endpoint():
+    return {"success": True, "message": "Inspect cache stats fetched successfully", "result": inspect_cache.stats()}
+
+
 @router.post("/predict", dependencies=[Depends(JWTBearer())])
 @handle_http_exceptions
 async def predict_cry_endpoint(
         file: UploadFile = File(...),
         pet_id: int = Query(..., description="ID of the pet"),
-        db: Session = Depends(get_db_session),
+        async_mode: bool = Query(
+            False, description="Return a job id immediately and process the prediction in the background"),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> PredictCryOutput:
     if file == None or not file.filename.endswith(".wav"):
         raise WavFileNotFoundError("Wav file not found")
-    cry = await cry_service.predict_cry(db, file, pet_id, user_id)
+    if async_mode:
+        job = await cry_job_service.enqueue(db, file, pet_id, user_id)
+        return PredictCryOutput(job=job, success=True, message="Cry prediction job queued successfully")
+    cry = await async_cry_service.predict_cry(db, file, pet_id, user_id)
     return PredictCryOutput(cry=cry, success=True, message="Cry predicted successfully")
 
 
+@router.post("/predict/long", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+async def predict_long_cry_endpoint(
+        file: UploadFile = File(...),
+        pet_id: int = Query(..., description="ID of the pet"),
+        recorded_at: Optional[datetime] = Query(
+            None, description="Recording start time in ISO format"),
+        db: DBSession = Depends(get_api_db_session),
+        user_id: str = Depends(JWTBearer())) -> PredictLongCryOutput:
+    if file == None or not file.filename.endswith(".wav"):
+        raise WavFileNotFoundError("Wav file not found")
+    cries = await async_cry_service.predict_long_cry(db, file, pet_id, user_id, recorded_at)
+    return PredictLongCryOutput(cries=cries, success=True, message=f"{len(cries)} cries predicted successfully")
+
+
+@router.get("/jobs/{job_id}", dependencies=[Depends(JWTBearer())], response_model=GetCryJobOutput)
+@handle_http_exceptions
+async def get_cry_job_endpoint(
+        job_id: str,
+        wait: float = Query(
+            0, ge=0, le=30, description="Seconds to wait for the job to finish (long-poll)"),
+        db: DBSession = Depends(get_api_db_session),
+        user_id: str = Depends(JWTBearer())) -> GetCryJobOutput:
+    job = await cry_job_service.get_job(db, job_id, user_id, wait)
+    return GetCryJobOutput(job=job, success=True, message="Cry job fetched successfully")
+
+
+@router.get("/predict/cache", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+def get_predict_cache_stats_endpoint():
+    return {"success": True, "message": "Predict cache stats fetched successfully", "result": predict_cache.stats()}
+
+
+@router.get("/predict/backends", dependencies=[Depends(JWTBearer())])
+@handle_http_exceptions
+def get_predict_backend_stats_endpoint():
+    return {"success": True, "message": "AI server stats fetched successfully", "result": cry_predict.backend_stats()}
+
+
 @router.put("/{cry_id}", dependencies=[Depends(JWTBearer())], response_model=UpdateCryOutput)
 @handle_http_exceptions
-def update_cry_endpoint(
+async def update_cry_endpoint(
         cry_id: int,
         update_cry_input: UpdateCryInput,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> UpdateCryOutput:
-    cry = cry_service.update_cry(
-        db, cry_id, update_cry_input, user_id).to_korean()
-    return UpdateCryOutput(cry=cry, success=True, message="Cry updated successfully")
+    cry = await async_cry_service.update_cry(db, cry_id, update_cry_input, user_id)
+    return cry_response(UpdateCryOutput(cry=cry, success=True, message="Cry updated successfully"))
 
 
 @router.delete("/{cry_id}", dependencies=[Depends(JWTBearer())], response_model=DeleteCryOutput)
 @handle_http_exceptions
-def delete_cry_endpoint(
+async def delete_cry_endpoint(
         cry_id: int,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> DeleteCryOutput:
-    cry_service.delete_cry(db, cry_id, user_id)
+    await async_cry_service.delete_cry(db, cry_id, user_id)
     return DeleteCryOutput(success=True, message="Cry deleted successfully")
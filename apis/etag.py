@@ -0,0 +1,56 @@
+# apis/etag.py
+from datetime import date
+from fastapi import Depends, HTTPException, Request
+
+from auth.auth_bearer import JWTBearer
+from services.cry import async_cry_service
+from services.pet import async_pet_service
+from db import get_api_db_session
+from utils.async_db import DBSession
+from utils.etag import make_etag, match_etag
+
+
+def _check_etag(request: Request, *parts, weak: bool = False) -> None:
+    """
+    parts로 ETag를 만들어 If-None-Match와 같으면 304로 응답을 끝낸다 (endpoint의 서비스 쿼리를 실행하지 않는다).
+    다르면 request.state.etag에 남겨 ETagMiddleware가 200 응답에 붙이게 한다.
+    """
+    etag = make_etag(request.url.path, sorted(request.query_params.multi_items()), *parts, weak=weak)
+    matched = match_etag(request.headers.get('if-none-match'), etag)
+    if matched:
+        raise HTTPException(status_code=304, headers={'ETag': matched, 'Cache-Control': 'private, no-cache'})
+    request.state.etag = etag
+
+
+class PetDataETag:
+    """
+    반려동물 데이터(울음, 반려동물 정보) 조회용 ETag dependency. path/query의 pet_id와 반려동물 데이터 버전으로 ETag를 만든다.
+    소유자가 아니면 ETag 없이 endpoint로 넘겨 endpoint가 평소처럼 에러를 돌려주게 한다.
+    daily=True면 날짜도 ETag에 넣고 weak ETag로 만든다 (현재 시각 기준 기간을 분석하는 /cry/inspect).
+    분석 결과 캐시가 밀려나 같은 날 다시 계산하면 기간의 시작/끝 시각이 달라져 body가 달라질 수 있으므로
+    byte 단위로 같음을 약속하는 strong ETag를 쓰지 않는다.
+    """
+
+    def __init__(self, daily: bool = False):
+        self.daily = daily
+
+    async def __call__(self, request: Request, pet_id: int,
+                       db: DBSession = Depends(get_api_db_session),
+                       user_id: str = Depends(JWTBearer())) -> None:
+        version = await async_cry_service.get_data_version(db, pet_id, user_id)
+        if version is None:
+            return
+        parts = (user_id, version)
+        if self.daily:
+            parts += (date.today().isoformat(),)
+        _check_etag(request, *parts, weak=self.daily)
+
+
+async def user_pets_etag(request: Request, user_id: str,
+                         db: DBSession = Depends(get_api_db_session),
+                         requester_id: str = Depends(JWTBearer())) -> None:
+    """사용자의 반려동물 목록 조회용 ETag dependency. 반려동물마다 (pet_id, 데이터 버전)으로 ETag를 만든다."""
+    if user_id != requester_id:
+        return
+    versions = await async_pet_service.get_user_versions(db, user_id)
+    _check_etag(request, user_id, versions)
@@ -1,17 +1,21 @@
 # apis/pet.py
-from fastapi import APIRouter, Depends, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, UploadFile, File
+from typing import Optional
 from fastapi.responses import FileResponse
 import os
 
 from auth.auth_bearer import JWTBearer
-from services.pet import pet_service
+from apis.etag import PetDataETag, user_pets_etag
+from services.pet import async_pet_service
 from schemas.pet import *
-from db import get_db_session
+from db import get_api_db_session
+from utils.async_db import DBSession
 from error.exceptions import *
 from error.handler import handle_http_exceptions
 from constants.path import PET_PROFILE_DIR, ASSET_DIR
 from utils.os_utils import get_image_path
+from utils.fields import parse_fields
+from utils.response import sparse_response
 
 router = APIRouter(
     prefix="/pet",
@@ -22,37 +26,43 @@ router = APIRouter(
 
 @router.post("/create", dependencies=[Depends(JWTBearer())], response_model=CreatePetOutput)
 @handle_http_exceptions
-def create_pet_endpoint(
+async def create_pet_endpoint(
         create_pet_input: CreatePetInput,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> CreatePetOutput:
-    pet = pet_service.create_pet(db, create_pet_input, user_id).to_korean()
+    pet = (await async_pet_service.create_pet(db, create_pet_input, user_id)).to_korean()
     return CreatePetOutput(pet=pet, success=True, message="Pet created successfully")
 
 
-@router.get("/{pet_id}", dependencies=[Depends(JWTBearer())], response_model=GetPetOutput)
+@router.get("/{pet_id}", dependencies=[Depends(JWTBearer()), Depends(PetDataETag())], response_model=GetPetOutput)
 @handle_http_exceptions
-def get_pet_endpoint(
+async def get_pet_endpoint(
         pet_id: int,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> GetPetOutput:
-    pet = pet_service.get_pet_by_id(db, pet_id, user_id).to_korean()
+    pet = (await async_pet_service.get_pet_by_id(db, pet_id, user_id)).to_korean()
     return GetPetOutput(pet=pet, success=True, message="Pet fetched successfully")
 
 
-@router.get("/user/{user_id}", dependencies=[Depends(JWTBearer())], response_model=GetUserPetsOutput)
+@router.get("/user/{user_id}", dependencies=[Depends(JWTBearer()), Depends(user_pets_etag)], response_model=GetUserPetsOutput)
 @handle_http_exceptions
-def get_user_pets_endpoint(
+async def get_user_pets_endpoint(
         user_id: str,
-        db: Session = Depends(get_db_session),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated pet fields to return, e.g. id,name,species (default: all)"),
+        db: DBSession = Depends(get_api_db_session),
         requester_id: str = Depends(JWTBearer())) -> GetUserPetsOutput:
     if user_id != requester_id:
         raise UnauthorizedError("You are not authorized to view these pets")
 
-    pets = pet_service.get_all_pets_by_user(db, user_id)
+    fields = parse_fields(fields, PET_FIELDS)
+    pets = await async_pet_service.get_all_pets_by_user(db, user_id, fields)
     for i in range(len(pets)):
         pets[i] = pets[i].to_korean()
-    return GetUserPetsOutput(pets=pets, success=True, message="Pets fetched successfully")
+    output = GetUserPetsOutput(pets=pets, success=True, message="Pets fetched successfully")
+    if fields is None:
+        return output
+    return sparse_response(output, 'pets', fields)
 
 
 @router.get("/raw/profile/{file_id}")
@@ -68,29 +78,29 @@ async def read_file(file_id: str):
 async def upload_profile_image(
         pet_id: int,
         file: UploadFile = File(...),
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> BaseOutput:
-    success = pet_service.uploadProfileImage(file, db, pet_id, user_id)
+    success = await async_pet_service.uploadProfileImage(file, db, pet_id, user_id)
     return BaseOutput(success=success, message="Profile image uploaded successfully" if success else "Profile image upload failed")
 
 
 @router.put("/{pet_id}", dependencies=[Depends(JWTBearer())], response_model=UpdatePetOutput)
 @handle_http_exceptions
-def update_pet_endpoint(
+async def update_pet_endpoint(
         pet_id: int,
         update_pet_input: UpdatePetInput,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> UpdatePetOutput:
-    pet = pet_service.update_pet(
-        db, pet_id, update_pet_input, user_id).to_korean()
+    pet = (await async_pet_service.update_pet(
+        db, pet_id, update_pet_input, user_id)).to_korean()
     return UpdatePetOutput(pet=pet, success=True, message="Pet updated successfully")
 
 
 @router.delete("/{pet_id}", dependencies=[Depends(JWTBearer())], response_model=DeletePetOutput)
 @handle_http_exceptions
-def delete_pet_endpoint(
+async def delete_pet_endpoint(
         pet_id: int,
-        db: Session = Depends(get_db_session),
+        db: DBSession = Depends(get_api_db_session),
         user_id: str = Depends(JWTBearer())) -> DeletePetOutput:
-    pet_service.delete_pet(db, pet_id, user_id)
+    await async_pet_service.delete_pet(db, pet_id, user_id)
     return DeletePetOutput(success=True, message="Pet deleted successfully")
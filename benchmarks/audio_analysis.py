@@ -0,0 +1,45 @@
+# benchmarks/audio_analysis.py
+# 서버 측 오디오 분석(utils/audio.py)의 처리량(clips/sec)을 측정한다.
+# 사용법: python -m benchmarks.audio_analysis [clip 개수] [clip 길이(초)]
+import os
+import sys
+import time
+import wave
+import tempfile
+import numpy as np
+
+from utils.audio import analyze_wav
+
+
+def write_synthetic_cry(file_path: str, seconds: float, sample_rate: int = 16000) -> None:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    # 배경 소음 위에 0.5초 간격으로 울음 소리(배음 + 진폭 변조)를 얹는다
+    signal = 0.01 * rng.standard_normal(len(t))
+    envelope = (np.sin(2 * np.pi * 1.0 * t) > 0.3).astype(np.float32)
+    signal += 0.3 * envelope * np.sin(2 * np.pi * 600 * t) * (1 + 0.5 * np.sin(2 * np.pi * 5 * t))
+    pcm = (np.clip(signal, -1, 1) * 32767).astype('<i2')
+    with wave.open(file_path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+
+
+if __name__ == '__main__':
+    n_clips = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'cry.wav')
+        write_synthetic_cry(file_path, seconds)
+        analyze_wav(file_path)  # warm-up
+
+        start = time.perf_counter()
+        for _ in range(n_clips):
+            result = analyze_wav(file_path)
+        elapsed = time.perf_counter() - start
+
+    print(f"last result: {result}")
+    print(f"{n_clips} clips x {seconds}s: {elapsed:.3f}s "
+          f"({n_clips / elapsed:.1f} clips/sec, {elapsed / n_clips * 1000:.2f} ms/clip)")
@@ -0,0 +1,62 @@
+# benchmarks/cry_pagination.py
+# 울음 목록의 keyset(cursor) pagination과 OFFSET pagination의 페이지 깊이별 지연 시간을 비교한다.
+# 사용법: python -m benchmarks.cry_pagination [울음 개수]  (기본: 200000, 반려동물 하나)
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from db_base import DB_Base
+from model import CryTable
+from services.cry import cry_service
+from utils.converters import cry_table_to_schema
+from utils.pagination import encode_cursor
+from benchmarks.inspect_aggregation import seed
+
+PAGE_SIZE = 50
+REPEAT = 20
+
+
+def offset_page(db: Session, pet_id: int, page: int):
+    cry_tables = db.query(CryTable).filter(CryTable.pet_id == pet_id).order_by(
+        CryTable.time.desc(), CryTable.id.desc()).offset(page * PAGE_SIZE).limit(PAGE_SIZE).all()
+    return [cry_table_to_schema(cry) for cry in cry_tables]
+
+
+def keyset_page(db: Session, pet_id: int, cursor: str):
+    return cry_service._paginate(
+        db.query(CryTable).filter(CryTable.pet_id == pet_id), cursor, PAGE_SIZE)[0]
+
+
+def measure(func, *args) -> float:
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - started) / REPEAT
+
+
+if __name__ == '__main__':
+    n_cries = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        DB_Base.metadata.create_all(engine)
+
+        with Session(engine) as db:
+            pet_id = seed(db, n_cries, datetime.now(), days=400)
+            print(f"--- {n_cries} cries, page size {PAGE_SIZE} ---")
+            for page in (0, 10, 100, 1000, n_cries // PAGE_SIZE - 1):
+                # page 번째 페이지의 cursor = 이전 페이지 마지막 행의 (time, id)
+                cursor = None
+                if page > 0:
+                    last = db.query(CryTable.time, CryTable.id).filter(CryTable.pet_id == pet_id).order_by(
+                        CryTable.time.desc(), CryTable.id.desc()).offset(page * PAGE_SIZE - 1).first()
+                    cursor = encode_cursor(last.time, last.id)
+                assert [cry.id for cry in keyset_page(db, pet_id, cursor)] == \
+                    [cry.id for cry in offset_page(db, pet_id, page)]
+                print(f"page {page:>6}: offset {measure(offset_page, db, pet_id, page) * 1000:8.2f} ms, "
+                      f"keyset {measure(keyset_page, db, pet_id, cursor) * 1000:8.2f} ms")
+        engine.dispose()
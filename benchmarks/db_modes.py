@@ -0,0 +1,110 @@
+# benchmarks/db_modes.py
+# 동기 세션(DB_ASYNC=false)과 async 세션(DB_ASYNC=true) 모드에서 동시 요청 처리량과 지연 시간,
+# 이벤트 루프 지연(event loop lag)을 비교한다. 모드마다 임시 디렉토리에서 별도 프로세스로 앱을 띄운다.
+# 사용법: python -m benchmarks.db_modes [동시 요청 수] [요청 수]  (기본: 50 2000)
+import os
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATES = ['anger', 'play', 'happy', 'sad']
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: list, interval: float = 0.005):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - started - interval)
+
+
+async def run_worker(concurrency: int, n_requests: int):
+    import httpx
+    import main
+    import db as db_module
+    from auth.auth_handler import signJWT
+
+    # 요청마다 남는 로그가 측정을 방해하지 않도록 한다
+    logging.disable(logging.CRITICAL)
+    # ASGITransport는 lifespan을 실행하지 않으므로 스키마를 직접 만든다
+    db_module.init_db()
+    headers = {"Authorization": f"Bearer {signJWT('bench')['access_token']}"}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/user/me", json={"uid": "bench", "email": "bench@example.com", "nickname": "bench"})
+        response = await client.post("/pet/create", headers=headers, json={
+            "user_id": "bench", "name": "bench", "gender": "male", "age": 1,
+            "species": "dog", "sub_species": "bench"})
+        pet_id = response.json()["pet"]["id"]
+
+        # 읽기 대상이 되는 울음을 미리 만들어 둔다
+        now = datetime.now()
+        n_seed = 200
+        for i in range(n_seed):
+            await client.post("/cry/create", headers=headers, json={
+                "pet_id": pet_id, "time": (now - timedelta(days=1, seconds=i)).isoformat(),
+                "state": STATES[i % len(STATES)], "audioId": f"seed_{i}",
+                "predictMap": {STATES[i % len(STATES)]: 1.0}, "intensity": "medium", "duration": 3.0})
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = {'read': [], 'write': []}
+        errors = 0
+
+        async def one_request(i: int):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                # 쓰기 1 : 읽기 3 비율
+                if i % 4 == 0:
+                    kind = 'write'
+                    state = STATES[i % len(STATES)]
+                    response = await client.post("/cry/create", headers=headers, json={
+                        "pet_id": pet_id, "time": (now - timedelta(seconds=i)).isoformat(),
+                        "state": state, "audioId": f"bench_{i}", "predictMap": {state: 1.0},
+                        "intensity": "medium", "duration": 3.0})
+                else:
+                    kind = 'read'
+                    response = await client.get(f"/cry/cry/{i % n_seed + 1}", headers=headers)
+                latencies[kind].append(time.perf_counter() - started)
+                if response.status_code >= 500:
+                    errors += 1
+
+        stop = asyncio.Event()
+        lags = []
+        lag_task = asyncio.create_task(measure_loop_lag(stop, lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request(i) for i in range(n_requests)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await lag_task
+
+    mode = 'async' if db_module.DB_ASYNC else 'sync'
+    print(f"{mode:>6}: {n_requests / elapsed:8.1f} req/s, "
+          f"read p50 {percentile(latencies['read'], 0.5) * 1000:7.1f} ms / p99 {percentile(latencies['read'], 0.99) * 1000:7.1f} ms, "
+          f"write p50 {percentile(latencies['write'], 0.5) * 1000:7.1f} ms / p99 {percentile(latencies['write'], 0.99) * 1000:7.1f} ms, "
+          f"loop lag max {max(lags or [0]) * 1000:6.1f} ms, 5xx {errors}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        asyncio.run(run_worker(int(sys.argv[2]), int(sys.argv[3])))
+        sys.exit(0)
+
+    concurrency = sys.argv[1] if len(sys.argv) > 1 else '50'
+    n_requests = sys.argv[2] if len(sys.argv) > 2 else '2000'
+    print(f"--- {n_requests} requests, concurrency {concurrency} ---")
+    for db_async in ('false', 'true'):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = dict(os.environ, DB_ASYNC=db_async,
+                       PYTHONPATH=os.pathsep.join(filter(None, [REPO_DIR, os.environ.get('PYTHONPATH')])))
+            subprocess.run([sys.executable, '-m', 'benchmarks.db_modes', '--worker', concurrency, n_requests],
+                           cwd=tmp_dir, env=env, check=True)
@@ -0,0 +1,130 @@
+# benchmarks/db_profiles.py
+# DB backend 프로필별로 동시 읽기/쓰기 부하에서의 쓰기 처리량과 읽기 지연 시간을 비교한다.
+# - sqlite-legacy: 기존 설정 (rollback journal, synchronous=FULL, foreign_keys만 설정)
+# - sqlite-wal: db.SQLITE_PRAGMAS (WAL, synchronous=NORMAL, mmap_size, busy_timeout)
+# - mysql: DB_BENCH_MYSQL_URL 이 있을 때만 (db.MYSQL_POOL_OPTIONS 연결 풀 설정, 테이블을 만들고 끝나면 지운다)
+# 쓰기는 실제 API 경로(cry_service._create_cry: 울음 + 집계 테이블 + 버전을 한 트랜잭션으로)를 사용한다.
+# 사용법: python -m benchmarks.db_profiles [초] [쓰기 스레드 수] [읽기 스레드 수]  (기본: 10 4 8)
+import os
+import sys
+import time
+import random
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from core.env import env
+from db_base import DB_Base
+from db import SQLITE_PRAGMAS, create_db_engine
+from model import *
+from schemas.cry import CreateCryInput
+from services.cry import cry_service
+
+STATES = ['anger', 'play', 'happy', 'sad']
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def seed(session_factory, n_cries: int = 5000) -> int:
+    with session_factory() as db:
+        db.execute(insert(UserTable.__table__).values(
+            uid='bench', email='bench@example.com', nickname='bench'))
+        pet_id = db.execute(insert(PetTable.__table__).values(
+            name='bench', gender='male', age=1, species='dog',
+            sub_species='bench', user_id='bench')).inserted_primary_key[0]
+        now = datetime.now()
+        db.execute(insert(CryTable.__table__), [dict(
+            pet_id=pet_id, time=now - timedelta(seconds=i * 30), state=STATES[i % len(STATES)],
+            audioId=f'seed_{i}', predictMap={STATES[i % len(STATES)]: 1.0},
+            intensity='medium', duration=3.0) for i in range(n_cries)])
+        db.commit()
+    return pet_id
+
+
+def run_profile(name: str, engine, seconds: float, n_writers: int, n_readers: int):
+    DB_Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+    pet_id = seed(session_factory)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    writes, write_errors, read_latencies = [0], [0], []
+
+    def writer(worker_id: int):
+        rng = random.Random(worker_id)
+        with session_factory() as db:
+            while not stop.is_set():
+                state = rng.choice(STATES)
+                create_cry_input = CreateCryInput(
+                    pet_id=pet_id, time=datetime.now(), state=state,
+                    audioId=f'bench_{worker_id}', predictMap={state: 1.0},
+                    intensity='medium', duration=rng.uniform(1, 15))
+                try:
+                    cry_service._create_cry(db, create_cry_input, 'bench')
+                    with lock:
+                        writes[0] += 1
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        write_errors[0] += 1
+
+    def reader(worker_id: int):
+        latencies = []
+        with session_factory() as db:
+            while not stop.is_set():
+                started = time.perf_counter()
+                end = datetime.now()
+                cry_service.get_pets_between_time(
+                    db, pet_id, end - timedelta(hours=1), end, 'bench')
+                db.rollback()
+                latencies.append(time.perf_counter() - started)
+        with lock:
+            read_latencies.extend(latencies)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(n_writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(n_readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"{name:>14}: writes {writes[0] / seconds:8.1f}/s (errors {write_errors[0]}), "
+          f"reads {len(read_latencies) / seconds:8.1f}/s, "
+          f"read p50 {percentile(read_latencies, 0.5) * 1000:7.2f} ms / p99 {percentile(read_latencies, 0.99) * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    n_readers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    print(f"--- {seconds:g}s, {n_writers} writers, {n_readers} readers ---")
+
+    sqlite_profiles = (
+        ('sqlite-legacy', {'foreign_keys': 'ON'}),
+        ('sqlite-wal', SQLITE_PRAGMAS),
+    )
+    for name, pragmas in sqlite_profiles:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = create_db_engine(
+                f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", sqlite_pragmas=pragmas)
+            run_profile(name, engine, seconds, n_writers, n_readers)
+            engine.dispose()
+
+    mysql_url = env.get("DB_BENCH_MYSQL_URL")
+    if mysql_url:
+        engine = create_db_engine(mysql_url)
+        try:
+            run_profile('mysql', engine, seconds, n_writers, n_readers)
+        finally:
+            DB_Base.metadata.drop_all(engine)
+            engine.dispose()
@@ -0,0 +1,85 @@
+# benchmarks/delta_sync.py
+# 1년치 울음이 있는 반려동물에서 타임라인을 새로 고칠 때 옮겨지는 양을 비교한다.
+# - full: GET /cry/pet/{pet_id}로 모든 페이지를 다시 받는다 (기존 앱 동작)
+# - delta: 지난 동기화의 cursor로 GET /cry/changes를 호출해 바뀐 울음만 받는다
+# 처음 동기화(첫 요청들이라 warm-up 비용 포함)한 뒤 울음 10개 생성, 5개 수정, 5개 삭제를 하고 잰다.
+# 사용법: python -m benchmarks.delta_sync [하루 울음 수]  (기본: 30)
+import os
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+
+from benchmarks.sparse_fields import seed, read_timeline
+
+
+async def read_changes(client, headers: dict, pet_id: int, cursor) -> tuple:
+    """변경 feed를 끝까지 읽고 (울음 수, 삭제 수, 응답 body 합계 bytes, 요청 수, 다음 cursor)를 돌려준다."""
+    params = {'pet_id': pet_id, 'limit': 200}
+    if cursor:
+        params['cursor'] = cursor
+    n_cries, n_deleted, n_bytes, n_requests = 0, 0, 0, 0
+    while True:
+        response = await client.get('/cry/changes', params=params, headers=headers)
+        body = response.json()
+        n_cries += len(body['cries'])
+        n_deleted += len(body['deleted'])
+        n_bytes += len(response.content)
+        n_requests += 1
+        params['cursor'] = body['next_cursor']
+        if not body['has_more']:
+            return n_cries, n_deleted, n_bytes, n_requests, body['next_cursor']
+
+
+async def run(cries_per_day: int) -> None:
+    import httpx
+    import main
+    import db as db_module
+    from auth.auth_handler import signJWT
+
+    logging.disable(logging.CRITICAL)
+    db_module.init_db()
+    pet_id = seed(db_module, cries_per_day)
+    headers = {"Authorization": f"Bearer {signJWT('u1')['access_token']}"}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        n_cries, _, n_bytes, n_requests, cursor = await read_changes(client, headers, pet_id, None)
+        print(f"initial sync : {n_cries} cries in {n_requests} pages, {n_bytes / 1024:8.1f} KiB, "
+              f"{(time.perf_counter() - started) * 1000:7.1f} ms")
+
+        response = await client.get(f'/cry/pet/{pet_id}', params={'limit': 10}, headers=headers)
+        cry_ids = [cry['id'] for cry in response.json()['cries']]
+        for i in range(10):
+            await client.post('/cry/create', headers=headers, json={
+                'pet_id': pet_id, 'time': f'2030-01-01T10:{i:02d}:00', 'state': 'sad', 'audioId': f'new_{i}',
+                'predictMap': {'sad': 0.9, 'happy': 0.1}, 'intensity': 'high', 'duration': 3.0})
+        for cry_id in cry_ids[:5]:
+            await client.put(f'/cry/{cry_id}', json={'state': 'happy'}, headers=headers)
+        for cry_id in cry_ids[5:]:
+            await client.delete(f'/cry/{cry_id}', headers=headers)
+
+        started = time.perf_counter()
+        n_cries, n_bytes, n_requests = await read_timeline(client, headers, pet_id, None)
+        full_elapsed = time.perf_counter() - started
+        print(f"full refetch : {n_cries} cries in {n_requests} pages, {n_bytes / 1024:8.1f} KiB, "
+              f"{full_elapsed * 1000:7.1f} ms")
+
+        started = time.perf_counter()
+        n_cries, n_deleted, delta_bytes, n_requests, _ = await read_changes(client, headers, pet_id, cursor)
+        delta_elapsed = time.perf_counter() - started
+        print(f"delta sync   : {n_cries} cries + {n_deleted} deleted in {n_requests} pages, "
+              f"{delta_bytes / 1024:8.1f} KiB, {delta_elapsed * 1000:7.1f} ms")
+        print(f"delta / full : payload {delta_bytes / n_bytes * 100:.2f}%, "
+              f"latency {delta_elapsed / full_elapsed * 100:.2f}%")
+
+
+if __name__ == '__main__':
+    cries_per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.update(
+            DB_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", DB_ASYNC='false',
+            CRY_PAGE_SIZE_MAX='200', CRY_INSPECT_CACHE_DISK='false', CRY_PREDICT_CACHE_DISK='false')
+        asyncio.run(run(cries_per_day))
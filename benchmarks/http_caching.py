@@ -0,0 +1,86 @@
+# benchmarks/http_caching.py
+# 1년치 울음이 있는 반려동물의 타임라인(GET /cry/pet/{pet_id}, 모든 페이지)을 읽을 때 실제로 전송되는 bytes와 시간을 비교한다.
+# - identity / gzip / br: Accept-Encoding별 응답 body 크기 (CompressionMiddleware)
+# - 304: 직전 응답의 ETag로 If-None-Match를 보내 데이터가 바뀌지 않았음을 확인받는 재검증
+# 사용법: python -m benchmarks.http_caching [하루 울음 수]  (기본: 30)
+import os
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+
+from benchmarks.sparse_fields import seed
+
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+async def read_pages(client, headers: dict, pet_id: int, encoding: str, etags: dict) -> tuple:
+    """
+    모든 페이지를 읽고 (전송 bytes 합계, 200 수, 304 수)를 돌려준다.
+    etags(cursor -> ETag)에 있는 페이지는 If-None-Match를 보내고, 받은 ETag와 다음 cursor를 etags에 채운다.
+    """
+    cursor, n_bytes, n_ok, n_not_modified = None, 0, 0, 0
+    next_cursors = etags.setdefault('next', {})
+    while True:
+        params = {'limit': 200}
+        if cursor:
+            params['cursor'] = cursor
+        request_headers = {**headers, 'Accept-Encoding': encoding}
+        if cursor in etags:
+            request_headers['If-None-Match'] = etags[cursor]
+        response = await client.get(f'/cry/pet/{pet_id}', params=params, headers=request_headers)
+        n_bytes += int(response.headers.get('content-length', 0))
+        if response.status_code == 304:
+            n_not_modified += 1
+        else:
+            n_ok += 1
+            etags[cursor] = response.headers['etag']
+            next_cursors[cursor] = response.json()['next_cursor']
+        cursor = next_cursors[cursor]
+        if not cursor:
+            return n_bytes, n_ok, n_not_modified
+
+
+async def run(cries_per_day: int) -> None:
+    import httpx
+    import main
+    import db as db_module
+    from auth.auth_handler import signJWT
+
+    logging.disable(logging.CRITICAL)
+    db_module.init_db()
+    pet_id = seed(db_module, cries_per_day)
+    headers = {"Authorization": f"Bearer {signJWT('u1')['access_token']}"}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await read_pages(client, headers, pet_id, 'identity', {})  # warm-up (SQLite page cache)
+        results = {}
+        for encoding in ENCODINGS:
+            etags = {}
+            started = time.perf_counter()
+            n_bytes, n_ok, _ = await read_pages(client, headers, pet_id, encoding, etags)
+            elapsed = time.perf_counter() - started
+            results[encoding] = (n_bytes, elapsed)
+            print(f"{encoding:<9} {n_ok} pages (200): {n_bytes / 1024:8.1f} KiB, {elapsed * 1000:7.1f} ms")
+
+            started = time.perf_counter()
+            n_bytes, _, n_not_modified = await read_pages(client, headers, pet_id, encoding, etags)
+            elapsed = time.perf_counter() - started
+            print(f"{'':<9} {n_not_modified} pages (304): {n_bytes / 1024:8.1f} KiB, {elapsed * 1000:7.1f} ms")
+
+    full_bytes, _ = results['identity']
+    for encoding in ENCODINGS[1:]:
+        n_bytes, elapsed = results[encoding]
+        print(f"{encoding}: payload -{(1 - n_bytes / full_bytes) * 100:.0f}% "
+              f"({elapsed * 1000:.1f} ms incl. compression)")
+
+
+if __name__ == '__main__':
+    cries_per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.update(
+            DB_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", DB_ASYNC='false',
+            CRY_PAGE_SIZE_MAX='200', CRY_INSPECT_CACHE_DISK='false', CRY_PREDICT_CACHE_DISK='false')
+        asyncio.run(run(cries_per_day))
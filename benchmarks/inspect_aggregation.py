@@ -0,0 +1,134 @@
+# benchmarks/inspect_aggregation.py
+# inspect 분석의 기존 pandas 방식(전체 행을 DataFrame으로 읽어 집계)과
+# DB GROUP BY 집계(services/cry_inspect.py)의 지연 시간과 최대 메모리 사용량을 비교한다.
+# 사용법: python -m benchmarks.inspect_aggregation [울음 개수 ...]  (기본: 10000 100000 1000000)
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from db_base import DB_Base
+from model import *
+from services.cry_inspect import CryAggregate, cry_inspect_engine
+from services.cry_rollup import cry_rollup_service
+
+STATES = ['hunger', 'sad', 'happy', 'anger', 'play']
+
+
+def seed(db: Session, n_cries: int, end: datetime, days: int = 40) -> int:
+    db.execute(insert(UserTable.__table__).values(
+        uid='bench', email='bench@example.com', nickname='bench'))
+    pet_id = db.execute(insert(PetTable.__table__).values(
+        name='bench', gender='male', age=1, species='dog',
+        sub_species='bench', user_id='bench')).inserted_primary_key[0]
+
+    # 기간 밖의 기록도 섞어 WHERE 조건이 실제로 걸러내도록 한다
+    rng = random.Random(0)
+    batch = []
+    for _ in range(n_cries):
+        predict_map = {state: round(rng.random(), 4) for state in STATES}
+        batch.append(dict(
+            pet_id=pet_id,
+            time=end - timedelta(seconds=rng.randint(0, days * 86400)),
+            state=max(predict_map, key=predict_map.get),
+            audioId=f'{pet_id}_bench', predictMap=predict_map,
+            intensity='medium', duration=round(rng.uniform(1, 15), 2)))
+        if len(batch) == 10000:
+            db.execute(insert(CryTable.__table__), batch)
+            batch = []
+    if batch:
+        db.execute(insert(CryTable.__table__), batch)
+    db.commit()
+    cry_rollup_service.rebuild(db, pet_id)
+    return pet_id
+
+
+def legacy_inspect(db: Session, pet_id: int, start: datetime, end: datetime, log_id: str):
+    """기존 inspect_cry의 pandas 구현."""
+    query = db.query(CryTable).filter(
+        CryTable.pet_id == pet_id, CryTable.time >= start, CryTable.time <= end)
+    sql_query = query.statement.compile(
+        dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    df = pd.read_sql(sql_query, db.connection())
+
+    cry_freq_hour = df['time'].dt.hour.value_counts().sort_index()
+    cry_freq_date = df[['id']].groupby(df['time'].dt.date).count().reset_index()
+    cry_freq_date['time'] = cry_freq_date['time'].astype(str)
+    type_freq = df['state'].value_counts()
+    type_freq.sort_values(ascending=True, inplace=True)
+    duration_of_type = df[['state', 'duration']].groupby('state').mean()
+    duration_of_type.sort_values(by='duration', inplace=True)
+    min_value = duration_of_type['duration'].min().astype(int)
+    duration_of_type['duration'] -= min_value
+    bar_percent = (duration_of_type['duration'] /
+                   duration_of_type['duration'].max()).round(3)
+    return {
+        'logId': log_id,
+        'cry_freq_hour': cry_freq_hour.tolist(),
+        'cry_freq_date': {'date': cry_freq_date['time'].tolist(),
+                          'freqs': cry_freq_date['id'].tolist()},
+        'type_freq': type_freq.to_dict(),
+        'duration_of_type': {'type': duration_of_type.index.tolist(),
+                             'duration': duration_of_type['duration'].round(3).tolist(),
+                             'bar_percent': bar_percent.tolist()}
+    }
+
+
+def sql_group_by(db: Session, pet_id: int, start: datetime, end: datetime, log_id: str):
+    """집계 테이블 없이 cry 테이블만 GROUP BY."""
+    aggregate = cry_inspect_engine.aggregate_raw(
+        db, pet_id, start, end, CryAggregate())
+    cry_inspect_engine.load_first_seen(db, pet_id, start, end, aggregate)
+    return aggregate.to_inspect_result(log_id)
+
+
+def sql_rollup(db: Session, pet_id: int, start: datetime, end: datetime, log_id: str):
+    """services/cry_inspect.py 기본 경로: 미리 계산된 시간/일 단위 집계 + 양 끝 부분 시간만 GROUP BY."""
+    return cry_inspect_engine.aggregate(db, pet_id, start, end).to_inspect_result(log_id)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+
+    for n_cries in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = create_engine(
+                f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+            DB_Base.metadata.create_all(engine)
+            end = datetime.now()
+            start = end - timedelta(days=30)
+
+            with Session(engine) as db:
+                pet_id = seed(db, n_cries, end)
+                results = {}
+                print(f"--- {n_cries} cries ---")
+                for name, func in (('pandas', legacy_inspect),
+                                   ('sql group by', sql_group_by),
+                                   ('sql rollup', sql_rollup)):
+                    result, elapsed, peak = measure(
+                        func, db, pet_id, start, end, 'bench')
+                    # type_freq 등 dict의 순서도 같아야 한다
+                    results[name] = json.dumps(result)
+                    print(f"{name:>14}: {elapsed * 1000:9.1f} ms, "
+                          f"peak {peak / 1024 / 1024:8.2f} MiB")
+
+                print(f"identical output: {len(set(results.values())) == 1}")
+            engine.dispose()
@@ -0,0 +1,42 @@
+# benchmarks/inspect_windows.py
+# 분석 기간(7/30/90/365일)과 bucket 단위별 inspect 집계 지연 시간을 측정한다.
+# 1년치 울음이 많은 반려동물에서도 긴 기간의 비용이 짧은 기간과 비슷해야 한다.
+# 사용법: python -m benchmarks.inspect_windows [울음 개수]  (기본: 500000, 400일에 걸쳐 생성)
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from db_base import DB_Base
+from enums.inspect import allowed_inspect_window_days, allowed_inspect_granularity
+from services.cry_inspect import cry_inspect_engine
+from benchmarks.inspect_aggregation import seed
+
+REPEAT = 20
+
+
+if __name__ == '__main__':
+    n_cries = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        DB_Base.metadata.create_all(engine)
+        end = datetime.now()
+
+        with Session(engine) as db:
+            pet_id = seed(db, n_cries, end, days=400)
+            print(f"--- {n_cries} cries over 400 days ---")
+            for granularity in allowed_inspect_granularity:
+                for window_days in allowed_inspect_window_days:
+                    start = end - timedelta(days=window_days)
+                    started = time.perf_counter()
+                    for _ in range(REPEAT):
+                        aggregate = cry_inspect_engine.aggregate(
+                            db, pet_id, start, end, granularity)
+                    elapsed = (time.perf_counter() - started) / REPEAT
+                    print(f"{granularity:>7} {window_days:>4}d: {elapsed * 1000:8.2f} ms "
+                          f"({aggregate.total} cries, {len(aggregate.bucket_counts)} buckets)")
+        engine.dispose()
@@ -0,0 +1,160 @@
+# benchmarks/predict_map_storage.py
+# predictMap 저장 형식별 DB 크기와 행 decode 처리량을 비교한다.
+# - before: 기존 형식 (predictMap JSON 컬럼, NOT NULL)
+# - after: migration m0004를 같은 DB에 적용한 결과 (label schema id + float32 blob, 시간은 m0004만 잰다)
+# decode는 컬럼 값만 복원하는 경우(json.loads vs struct.unpack)와 API 경로(ORM 조회 + Cry schema 변환)를 잰다.
+# 확률 값은 두 종류로 잰다: AI 서버 출력(float32 softmax -> float32 blob), 소수점 3자리 값(-> float64 blob)
+# 사용법: python -m benchmarks.predict_map_storage [울음 수]  (기본: 100000)
+import gc
+import os
+import sys
+import time
+import json
+import random
+import struct
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, JSON, Float, Index, insert, text
+from sqlalchemy.orm import registry, sessionmaker
+
+from db import create_db_engine
+from migrations import migrate
+from migrations.versions import m0004_cry_predict_blob, m0006_cry_change_feed
+from model import *
+from utils.converters import cry_table_to_schema
+from model.predict_map import decode_predict_map
+
+STATES = {'dog': ['anger', 'play', 'happy', 'sad'], 'cat': ['happy', 'hunger', 'lonely']}
+
+# m0004 이전의 cry 테이블
+legacy_cry_table = Table(
+    'cry', MetaData(),
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('pet_id', Integer, nullable=False),
+    Column('time', DateTime, nullable=False),
+    Column('state', String(32), nullable=False),
+    Column('audioId', String(255), nullable=False),
+    Column('predictMap', JSON, nullable=False),
+    Column('intensity', String(16)),
+    Column('duration', Float),
+    Index('ix_cry_pet_id_time', 'pet_id', 'time'),
+    Index('ix_cry_pet_id_state_time', 'pet_id', 'state', 'time'),
+)
+
+
+class LegacyCry:
+    """m0004 이전 cry 행을 ORM으로 읽기 위한 클래스 (predictMap은 JSON 컬럼 그대로)"""
+
+
+registry().map_imperatively(LegacyCry, legacy_cry_table)
+
+
+def random_predict_map(rng: random.Random, labels, kind: str) -> dict:
+    """모든 라벨의 확률(합 1)을 만든다. ai: float32로 계산한 값, rounded: 소수점 3자리 값"""
+    weights = [rng.random() ** 3 for _ in labels]
+    total = sum(weights)
+    if kind == 'ai':
+        probs = struct.unpack(f'<{len(labels)}f', struct.pack(f'<{len(labels)}f', *(w / total for w in weights)))
+        return dict(zip(labels, probs))
+    return {label: round(weight / total, 3) for label, weight in zip(labels, weights)}
+
+
+def seed(engine, n_cries: int, kind: str) -> None:
+    rng = random.Random(0)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(UserTable.__table__).values(
+            uid='bench', email='bench@example.com', nickname='bench'))
+        pet_ids = {species: conn.execute(insert(PetTable.__table__).values(
+            name=species, gender='male', age=1, species=species, sub_species='bench',
+            user_id='bench')).inserted_primary_key[0] for species in STATES}
+        CryTable.__table__.drop(conn)
+        legacy_cry_table.create(conn)
+        rows = []
+        for i in range(n_cries):
+            species = 'dog' if i % 3 else 'cat'
+            predict_map = random_predict_map(rng, STATES[species], kind)
+            rows.append(dict(
+                pet_id=pet_ids[species], time=now - timedelta(seconds=i * 30),
+                state=max(predict_map, key=predict_map.get), audioId=f'bench_{i}',
+                predictMap=predict_map, intensity='medium', duration=3.0))
+        conn.execute(insert(legacy_cry_table), rows)
+
+
+def db_size(engine, path: str) -> int:
+    with engine.connect() as conn:
+        conn.execute(text("VACUUM"))
+    return os.path.getsize(path)
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """GC를 끄고 repeat번 실행한 가장 짧은 시간"""
+    elapsed = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(elapsed)
+
+
+def measure(label: str, engine, path: str, blob: bool) -> list:
+    column = "predict_schema, predict_probs" if blob else "predictMap"
+    with engine.connect() as conn:
+        raw = conn.exec_driver_sql(f"SELECT {column} FROM cry").fetchall()
+    if blob:
+        def decode_column():
+            return [decode_predict_map(schema_id, probs) for schema_id, probs in raw]
+    else:
+        def decode_column():
+            return [json.loads(predict_map) for predict_map, in raw]
+    column_elapsed = best_of(decode_column)
+
+    # API 경로: ORM 조회 -> cry_table_to_schema
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+    model = CryTable if blob else LegacyCry
+
+    def to_schema():
+        with session_factory() as db:
+            return [cry_table_to_schema(cry_table) for cry_table in db.query(model)]
+    schema_elapsed = best_of(to_schema)
+
+    size = db_size(engine, path)
+    print(f"{label:>7}: DB {size / 1024 / 1024:7.2f} MiB ({size / len(raw):6.1f} B/row), "
+          f"column decode {len(raw) / column_elapsed / 1e6:6.2f} M rows/s, "
+          f"ORM -> Cry {len(raw) / schema_elapsed / 1e3:6.1f} k rows/s")
+    return decode_column()
+
+
+def run(kind: str, n_cries: int) -> int:
+    print(f"--- {kind}: {n_cries} cries (dog 2/3, cat 1/3) ---")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.db')
+        # VACUUM 후 파일 크기를 보기 위해 WAL을 쓰지 않는다
+        engine = create_db_engine(f"sqlite:///{path}", sqlite_pragmas={'foreign_keys': 'ON'})
+        migrate(engine)
+        seed(engine, n_cries, kind)
+        before = measure('before', engine, path, blob=False)
+
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            m0004_cry_predict_blob.upgrade(conn)
+        print(f"migration m0004: {time.perf_counter() - started:.2f} s")
+        # 현재 모델(CryTable)로 읽을 수 있도록 m0004 이후 cry 테이블을 바꾸는 migration도 적용한다
+        with engine.begin() as conn:
+            m0006_cry_change_feed.upgrade(conn)
+        after = measure('after', engine, path, blob=True)
+        engine.dispose()
+
+    mismatches = sum(a != b for a, b in zip(before, after))
+    print(f"round-trip mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == '__main__':
+    n_cries = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    mismatches = sum(run(kind, n_cries) for kind in ('ai', 'rounded'))
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,128 @@
+# benchmarks/query_counts.py
+# API endpoint 하나가 실행하는 SQL 문(SELECT/INSERT/UPDATE/DELETE) 개수를 세어 기대값과 비교한다.
+# 소유권 확인이 데이터 쿼리에 합쳐져 있는지, 반려동물 소유자 캐시가 쓰이는지를 회귀 없이 유지하기 위한 검사이며,
+# 하나라도 기대값과 다르면 exit code 1. 임시 SQLite DB를 쓰고, AI 서버가 필요한 /cry/predict 계열은 제외한다.
+# 사용법: python -m benchmarks.query_counts [-v]  (-v: endpoint별로 실행된 SQL 출력)
+import os
+import sys
+import asyncio
+import logging
+import tempfile
+
+# (이름, method, path, 요청 인자, 기대 SQL 문 개수). 위에서부터 차례대로 실행하며 앞 요청이 만든 데이터를 쓴다.
+# {pet}, {other_pet}, {cry}는 실행 중 만들어진 id로 채워진다.
+# 반려동물 소유자 캐시는 pet 생성 때 채워지고 pet 수정 때 비워지므로, 'create cry'만 pet 조회 1회를 포함한다.
+# 실시간 통계는 처음에 원본 울음으로 만들고 (버전 조회 2회 + 울음 조회), 이후에는 버전 조회 1회로 메모리 값이 최신인지만 확인한다.
+# ETag가 붙는 조회는 데이터 버전 조회 1회를 더 하고, {etag}(직전 응답의 ETag)로 재검증하면 304로 그 1회만 실행한다.
+CASES = [
+    ('create user', 'POST', '/user/me', {'json': {'uid': 'u1', 'email': 'u1@example.com', 'nickname': 'u1'}}, 4),
+    ('create other user', 'POST', '/user/me', {'json': {'uid': 'u2', 'email': 'u2@example.com', 'nickname': 'u2'}}, 4),
+    ('get user', 'GET', '/user/me', {}, 1),
+    ('update user', 'PUT', '/user/me', {'json': {'nickname': 'uu'}}, 3),
+    ('login', 'POST', '/user/me/login', {'json': {'uid': 'u1', 'email': 'u1@example.com'}}, 1),
+    ('create pet', 'POST', '/pet/create', {'json': {
+        'user_id': 'u1', 'name': 'dog', 'gender': 'male', 'age': 1, 'species': 'dog', 'sub_species': 'p'}}, 2),
+    ('create other pet', 'POST', '/pet/create', {'user': 'u2', 'json': {
+        'user_id': 'u2', 'name': 'cat', 'gender': 'female', 'age': 2, 'species': 'cat', 'sub_species': 'p'}}, 2),
+    ('get pet', 'GET', '/pet/{pet}', {}, 2),
+    ('get pets of user', 'GET', '/pet/user/u1', {}, 2),
+    ('get pets of user (not modified)', 'GET', '/pet/user/u1', {'headers': {'If-None-Match': '{etag}'}}, 1),
+    ('get pets of user (fields)', 'GET', '/pet/user/u1', {'params': {'fields': 'id,name'}}, 2),
+    ('update pet', 'PUT', '/pet/{pet}', {'json': {'name': 'dog2'}}, 4),
+    ('create cry', 'POST', '/cry/create', {'json': {
+        'pet_id': '{pet}', 'time': '2026-10-01T10:00:00', 'state': 'sad', 'audioId': 'a',
+        'predictMap': {'sad': 0.9, 'happy': 0.1}, 'intensity': 'high', 'duration': 3.0}}, 6),
+    ('create cry (not owner)', 'POST', '/cry/create', {'json': {
+        'pet_id': '{other_pet}', 'time': '2026-10-01T10:00:00', 'state': 'happy', 'audioId': 'a',
+        'predictMap': {'happy': 1.0}, 'intensity': 'high', 'duration': 3.0}}, 0),
+    ('bulk create cries', 'POST', '/cry/bulk', {'json': {'cries': [{
+        'pet_id': '{pet}', 'time': f'2026-10-02T10:0{i}:00', 'state': 'play', 'audioId': f'b{i}',
+        'predictMap': {'play': 1.0}, 'intensity': 'low', 'duration': 1.0} for i in range(5)]}}, 8),
+    ('get cry', 'GET', '/cry/cry/{cry}', {}, 1),
+    ('get cries of pet', 'GET', '/cry/pet/{pet}', {}, 2),
+    ('get cries of pet (not modified)', 'GET', '/cry/pet/{pet}', {'headers': {'If-None-Match': '{etag}'}}, 1),
+    ('get cries of pet (fields)', 'GET', '/cry/pet/{pet}', {'params': {'fields': 'id,time,state,intensity'}}, 2),
+    ('get cries of pet (not owner)', 'GET', '/cry/pet/{other_pet}', {}, 1),
+    ('search state', 'GET', '/cry/search/state', {'params': {'pet_id': '{pet}', 'query_state': 'sad'}}, 2),
+    ('search time', 'GET', '/cry/search/time', {'params': {
+        'pet_id': '{pet}', 'start_time': '2026-09-01T00:00:00', 'end_time': '2026-11-01T00:00:00'}}, 2),
+    ('update cry', 'PUT', '/cry/{cry}', {'json': {'state': 'happy'}}, 10),
+    ('cry changes', 'GET', '/cry/changes', {'params': {'pet_id': '{pet}'}}, 5),
+    ('live stats', 'GET', '/cry/stats/live', {'params': {'pet_id': '{pet}'}}, 3),
+    ('live stats (in memory)', 'GET', '/cry/stats/live', {'params': {'pet_id': '{pet}'}}, 1),
+    ('inspect', 'GET', '/cry/inspect', {'params': {'pet_id': '{pet}'}}, 8),
+    ('inspect (not modified)', 'GET', '/cry/inspect', {'params': {'pet_id': '{pet}'}, 'headers': {'If-None-Match': '{etag}'}}, 1),
+    ('get job (missing)', 'GET', '/cry/jobs/missing', {}, 1),
+    ('delete cry', 'DELETE', '/cry/{cry}', {}, 8),
+    ('delete pet', 'DELETE', '/pet/{pet}', {}, 3),
+    ('delete user', 'DELETE', '/user/me', {'user': 'u2'}, 5),
+]
+
+
+def fill(value, ids: dict):
+    if isinstance(value, str) and value.startswith('{') and value.endswith('}') and value[1:-1] in ids:
+        return ids[value[1:-1]]
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, dict):
+        return {k: fill(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [fill(v, ids) for v in value]
+    return value
+
+
+async def run(verbose: bool) -> int:
+    import httpx
+    from sqlalchemy import event
+    import main
+    import db as db_module
+    from auth.auth_handler import signJWT
+
+    logging.disable(logging.CRITICAL)
+    db_module.init_db()
+    tokens = {uid: {"Authorization": f"Bearer {signJWT(uid)['access_token']}"} for uid in ('u1', 'u2')}
+
+    statements = []
+
+    @event.listens_for(db_module.engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().split()[0].upper() in ('SELECT', 'INSERT', 'UPDATE', 'DELETE'):
+            statements.append(' '.join(statement.split()))
+
+    ids, failures = {}, 0
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, path, kwargs, expected in CASES:
+            kwargs = fill(dict(kwargs), ids)
+            headers = {**tokens[kwargs.pop('user', 'u1')], **kwargs.pop('headers', {})}
+            statements.clear()
+            response = await client.request(method, path.format(**ids), headers=headers, **kwargs)
+            body = response.json() if response.content else {}
+            ids['etag'] = response.headers.get('etag', '')
+            if name == 'create pet':
+                ids['pet'] = body['pet']['id']
+            elif name == 'create other pet':
+                ids['other_pet'] = body['pet']['id']
+            elif name == 'create cry':
+                ids['cry'] = body['cry']['id']
+
+            ok = len(statements) == expected
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {name:<30} {response.status_code}  "
+                  f"{len(statements):>2} statements (expected {expected})")
+            if verbose or not ok:
+                for statement in statements:
+                    print(f"      {statement[:150]}")
+
+    print(f"{len(CASES)} endpoints checked, {failures} with unexpected statement counts")
+    return failures
+
+
+if __name__ == '__main__':
+    verbose = '-v' in sys.argv[1:]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.update(
+            DB_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", DB_ASYNC='false',
+            CRY_INSPECT_CACHE_DISK='false', CRY_PREDICT_CACHE_DISK='false')
+        failures = asyncio.run(run(verbose))
+    sys.exit(1 if failures else 0)
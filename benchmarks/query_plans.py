@@ -0,0 +1,145 @@
+# benchmarks/query_plans.py
+# 서비스 계층이 요청 처리 중 실행하는 모든 SELECT/UPDATE/DELETE를 기록한 뒤 EXPLAIN QUERY PLAN으로
+# 테이블 전체 스캔(SCAN <table>)이 없는지 확인한다. 전체 스캔이 하나라도 있으면 exit code 1.
+# 임시 SQLite DB에 migrations를 적용해 실제 스키마/인덱스로 검사한다.
+# 사용법: python -m benchmarks.query_plans [-v]  (-v: 모든 쿼리의 실행 계획 출력)
+import os
+import sys
+import random
+import tempfile
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+
+from db import create_db_engine
+from db_base import DB_Base
+from migrations import migrate
+from model import *
+from schemas.cry import CreateCryInput, UpdateCryInput
+from schemas.pet import UpdatePetInput
+from services.user import user_service
+from services.pet import pet_service
+from services.cry import cry_service
+from services.cry_job import cry_job_service
+from services.cry_inspect import CryAggregate, cry_inspect_engine
+from services.cry_rollup import cry_rollup_service
+from services.cry_stats import cry_stats_engine
+from services.cry_version import cry_version_service
+
+STATES = ['anger', 'play', 'happy', 'sad']
+
+
+def seed(session_factory) -> int:
+    rng = random.Random(0)
+    end = datetime.now()
+    with session_factory() as db:
+        for uid in ('u1', 'u2'):
+            db.execute(insert(UserTable.__table__).values(
+                uid=uid, email=f'{uid}@example.com', nickname=uid))
+        pet_ids = [db.execute(insert(PetTable.__table__).values(
+            name=f'pet{i}', gender='male', age=1, species='dog', sub_species='bench',
+            user_id='u1' if i % 2 == 0 else 'u2')).inserted_primary_key[0] for i in range(4)]
+        db.execute(insert(CryTable.__table__), [dict(
+            pet_id=rng.choice(pet_ids), time=end - timedelta(seconds=rng.randint(0, 400 * 86400)),
+            state=rng.choice(STATES), audioId='bench', predictMap={'sad': 1.0},
+            intensity='medium', duration=rng.uniform(1, 15)) for _ in range(20000)])
+        db.commit()
+    return pet_ids[0]
+
+
+def exercise(session_factory, pet_id: int) -> None:
+    """API 요청이 거치는 서비스 경로를 한 번씩 실행한다."""
+    with session_factory() as db:
+        cry_rollup_service.rebuild(db, pet_id)
+        user_service.get_user_by_id(db, 'u1')
+        pet_service.get_pet_by_id(db, pet_id, 'u1')
+        pet_service.get_all_pets_by_user(db, 'u1')
+        pet_service.get_all_pets_by_user(db, 'u1', ('id', 'name'))
+        pet_service.update_pet(db, pet_id, UpdatePetInput(name='bench2'), 'u1')
+
+        cry = cry_service._create_cry(db, CreateCryInput(
+            pet_id=pet_id, time=datetime.now(), state='sad', audioId='bench',
+            predictMap={'sad': 1.0}), 'u1')
+        cry_service.get_cry_by_id(db, cry.id, 'u1')
+        # 첫 페이지와 cursor로 이어지는 페이지
+        _, next_cursor = cry_service.get_all_cries_by_pet(db, pet_id, 'u1')
+        cry_service.get_all_cries_by_pet(db, pet_id, 'u1', next_cursor)
+        cry_service.get_all_cries_by_pet(db, pet_id, 'u1', next_cursor, fields=('id', 'time', 'state', 'intensity'))
+        _, next_cursor = cry_service.get_pets_with_state(db, pet_id, 'sad', 'u1')
+        cry_service.get_pets_with_state(db, pet_id, 'sad', 'u1', next_cursor)
+        end = datetime.now()
+        _, next_cursor = cry_service.get_pets_between_time(
+            db, pet_id, end - timedelta(days=30), end, 'u1')
+        cry_service.get_pets_between_time(
+            db, pet_id, end - timedelta(days=30), end, 'u1', next_cursor)
+        for window_days, granularity in ((7, 'hourly'), (30, 'daily'), (365, 'weekly')):
+            cry_service.inspect_cry(db, pet_id, 'u1', window_days, granularity)
+        # 횟수가 같은 울음 원인이 있을 때 읽는 원인별 첫 울음
+        tied = CryAggregate()
+        for state in STATES[:2]:
+            tied.add_day(end.date(), state, 1, 1.0)
+        cry_inspect_engine.load_first_seen(db, pet_id, end - timedelta(days=30), end, tied)
+        cry_stats_engine.forget(pet_id)
+        cry_service.get_live_stats(db, pet_id, 'u1')
+        cry_version_service.get(db, pet_id)
+        cry_version_service.get_user_versions(db, 'u1')
+        cry_service.update_cry(db, cry.id, UpdateCryInput(state='happy'), 'u1')
+        cry_service.delete_cry(db, cry.id, 'u1')
+        _, _, next_cursor, _ = cry_service.get_cry_changes(db, pet_id, 'u1')
+        cry_service.get_cry_changes(db, pet_id, 'u1', next_cursor, fields=('id', 'time', 'state', 'intensity'))
+
+        cry_job_service._check_enqueue(db, pet_id, 'u1')
+        job = cry_job_service._insert_job(
+            db, 'bench', pet_id, 'u1', '/dev/null', 'bench')
+        cry_job_service._get_job(db, job.id, 'u1')
+
+    cry_job_service._session_factory = session_factory
+    job_id, attempt = cry_job_service._claim_next_job()
+    cry_job_service._renew_lease(job_id, attempt)
+    cry_job_service._recover_expired_jobs()
+
+    with session_factory() as db:
+        pet_service.delete_pet(db, pet_id, 'u1')
+        user_service.delete_user(db, 'u2')
+
+
+def full_scans(plan_rows, table_names) -> list:
+    return [detail for *_, detail in plan_rows
+            if detail.startswith('SCAN ') and detail.split()[1] in table_names]
+
+
+if __name__ == '__main__':
+    verbose = '-v' in sys.argv[1:]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        migrate(engine)
+        session_factory = sessionmaker(autoflush=False, bind=engine)
+        pet_id = seed(session_factory)
+
+        statements = {}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().split()[0].upper() in ('SELECT', 'UPDATE', 'DELETE'):
+                statements.setdefault(statement, parameters)
+
+        exercise(session_factory, pet_id)
+        event.remove(engine, "before_cursor_execute", record)
+
+        table_names = set(DB_Base.metadata.tables)
+        failures = 0
+        with engine.connect() as conn:
+            for statement, parameters in statements.items():
+                plan = conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                scans = full_scans(plan, table_names)
+                failures += bool(scans)
+                if scans or verbose:
+                    print(f"[{'FULL SCAN' if scans else 'ok'}] {' '.join(statement.split())[:160]}")
+                    for *_, detail in plan:
+                        print(f"    {detail}")
+        engine.dispose()
+
+    print(f"{len(statements)} queries checked, {failures} with full table scans")
+    sys.exit(1 if failures else 0)
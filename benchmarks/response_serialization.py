@@ -0,0 +1,106 @@
+# benchmarks/response_serialization.py
+# GET /cry/pet/{pet_id} 응답 하나(울음 N개)를 ORM 객체에서 JSON bytes까지 만드는 시간을 비교한다.
+# - before: Cry(...)로 모든 행을 다시 검증 -> to_korean() 루프 -> FastAPI response_model 검증/직렬화 -> JSONResponse
+# - after: Cry.trusted(...) -> cry_response (model_dump + 한국어 lookup -> ORJSONResponse)
+# DB 조회는 두 경로가 같으므로 빼고, 메모리에 만든 CryTable 객체에서 시작한다. 두 경로의 JSON이 같은지도 확인한다.
+# 사용법: python -m benchmarks.response_serialization [울음 수]  (기본: 10000)
+import gc
+import sys
+import json
+import time
+import random
+import asyncio
+from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from model import CryTable
+from schemas.cry import Cry, GetPetCriesOutput
+from apis.cry import router
+from utils.converters import cry_table_to_schema
+from utils.response import cry_response
+
+STATES = ['anger', 'play', 'happy', 'sad']
+INTENSITIES = ['low', 'medium', 'high']
+
+
+def make_cry_tables(n_cries: int) -> list:
+    rng = random.Random(0)
+    now = datetime.now()
+    cry_tables = []
+    for i in range(n_cries):
+        weights = [rng.random() for _ in STATES]
+        total = sum(weights)
+        predict_map = {state: round(weight / total, 3) for state, weight in zip(STATES, weights)}
+        cry_tables.append(CryTable(
+            id=i + 1, pet_id=1, time=now - timedelta(seconds=i * 30),
+            state=max(predict_map, key=predict_map.get), audioId=f'bench_{i}',
+            predictMap=predict_map, intensity=rng.choice(INTENSITIES), duration=3.0))
+    return cry_tables
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """GC를 끄고 repeat번 실행한 가장 짧은 시간"""
+    elapsed = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(elapsed)
+
+
+def validated_cry(cry_table: CryTable) -> Cry:
+    """변경 전 cry_table_to_schema (Cry.__init__으로 모든 validator 실행)"""
+    return Cry(id=cry_table.id, pet_id=cry_table.pet_id, time=cry_table.time, state=cry_table.state,
+               audioId=cry_table.audioId, predictMap=cry_table.predictMap,
+               intensity=cry_table.intensity, duration=cry_table.duration)
+
+
+def main(n_cries: int) -> int:
+    cry_tables = make_cry_tables(n_cries)
+    response_field = next(route.response_field for route in router.routes
+                          if route.path == '/cry/pet/{pet_id}')
+    loop = asyncio.new_event_loop()
+
+    def before_build():
+        cries = [validated_cry(cry_table) for cry_table in cry_tables]
+        for i in range(len(cries)):
+            cries[i] = cries[i].to_korean()
+        return GetPetCriesOutput(cries=cries, next_cursor=None, success=True, message="Cries fetched successfully")
+
+    def before_serialize(output):
+        content = loop.run_until_complete(serialize_response(field=response_field, response_content=output))
+        return JSONResponse(content).body
+
+    def after_build():
+        cries = [cry_table_to_schema(cry_table) for cry_table in cry_tables]
+        return GetPetCriesOutput(cries=cries, next_cursor=None, success=True, message="Cries fetched successfully")
+
+    def after_serialize(output):
+        return cry_response(output).body
+
+    # cry_table.predictMap은 읽을 때마다 blob을 decode하므로 두 경로 모두 같은 비용이 포함된다
+    results = {}
+    for label, build, serialize in (('before', before_build, before_serialize),
+                                    ('after', after_build, after_serialize)):
+        build_elapsed = best_of(build)
+        output = build()
+        serialize_elapsed = best_of(lambda: serialize(output))
+        total_elapsed = best_of(lambda: serialize(build()))
+        body = serialize(output)
+        results[label] = body
+        print(f"{label:>6}: build {build_elapsed * 1000:7.1f} ms, serialize {serialize_elapsed * 1000:7.1f} ms, "
+              f"total {total_elapsed * 1000:7.1f} ms, body {len(body) / 1024:7.1f} KiB")
+    loop.close()
+
+    same = json.loads(results['before']) == json.loads(results['after'])
+    print(f"{n_cries} cries, same JSON: {same}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
@@ -0,0 +1,106 @@
+# benchmarks/sparse_fields.py
+# 1년치 울음이 있는 반려동물의 타임라인을 GET /cry/pet/{pet_id}로 처음부터 끝까지 읽을 때
+# 모든 필드(기본)와 타임라인 화면에 필요한 필드(fields=id,time,state,intensity)의 응답 크기와 시간을 비교한다.
+# 임시 SQLite DB를 만들어 API를 httpx ASGITransport로 호출하므로 SQL 조회부터 JSON 인코딩까지 포함된다.
+# 사용법: python -m benchmarks.sparse_fields [하루 울음 수]  (기본: 30)
+import gc
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+import tempfile
+from datetime import datetime, timedelta
+
+FIELD_SETS = [None, 'id,time,state,intensity']
+STATES = ['anger', 'play', 'happy', 'sad']
+
+
+def seed(db_module, cries_per_day: int) -> int:
+    from sqlalchemy import insert
+    from model import UserTable, PetTable, CryTable
+
+    rng = random.Random(0)
+    end = datetime.now()
+    n_cries = cries_per_day * 365
+    with db_module.engine.begin() as conn:
+        conn.execute(insert(UserTable.__table__).values(uid='u1', email='u1@example.com', nickname='u1'))
+        pet_id = conn.execute(insert(PetTable.__table__).values(
+            name='dog', gender='male', age=1, species='dog', sub_species='bench',
+            user_id='u1')).inserted_primary_key[0]
+        rows = []
+        for i in range(n_cries):
+            weights = [rng.random() for _ in STATES]
+            total = sum(weights)
+            predict_map = {state: round(weight / total, 3) for state, weight in zip(STATES, weights)}
+            rows.append(dict(
+                pet_id=pet_id, time=end - timedelta(seconds=i * 86400 / cries_per_day),
+                state=max(predict_map, key=predict_map.get), audioId=f'bench_{i}',
+                intensity=rng.choice(['low', 'medium', 'high']), duration=round(rng.uniform(0.5, 5), 2),
+                **CryTable.predict_columns(predict_map)))
+        conn.execute(insert(CryTable.__table__), rows)
+    return pet_id
+
+
+async def read_timeline(client, headers: dict, pet_id: int, fields) -> tuple:
+    """모든 페이지를 읽고 (울음 수, 응답 body 합계 bytes, 요청 수)를 돌려준다."""
+    params = {'limit': 200}
+    if fields:
+        params['fields'] = fields
+    n_cries, n_bytes, n_requests = 0, 0, 0
+    while True:
+        response = await client.get(f'/cry/pet/{pet_id}', params=params, headers=headers)
+        body = response.json()
+        n_cries += len(body['cries'])
+        n_bytes += len(response.content)
+        n_requests += 1
+        if not body['next_cursor']:
+            return n_cries, n_bytes, n_requests
+        params['cursor'] = body['next_cursor']
+
+
+async def run(cries_per_day: int) -> None:
+    import httpx
+    import main
+    import db as db_module
+    from auth.auth_handler import signJWT
+
+    logging.disable(logging.CRITICAL)
+    db_module.init_db()
+    pet_id = seed(db_module, cries_per_day)
+    headers = {"Authorization": f"Bearer {signJWT('u1')['access_token']}"}
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+        for fields in FIELD_SETS:
+            await read_timeline(client, headers, pet_id, fields)  # warm-up (SQLite page cache)
+            elapsed = []
+            gc.disable()
+            try:
+                for _ in range(3):
+                    started = time.perf_counter()
+                    n_cries, n_bytes, n_requests = await read_timeline(client, headers, pet_id, fields)
+                    elapsed.append(time.perf_counter() - started)
+            finally:
+                gc.enable()
+            results[fields] = (n_bytes, min(elapsed))
+            print(f"fields={fields or '(all)':<26} {n_cries} cries in {n_requests} pages: "
+                  f"{n_bytes / 1024:8.1f} KiB, {min(elapsed) * 1000:7.1f} ms "
+                  f"({min(elapsed) / n_requests * 1000:5.2f} ms/page)")
+
+    full_bytes, full_elapsed = results[None]
+    for fields in FIELD_SETS[1:]:
+        n_bytes, elapsed = results[fields]
+        print(f"fields={fields}: payload -{(1 - n_bytes / full_bytes) * 100:.0f}%, "
+              f"latency -{(1 - elapsed / full_elapsed) * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    cries_per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ.update(
+            DB_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", DB_ASYNC='false',
+            CRY_PAGE_SIZE_MAX='200')
+        asyncio.run(run(cries_per_day))
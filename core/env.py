@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from typing import Optional
+from typing import List, Optional
 
 from constants.path import PROJECT_DIR
 
@@ -12,5 +12,25 @@ class Env:
     def get(self, key: str) -> Optional[str]:
         return os.environ.get(key)
 
+    def get_int(self, key: str, default: int) -> int:
+        value = self.get(key)
+        return int(value) if value not in (None, "") else default
+
+    def get_float(self, key: str, default: float) -> float:
+        value = self.get(key)
+        return float(value) if value not in (None, "") else default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key)
+        if value in (None, ""):
+            return default
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    def get_list(self, key: str) -> List[str]:
+        value = self.get(key)
+        if not value:
+            return []
+        return [item.strip() for item in value.split(",") if item.strip()]
+
 
 env = Env()
@@ -0,0 +1,185 @@
+# core/middleware.py
+import zlib
+from typing import Optional
+
+import brotli
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.env import env
+from utils.etag import etag_with_encoding
+
+# 앞단 proxy(nginx 등)가 압축한다면 끈다
+COMPRESSION_ENABLED = env.get_bool("RESPONSE_COMPRESSION", True)
+# 이 크기보다 작은 응답은 압축하지 않는다 (압축 이득보다 헤더/CPU 비용이 크다)
+COMPRESSION_MIN_SIZE = env.get_int("RESPONSE_COMPRESSION_MIN_SIZE", 1024)
+GZIP_LEVEL = env.get_int("RESPONSE_GZIP_LEVEL", 6)
+# 동적 응답용으로 압축률보다 속도를 우선한 brotli quality (0~11)
+BROTLI_QUALITY = env.get_int("RESPONSE_BROTLI_QUALITY", 4)
+# 이 크기 이상의 body는 이벤트 루프를 막지 않도록 threadpool에서 압축한다
+COMPRESSION_THREAD_MIN_SIZE = 64 * 1024
+COMPRESSIBLE_CONTENT_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+# 같은 q 값이면 앞의 것을 고른다
+SUPPORTED_ENCODINGS = ('br', 'gzip')
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding(q 값 포함)에서 쓸 content-coding. 받아들이는 것이 없으면 None(압축하지 않음)."""
+    q_values = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            q_values[name] = q
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = q_values.get(encoding, q_values.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """gzip/brotli 스트리밍 압축기"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 31: gzip header/trailer
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data) if self.encoding == 'br' else self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush() if self.encoding == 'br' else self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._brotli.finish() if self.encoding == 'br' else self._zlib.flush()
+
+    def compress_all(self, data: bytes) -> bytes:
+        return self.compress(data) + self.finish()
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding에 따라 응답을 brotli 또는 gzip으로 압축한다.
+    COMPRESSION_MIN_SIZE 이상인 텍스트/JSON 응답만 압축하고, 이미 인코딩된 응답(이미지 등)과 304는 그대로 보낸다.
+    압축한 응답의 ETag에는 content-coding 접미사를 붙인다 (utils/etag.py).
+    """
+
+    def __init__(self, app: ASGIApp, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        await _CompressionResponder(self.app, encoding, self.min_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: Optional[str], min_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.min_size = min_size
+        self.send = None
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            # body 첫 조각을 보고 압축 여부를 정하므로 start는 잠시 잡아둔다
+            self.start_message = message
+            headers = Headers(raw=message['headers'])
+            content_type = headers.get('content-type', '')
+            compressible = message['status'] not in (204, 206, 304) and 'content-encoding' not in headers \
+                and content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+            if compressible:
+                MutableHeaders(raw=message['headers']).add_vary_header('Accept-Encoding')
+            self.passthrough = not compressible or self.encoding is None
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message['type'] != 'http.response.body' or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.min_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding)
+            headers = MutableHeaders(raw=start['headers'])
+            headers['Content-Encoding'] = self.encoding
+            etag = headers.get('etag')
+            if etag:
+                headers['ETag'] = etag_with_encoding(etag, 'gzip' if self.encoding == 'gzip' else 'br')
+            if not more_body:
+                if len(body) >= COMPRESSION_THREAD_MIN_SIZE:
+                    body = await run_in_threadpool(self.compressor.compress_all, body)
+                else:
+                    body = self.compressor.compress_all(body)
+                headers['Content-Length'] = str(len(body))
+                await self.send(start)
+                await self.send({'type': 'http.response.body', 'body': body})
+                return
+            # 스트리밍 응답: 길이를 미리 알 수 없다
+            del headers['Content-Length']
+            await self.send(start)
+
+        if more_body:
+            chunk = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+
+
+class ETagMiddleware:
+    """
+    ETag dependency(apis/etag.py)가 request.state.etag에 남긴 ETag를 200 응답에 붙인다.
+    endpoint가 Response를 직접 돌려주는 경우에도 헤더가 붙도록 dependency 대신 여기서 처리한다.
+    응답은 사용자별이므로 private으로 두고, 매번 재검증(If-None-Match)하도록 no-cache를 붙인다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message['type'] == 'http.response.start' and message['status'] == 200:
+                etag = scope.get('state', {}).get('etag')
+                if etag:
+                    headers = MutableHeaders(raw=message['headers'])
+                    headers['ETag'] = etag
+                    headers['Cache-Control'] = 'private, no-cache'
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,12 @@
+# enums/inspect.py
+from enum import Enum
+
+
+class InspectGranularityEnum(str, Enum):
+    HOURLY = 'hourly'
+    DAILY = 'daily'
+    WEEKLY = 'weekly'
+
+
+allowed_inspect_window_days = (7, 30, 90, 365)
+allowed_inspect_granularity = tuple(e.value for e in InspectGranularityEnum)
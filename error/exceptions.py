@@ -39,6 +39,26 @@ class CryNotFoundError(Exception):
     pass
 
 
+class CryJobNotFoundError(Exception):
+    """Raised when a cry prediction job is not found."""
+    pass
+
+
+class CryJobLeaseLostError(Exception):
+    """Raised when a cry prediction job was reclaimed by another worker while being processed."""
+    pass
+
+
+class QueueFullError(Exception):
+    """Raised when the cry prediction job queue is full."""
+    pass
+
+
+class PredictionServerError(Exception):
+    """Raised when no AI server replica returns a valid prediction."""
+    pass
+
+
 class UserNotFoundError(Exception):
     """Raised when a user is not found."""
     pass
@@ -57,3 +77,8 @@ class DuplicateEmailError(Exception):
 class DuplicateUidError(Exception):
     """Raised when attempting to create a user with an uid that already exists."""
     pass
+
+
+class IdempotencyKeyConflictError(Exception):
+    """Raised when an idempotency key is reused with a different request body."""
+    pass
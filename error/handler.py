@@ -7,7 +7,10 @@ from starlette.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_403_FORBIDDEN,
     HTTP_404_NOT_FOUND,
-    HTTP_500_INTERNAL_SERVER_ERROR
+    HTTP_409_CONFLICT,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_502_BAD_GATEWAY,
+    HTTP_503_SERVICE_UNAVAILABLE
 )
 
 from error.exceptions import *
@@ -34,10 +37,22 @@ def handle_http_exceptions(func: Callable) -> Callable:
         except (UnauthorizedError, WrongFileTypeError) as ue:
             logger.error(f"403 Forbidden: {str(ue)}", exc_info=True)
             raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=str(ue))
-        except (PetNotFoundError, CryNotFoundError, UserNotFoundError) as pnfe:
+        except (PetNotFoundError, CryNotFoundError, UserNotFoundError, CryJobNotFoundError) as pnfe:
             logger.error(f"404 Not Found: {str(pnfe)}", exc_info=True)
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail=str(pnfe))
+        except IdempotencyKeyConflictError as ike:
+            logger.error(f"409 Conflict: {str(ike)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT, detail=str(ike))
+        except PredictionServerError as pse:
+            logger.error(f"502 Bad Gateway: {str(pse)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_502_BAD_GATEWAY, detail=str(pse))
+        except QueueFullError as qfe:
+            logger.error(f"503 Service Unavailable: {str(qfe)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE, detail=str(qfe))
         except Exception as e:
             logger.error(f"500 Internal Server Error: {e}", exc_info=True)
             raise HTTPException(
@@ -61,10 +76,22 @@ def handle_http_exceptions(func: Callable) -> Callable:
         except (UnauthorizedError, WrongFileTypeError) as ue:
             logger.error(f"403 Forbidden: {str(ue)}", exc_info=True)
             raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail=str(ue))
-        except (PetNotFoundError, CryNotFoundError, UserNotFoundError) as pnfe:
+        except (PetNotFoundError, CryNotFoundError, UserNotFoundError, CryJobNotFoundError) as pnfe:
             logger.error(f"404 Not Found: {str(pnfe)}", exc_info=True)
             raise HTTPException(
                 status_code=HTTP_404_NOT_FOUND, detail=str(pnfe))
+        except IdempotencyKeyConflictError as ike:
+            logger.error(f"409 Conflict: {str(ike)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT, detail=str(ike))
+        except PredictionServerError as pse:
+            logger.error(f"502 Bad Gateway: {str(pse)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_502_BAD_GATEWAY, detail=str(pse))
+        except QueueFullError as qfe:
+            logger.error(f"503 Service Unavailable: {str(qfe)}", exc_info=True)
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE, detail=str(qfe))
         except Exception as e:
             logger.error(f"500 Internal Server Error: {e}", exc_info=True)
             raise HTTPException(
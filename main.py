@@ -1,12 +1,39 @@
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from apis import router as main_router
 from apis.user import router as user_router
 from apis.cry import router as cry_router
 from apis.pet import router as pet_router
+from core.middleware import COMPRESSION_ENABLED, CompressionMiddleware, ETagMiddleware
+from services.cry_predict import cry_predict
+from services.cry_batcher import cry_predict_batcher
+from services.cry_job import cry_job_service
+from services.cry_stats import cry_stats_engine
+from db import SessionLocal, init_db
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    await cry_predict.startup()
+    await cry_job_service.startup(SessionLocal)
+    await cry_stats_engine.startup(SessionLocal)
+    try:
+        yield
+    finally:
+        await cry_stats_engine.shutdown()
+        await cry_job_service.shutdown()
+        await cry_predict_batcher.shutdown()
+        await cry_predict.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+# 나중에 추가한 middleware가 바깥쪽: 압축은 ETag가 붙은 응답을 받아 ETag에 content-coding 접미사를 붙인다
+app.add_middleware(ETagMiddleware)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 
 app.include_router(main_router)
 app.include_router(user_router)
@@ -0,0 +1,2 @@
+# migrations/__init__.py
+from migrations.runner import migrate, current_version, pending_migrations, load_migrations
@@ -0,0 +1,25 @@
+# migrations/__main__.py
+# 사용법: python -m migrations [upgrade|current|history]
+import sys
+
+from migrations.runner import migrate, current_version, pending_migrations, load_migrations
+
+
+if __name__ == '__main__':
+    from db import engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'upgrade'
+    if command == 'upgrade':
+        applied = migrate(engine)
+        print(f"applied {applied} migration(s), current version {current_version(engine)}")
+    elif command == 'current':
+        pending = pending_migrations(engine)
+        print(f"current version {current_version(engine)}, {len(pending)} pending")
+        for module in pending:
+            print(f"  pending {module.VERSION:04d}: {module.DESCRIPTION}")
+    elif command == 'history':
+        for module in load_migrations():
+            print(f"{module.VERSION:04d}: {module.DESCRIPTION}")
+    else:
+        print("usage: python -m migrations [upgrade|current|history]")
+        sys.exit(1)
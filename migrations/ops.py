@@ -0,0 +1,97 @@
+# migrations/ops.py
+# migration에서 쓰는 스키마 변경 helper. 테이블/컬럼/인덱스는 각 migration이 자기 버전의 정의로 넘긴다 (모델을 쓰지 않는다).
+# migration 도입 전에 create_all로 만든 DB에는 이후 migration의 변경이 이미 반영되어 있을 수 있다.
+# 그래서 모든 helper는 대상이 이미 있으면 아무것도 하지 않는다.
+from typing import Sequence
+from sqlalchemy import Index, MetaData, Table, inspect
+from sqlalchemy.engine import Connection
+
+from log import logger
+
+
+def has_index(connection: Connection, table_name: str, index_name: str) -> bool:
+    return any(index['name'] == index_name
+               for index in inspect(connection).get_indexes(table_name))
+
+
+def create_index_if_missing(connection: Connection, index: Index) -> bool:
+    if has_index(connection, index.table.name, index.name):
+        return False
+    index.create(connection)
+    logger.info(f"인덱스 생성: {index.name}")
+    return True
+
+
+def has_column(connection: Connection, table_name: str, column_name: str) -> bool:
+    return any(column['name'] == column_name
+               for column in inspect(connection).get_columns(table_name))
+
+
+def add_column_if_missing(connection: Connection, table: Table, column_name: str) -> bool:
+    """
+    table(migration이 정의한 그 버전의 테이블)의 컬럼을 ALTER TABLE ADD COLUMN으로 추가한다.
+    기존 행이 있으므로 nullable 컬럼이거나 server_default가 있는 컬럼만 추가할 수 있다 (기존 행은 기본값을 가진다).
+    """
+    column = table.c[column_name]
+    if has_column(connection, table.name, column.name):
+        return False
+    preparer = connection.dialect.identifier_preparer
+    definition = column.type.compile(dialect=connection.dialect)
+    if column.server_default is not None:
+        # CREATE TABLE과 같은 방식으로 기본값을 적는다
+        default = connection.dialect.ddl_compiler(connection.dialect, None).get_column_default_string(column)
+        definition += f" DEFAULT {default}"
+        if not column.nullable:
+            definition += " NOT NULL"
+    connection.exec_driver_sql(
+        f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {definition}")
+    logger.info(f"컬럼 추가: {table.name}.{column.name}")
+    return True
+
+
+def drop_not_null_if_present(connection: Connection, table: Table, column_name: str) -> bool:
+    """table은 migration이 정의한 그 버전의 테이블이다 (MySQL의 MODIFY에 컬럼 타입을 쓴다)."""
+    column = table.c[column_name]
+    if next(info['nullable'] for info in inspect(connection).get_columns(table.name)
+            if info['name'] == column.name):
+        return False
+    if connection.dialect.name == 'sqlite':
+        # SQLite는 컬럼 제약을 ALTER할 수 없다
+        _rebuild_sqlite_table(connection, table.name, nullable_columns=[column.name])
+    else:
+        preparer = connection.dialect.identifier_preparer
+        connection.exec_driver_sql(
+            f"ALTER TABLE {preparer.format_table(table)} MODIFY {preparer.format_column(column)} "
+            f"{column.type.compile(dialect=connection.dialect)} NULL")
+    logger.info(f"NOT NULL 제거: {table.name}.{column.name}")
+    return True
+
+
+def _rebuild_sqlite_table(connection: Connection, table_name: str, nullable_columns: Sequence[str]) -> None:
+    """
+    DB에 있는 테이블 정의를 그대로 읽어(reflect) nullable_columns만 NULL을 허용하도록 바꾼 새 테이블을 만들고,
+    행을 복사한 뒤 교체한다 (SQLite 권장 절차). 인덱스는 교체 후 다시 만든다.
+    모델 정의를 쓰지 않으므로 이미 적용된 migration의 결과가 이후 모델 변경에 따라 달라지지 않는다.
+    """
+    preparer = connection.dialect.identifier_preparer
+    # 외래 키 대상 테이블도 같은 MetaData에 함께 읽힌다
+    metadata = MetaData()
+    table = Table(table_name, metadata, autoload_with=connection)
+    for column_name in nullable_columns:
+        table.c[column_name].nullable = True
+    new_table = table.to_metadata(metadata, name=f'_{table_name}_rebuild')
+    for index in list(new_table.indexes):
+        new_table.indexes.discard(index)
+
+    columns = ', '.join(preparer.format_column(column) for column in table.columns)
+    new_table.drop(connection, checkfirst=True)
+    new_table.create(connection)
+    connection.exec_driver_sql(
+        f"INSERT INTO {preparer.format_table(new_table)} ({columns}) "
+        f"SELECT {columns} FROM {preparer.format_table(table)}")
+    connection.exec_driver_sql(f"DROP TABLE {preparer.format_table(table)}")
+    connection.exec_driver_sql(
+        f"ALTER TABLE {preparer.format_table(new_table)} RENAME TO {preparer.format_table(table)}")
+    for index in table.indexes:
+        index.create(connection)
+    logger.info(f"테이블 재생성: {table_name}")
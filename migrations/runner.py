@@ -0,0 +1,66 @@
+# migrations/runner.py
+import pkgutil
+import importlib
+from datetime import datetime
+from types import ModuleType
+from typing import List
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, insert
+from sqlalchemy.engine import Engine, Connection
+
+import migrations.versions
+from log import logger
+
+# 적용된 migration 기록. 모델(DB_Base)과 분리해 migration 자신은 버전 관리 대상이 아니다.
+schema_version_table = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(255), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def load_migrations() -> List[ModuleType]:
+    modules = [importlib.import_module(f'{migrations.versions.__name__}.{name}')
+               for _, name, _ in pkgutil.iter_modules(migrations.versions.__path__)
+               if name.startswith('m')]
+    modules.sort(key=lambda module: module.VERSION)
+    versions = [module.VERSION for module in modules]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"Duplicated migration versions: {versions}")
+    return modules
+
+
+def _applied_versions(connection: Connection) -> set:
+    schema_version_table.create(connection, checkfirst=True)
+    return set(connection.execute(select(schema_version_table.c.version)).scalars())
+
+
+def current_version(engine: Engine) -> int:
+    with engine.begin() as connection:
+        return max(_applied_versions(connection), default=0)
+
+
+def pending_migrations(engine: Engine) -> List[ModuleType]:
+    with engine.begin() as connection:
+        applied = _applied_versions(connection)
+    return [module for module in load_migrations() if module.VERSION not in applied]
+
+
+def migrate(engine: Engine) -> int:
+    """
+    아직 적용되지 않은 migration을 버전 순서대로 하나씩 트랜잭션 안에서 적용하고, 적용한 개수를 돌려준다.
+    여러 프로세스가 동시에 시작해도 schema_version의 primary key 때문에 같은 버전은 한 번만 기록된다.
+    (MySQL의 DDL은 트랜잭션으로 묶이지 않으므로 upgrade는 다시 실행해도 안전하게 작성한다)
+    """
+    applied_count = 0
+    for module in pending_migrations(engine):
+        with engine.begin() as connection:
+            if module.VERSION in _applied_versions(connection):
+                continue
+            logger.info(f"migration {module.VERSION:04d} 적용: {module.DESCRIPTION}")
+            module.upgrade(connection)
+            connection.execute(insert(schema_version_table).values(
+                version=module.VERSION, description=module.DESCRIPTION,
+                applied_at=datetime.now()))
+        applied_count += 1
+    return applied_count
@@ -0,0 +1,2 @@
+# migrations/versions/__init__.py
+# 버전별 migration 모듈: m<4자리 버전>_<설명>.py, 모듈마다 VERSION, DESCRIPTION, upgrade(connection)을 정의한다.
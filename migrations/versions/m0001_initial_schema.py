@@ -0,0 +1,98 @@
+# migrations/versions/m0001_initial_schema.py
+# migration 도입 이전에 create_all로 만들던 테이블들. 이미 있는 테이블은 건너뛴다.
+# 그때의 테이블 정의를 그대로 고정해 둔다. 모델이 바뀌어도 이 파일은 고치지 않고, 변경은 m0002 이후의 migration으로 추가한다.
+# (Python 쪽 기본값(default)은 DDL에 들어가지 않으므로 적지 않는다)
+from sqlalchemy import (
+    MetaData, Table, Column, ForeignKey, String, Text, Integer, Float, Date, DateTime, JSON,
+)
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "initial schema"
+
+metadata = MetaData()
+
+Table(
+    'user', metadata,
+    Column('uid', String(128), primary_key=True, unique=True),
+    Column('email', String(255), nullable=False, unique=True),
+    Column('nickname', String(64), nullable=False),
+    Column('photoId', String(255), nullable=True),
+)
+
+Table(
+    'pet', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('name', String(64), nullable=False),
+    Column('gender', String(16), nullable=False),
+    Column('age', Integer, nullable=False),
+    Column('species', String(16), nullable=False),
+    Column('photo_id', String(255), nullable=True),
+    Column('sub_species', String(64), nullable=False),
+    Column('user_id', String(128), ForeignKey('user.uid'), nullable=False),
+)
+
+Table(
+    'cry', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('pet_id', Integer, ForeignKey('pet.id'), nullable=False),
+    Column('time', DateTime, nullable=False),
+    Column('state', String(32), nullable=False),
+    Column('audioId', String(255), nullable=False),
+    Column('predictMap', JSON, nullable=False),
+    Column('intensity', String(16)),
+    Column('duration', Float),
+)
+
+Table(
+    'cry_job', metadata,
+    Column('id', String(32), primary_key=True),
+    Column('pet_id', Integer, ForeignKey('pet.id', ondelete='CASCADE'), nullable=False),
+    Column('user_id', String(128), nullable=False),
+    Column('audio_path', String(512), nullable=False),
+    Column('digest', String(64), nullable=False),
+    Column('status', String(16), nullable=False),
+    Column('attempts', Integer, nullable=False),
+    Column('error', Text, nullable=True),
+    Column('cry_id', Integer, nullable=True),
+    Column('next_run_at', DateTime, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+Table(
+    'cry_rollup_hourly', metadata,
+    Column('pet_id', Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('hour', Integer, primary_key=True),
+    Column('state', String(32), primary_key=True),
+    Column('count', Integer, nullable=False),
+    Column('duration_sum', Float, nullable=False),
+)
+
+Table(
+    'cry_rollup_daily', metadata,
+    Column('pet_id', Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('state', String(32), primary_key=True),
+    Column('count', Integer, nullable=False),
+    Column('duration_sum', Float, nullable=False),
+)
+
+Table(
+    'pet_cry_version', metadata,
+    Column('pet_id', Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True),
+    Column('version', Integer, nullable=False),
+)
+
+Table(
+    'cry_stats_snapshot', metadata,
+    Column('pet_id', Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True),
+    Column('version', Integer, nullable=False),
+    Column('data', JSON, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    metadata.create_all(connection)
@@ -0,0 +1,28 @@
+# migrations/versions/m0002_query_indexes.py
+# 반려동물별 울음 조회(cry: pet_id, time / pet_id, state, time), 사용자별 반려동물 조회(pet: user_id),
+# 작업 큐 조회(cry_job: status, next_run_at) 인덱스
+from sqlalchemy import MetaData, Table, Column, Index, Integer, String, DateTime
+from sqlalchemy.engine import Connection
+
+from migrations.ops import create_index_if_missing
+
+VERSION = 2
+DESCRIPTION = "indexes for cry, pet and cry_job queries"
+
+# 인덱스를 정의하는 데 필요한 컬럼만 적는다 (테이블은 m0001에서 만들어져 있다)
+metadata = MetaData()
+cry = Table('cry', metadata, Column('pet_id', Integer), Column('time', DateTime), Column('state', String(32)))
+pet = Table('pet', metadata, Column('user_id', String(128)))
+cry_job = Table('cry_job', metadata, Column('status', String(16)), Column('next_run_at', DateTime))
+
+INDEXES = (
+    Index('ix_cry_pet_id_time', cry.c.pet_id, cry.c.time),
+    Index('ix_cry_pet_id_state_time', cry.c.pet_id, cry.c.state, cry.c.time),
+    Index('ix_pet_user_id', pet.c.user_id),
+    Index('ix_cry_job_status_next_run_at', cry_job.c.status, cry_job.c.next_run_at),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for index in INDEXES:
+        create_index_if_missing(connection, index)
@@ -0,0 +1,23 @@
+# migrations/versions/m0003_cry_bulk_request.py
+# /cry/bulk idempotency key 저장 테이블
+from sqlalchemy import MetaData, Table, Column, Index, String, DateTime, JSON
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+DESCRIPTION = "cry_bulk_request table for bulk ingestion idempotency keys"
+
+metadata = MetaData()
+
+cry_bulk_request = Table(
+    'cry_bulk_request', metadata,
+    Column('user_id', String(128), primary_key=True),
+    Column('idempotency_key', String(128), primary_key=True),
+    Column('request_hash', String(64), nullable=False),
+    Column('result', JSON, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Index('ix_cry_bulk_request_created_at', 'created_at'),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    cry_bulk_request.create(connection, checkfirst=True)
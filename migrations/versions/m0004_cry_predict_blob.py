@@ -0,0 +1,56 @@
+# migrations/versions/m0004_cry_predict_blob.py
+# cry.predictMap을 label schema id(predict_schema) + float32 blob(predict_probs)으로 옮긴다.
+# label schema에 맞지 않는 행은 predictMap JSON을 그대로 두므로 predictMap 컬럼은 nullable이 된다.
+# 옮긴 행의 JSON은 NULL이 되지만 SQLite 파일 크기는 VACUUM 후에 줄어든다.
+# 저장 형식(encode_predict_map)은 model/predict_map.py를 쓴다. label schema는 추가만 되고 바뀌지 않으므로
+# 이후에 실행해도 이미 저장된 행과 같은 형식으로 옮겨진다.
+from sqlalchemy import MetaData, Table, Column, Integer, SmallInteger, LargeBinary, JSON, select, update, bindparam, null
+from sqlalchemy.engine import Connection
+
+from migrations.ops import add_column_if_missing, drop_not_null_if_present
+from model.predict_map import encode_predict_map
+
+VERSION = 4
+DESCRIPTION = "cry predictMap stored as label schema id + float32 blob"
+
+BATCH_SIZE = 5000
+
+
+# 이 migration이 읽고 쓰는 cry 컬럼
+metadata = MetaData()
+cry = Table(
+    'cry', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('predictMap', JSON(none_as_null=True), nullable=True),
+    Column('predict_schema', SmallInteger, nullable=True),
+    Column('predict_probs', LargeBinary, nullable=True),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    add_column_if_missing(connection, cry, 'predict_schema')
+    add_column_if_missing(connection, cry, 'predict_probs')
+    drop_not_null_if_present(connection, cry, 'predictMap')
+
+    statement = update(cry).where(cry.c.id == bindparam('row_id')).values(
+        predict_schema=bindparam('row_predict_schema'),
+        predict_probs=bindparam('row_predict_probs'),
+        predictMap=null())
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(cry.c.id, cry.c.predictMap)
+            .where(cry.c.id > last_id, cry.c.predict_schema.is_(None), cry.c.predictMap.is_not(None))
+            .order_by(cry.c.id).limit(BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        params = []
+        for row in rows:
+            encoded = encode_predict_map(row.predictMap)
+            if encoded is not None:
+                params.append({'row_id': row.id,
+                               'row_predict_schema': encoded[0],
+                               'row_predict_probs': encoded[1]})
+        if params:
+            connection.execute(statement, params)
@@ -0,0 +1,17 @@
+# migrations/versions/m0005_cry_job_pet_index.py
+# 반려동물 삭제 시 cry_job의 외래 키 CASCADE가 테이블 전체를 스캔하지 않도록 cry_job.pet_id 인덱스를 추가한다
+from sqlalchemy import MetaData, Table, Column, Index, Integer
+from sqlalchemy.engine import Connection
+
+from migrations.ops import create_index_if_missing
+
+VERSION = 5
+DESCRIPTION = "cry_job.pet_id index for pet deletion"
+
+metadata = MetaData()
+cry_job = Table('cry_job', metadata, Column('pet_id', Integer))
+INDEX = Index('ix_cry_job_pet_id', cry_job.c.pet_id)
+
+
+def upgrade(connection: Connection) -> None:
+    create_index_if_missing(connection, INDEX)
@@ -0,0 +1,36 @@
+# migrations/versions/m0006_cry_change_feed.py
+# 울음 변경 feed(/cry/changes)를 위한 cry.change_seq 컬럼과 인덱스, 삭제 기록(cry_tombstone) 테이블을 추가한다.
+# 기존 울음은 change_seq 0이 되어 cursor 없이 처음 동기화할 때 모두 전달된다.
+from sqlalchemy import MetaData, Table, Column, ForeignKey, Index, Integer, DateTime
+from sqlalchemy.engine import Connection
+
+from migrations.ops import add_column_if_missing, create_index_if_missing
+
+VERSION = 6
+DESCRIPTION = "cry change_seq and cry_tombstone for the delta-sync change feed"
+
+metadata = MetaData()
+
+# cry_tombstone의 외래 키 대상 (pet은 m0001에서 만들어져 있다)
+Table('pet', metadata, Column('id', Integer, primary_key=True))
+
+cry = Table(
+    'cry', metadata,
+    Column('pet_id', Integer),
+    Column('change_seq', Integer, nullable=False, server_default='0'),
+)
+CHANGE_SEQ_INDEX = Index('ix_cry_pet_id_change_seq', cry.c.pet_id, cry.c.change_seq)
+
+cry_tombstone = Table(
+    'cry_tombstone', metadata,
+    Column('pet_id', Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True),
+    Column('change_seq', Integer, primary_key=True, autoincrement=False),
+    Column('cry_id', Integer, primary_key=True, autoincrement=False),
+    Column('deleted_at', DateTime, nullable=False),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    add_column_if_missing(connection, cry, 'change_seq')
+    create_index_if_missing(connection, CHANGE_SEQ_INDEX)
+    cry_tombstone.create(connection, checkfirst=True)
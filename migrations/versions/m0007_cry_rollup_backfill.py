@@ -0,0 +1,62 @@
+# migrations/versions/m0007_cry_rollup_backfill.py
+# cry_rollup_hourly/daily가 생기기 전에 저장된 울음을 집계에 채운다.
+# 이후의 울음은 create/update/delete에서 집계가 함께 갱신되므로 한 번만 실행하면 된다.
+# 집계를 지우고 다시 만들기 때문에 다시 실행해도 결과가 같다.
+from sqlalchemy import MetaData, Table, Column, Integer, String, Float, Date, DateTime
+from sqlalchemy import cast, delete, func, insert, select
+from sqlalchemy.engine import Connection
+
+from log import logger
+
+VERSION = 7
+DESCRIPTION = "backfill cry_rollup_hourly/daily from existing cries"
+
+metadata = MetaData()
+cry = Table(
+    'cry', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('pet_id', Integer),
+    Column('time', DateTime),
+    Column('state', String(32)),
+    Column('duration', Float),
+)
+hourly = Table(
+    'cry_rollup_hourly', metadata,
+    Column('pet_id', Integer, primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('hour', Integer, primary_key=True),
+    Column('state', String(32), primary_key=True),
+    Column('count', Integer),
+    Column('duration_sum', Float),
+)
+daily = Table(
+    'cry_rollup_daily', metadata,
+    Column('pet_id', Integer, primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('state', String(32), primary_key=True),
+    Column('count', Integer),
+    Column('duration_sum', Float),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    cry_date = func.date(cry.c.time)
+    if connection.dialect.name == 'sqlite':
+        cry_hour = cast(func.strftime('%H', cry.c.time), Integer)
+    else:
+        cry_hour = func.hour(cry.c.time)
+
+    connection.execute(delete(hourly))
+    connection.execute(delete(daily))
+    result = connection.execute(insert(hourly).from_select(
+        ['pet_id', 'date', 'hour', 'state', 'count', 'duration_sum'],
+        select(cry.c.pet_id, cry_date, cry_hour, cry.c.state,
+               func.count(cry.c.id), func.coalesce(func.sum(cry.c.duration), 0.0))
+        .group_by(cry.c.pet_id, cry_date, cry_hour, cry.c.state)))
+    # 일 단위 집계는 방금 만든 시간 단위 집계를 합쳐서 만든다
+    connection.execute(insert(daily).from_select(
+        ['pet_id', 'date', 'state', 'count', 'duration_sum'],
+        select(hourly.c.pet_id, hourly.c.date, hourly.c.state,
+               func.sum(hourly.c.count), func.sum(hourly.c.duration_sum))
+        .group_by(hourly.c.pet_id, hourly.c.date, hourly.c.state)))
+    logger.info(f"울음 집계 backfill: 시간 단위 bucket {result.rowcount}개")
@@ -0,0 +1,23 @@
+# migrations/versions/m0008_cry_job_lease.py
+# 울음 분석 작업의 lease(작업을 가져간 worker와 만료 시각) 컬럼을 추가한다.
+# 기존 running 작업은 lease가 없으므로(NULL) 만료된 것으로 보고 다음 복구 때 대기 상태로 되돌린다.
+from sqlalchemy import MetaData, Table, Column, String, DateTime
+from sqlalchemy.engine import Connection
+
+from migrations.ops import add_column_if_missing
+
+VERSION = 8
+DESCRIPTION = "cry_job claimed_by and lease_until for worker leases"
+
+metadata = MetaData()
+
+cry_job = Table(
+    'cry_job', metadata,
+    Column('claimed_by', String(64), nullable=True),
+    Column('lease_until', DateTime, nullable=True),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    add_column_if_missing(connection, cry_job, 'claimed_by')
+    add_column_if_missing(connection, cry_job, 'lease_until')
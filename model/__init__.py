@@ -2,5 +2,13 @@
 from .user import UserTable
 from .pet import PetTable
 from .cry import CryTable
+from .cry_job import CryJobTable
+from .cry_rollup import CryHourlyRollupTable, CryDailyRollupTable
+from .pet_cry_version import PetCryVersionTable
+from .cry_stats_snapshot import CryStatsSnapshotTable
+from .cry_bulk_request import CryBulkRequestTable
+from .cry_tombstone import CryTombstoneTable
 
-__all__ = ["UserTable", "PetTable", "CryTable"]
+__all__ = ["UserTable", "PetTable", "CryTable", "CryJobTable", "CryHourlyRollupTable",
+           "CryDailyRollupTable", "PetCryVersionTable", "CryStatsSnapshotTable", "CryBulkRequestTable",
+           "CryTombstoneTable"]
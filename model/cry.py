@@ -2,7 +2,7 @@
 from __future__ import annotations
 from typing import Optional, List
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, JSON, Float
+from sqlalchemy import Column, String, Integer, SmallInteger, LargeBinary, ForeignKey, DateTime, JSON, Float, Index
 from sqlalchemy.orm import relationship, declarative_base
 from pydantic import BaseModel
 import uuid
@@ -10,18 +10,31 @@ import uuid
 from db_base import DB_Base
 from enums.cry_state import CRY_STATE_KR_TO_EN
 from enums.cry_intensity import CRY_INTENSITY_KR_TO_EN
+from model.predict_map import encode_predict_map, decode_predict_map
 
 
 class CryTable(DB_Base):
     __tablename__ = 'cry'
+    # 반려동물별 기간 조회/정렬과 상태별 조회가 인덱스 범위 스캔으로 끝나도록 한다
+    __table_args__ = (
+        Index('ix_cry_pet_id_time', 'pet_id', 'time'),
+        Index('ix_cry_pet_id_state_time', 'pet_id', 'state', 'time'),
+        Index('ix_cry_pet_id_change_seq', 'pet_id', 'change_seq'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     pet_id = Column(Integer, ForeignKey('pet.id'), nullable=False)
     time = Column(DateTime, nullable=False)
-    state = Column(String, nullable=False)
-    audioId = Column(String, nullable=False)
-    predictMap = Column(JSON, nullable=False)
-    intensity = Column(String, default='medium')
+    state = Column(String(32), nullable=False)
+    audioId = Column(String(255), nullable=False)
+    # predictMap은 label schema id + float32 blob으로 저장한다 (model/predict_map.py)
+    # 등록된 label schema에 맞지 않는 예측 결과만 predictMap JSON 컬럼에 그대로 저장한다
+    predict_schema = Column(SmallInteger, nullable=True)
+    predict_probs = Column(LargeBinary, nullable=True)
+    predict_map_json = Column('predictMap', JSON(none_as_null=True), key='predictMap', nullable=True)
+    intensity = Column(String(16), default='medium')
     duration = Column(Float, default=2.0)
+    # 마지막으로 생성/수정된 트랜잭션의 반려동물 울음 버전 (pet_cry_version). 변경 feed의 순서로 쓴다.
+    change_seq = Column(Integer, nullable=False, default=0, server_default='0')
 
     # Relationship to PetTable
     pet = relationship("PetTable", back_populates="cries")
@@ -29,6 +42,33 @@ class CryTable(DB_Base):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    @property
+    def predictMap(self) -> Optional[dict]:
+        return self.decode_predict_columns(self.predict_schema, self.predict_probs, self.predict_map_json)
+
+    @predictMap.setter
+    def predictMap(self, predict_map: Optional[dict]) -> None:
+        columns = self.predict_columns(predict_map)
+        self.predict_schema = columns['predict_schema']
+        self.predict_probs = columns['predict_probs']
+        self.predict_map_json = columns['predictMap']
+
+    @staticmethod
+    def predict_columns(predict_map: Optional[dict]) -> dict:
+        """predictMap을 저장할 컬럼 값들 (테이블 컬럼 key 기준). Core insert/update로 직접 넣을 때도 이 값을 쓴다."""
+        encoded = encode_predict_map(predict_map)
+        if encoded is None:
+            return {'predict_schema': None, 'predict_probs': None, 'predictMap': predict_map}
+        return {'predict_schema': encoded[0], 'predict_probs': encoded[1], 'predictMap': None}
+
+    @staticmethod
+    def decode_predict_columns(predict_schema: Optional[int], predict_probs: Optional[bytes],
+                               predict_map_json: Optional[dict]) -> Optional[dict]:
+        """predict_columns로 저장한 컬럼 값들을 predictMap으로 되돌린다. 컬럼만 골라 읽은 Row에도 쓴다."""
+        if predict_schema is not None:
+            return decode_predict_map(predict_schema, predict_probs)
+        return predict_map_json
+
     def __repr__(self):
         return f"<Cry(id={self.id}, pet_id={self.pet_id}, time={self.time}, state={self.state}, audioId={self.audioId}, predictMap={self.predictMap}, intensity={self.intensity}, duration={self.duration})>"
 
@@ -0,0 +1,28 @@
+# model/cry_bulk_request.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, JSON, Index
+
+from db_base import DB_Base
+
+
+class CryBulkRequestTable(DB_Base):
+    """
+    /cry/bulk 요청의 idempotency key와 처리 결과.
+    같은 사용자가 같은 key로 다시 보내면 저장하지 않고 이 결과를 그대로 돌려준다.
+    """
+    __tablename__ = 'cry_bulk_request'
+    __table_args__ = (
+        Index('ix_cry_bulk_request_created_at', 'created_at'),
+    )
+    user_id = Column(String(128), primary_key=True)
+    idempotency_key = Column(String(128), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryBulkRequest(user_id={self.user_id}, idempotency_key={self.idempotency_key}, created_at={self.created_at})>"
@@ -0,0 +1,54 @@
+# model/cry_job.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime, Index
+
+from db_base import DB_Base
+
+
+class CryJobTable(DB_Base):
+    """비동기 울음 분석 작업 큐. 프로세스가 재시작되어도 작업이 유지되도록 DB에 저장한다."""
+    __tablename__ = 'cry_job'
+    # worker가 대기 중인 작업을 찾는 조회 (status, next_run_at), 반려동물 삭제 시 외래 키 CASCADE (pet_id)
+    __table_args__ = (
+        Index('ix_cry_job_status_next_run_at', 'status', 'next_run_at'),
+        Index('ix_cry_job_pet_id', 'pet_id'),
+    )
+    id = Column(String(32), primary_key=True)
+    pet_id = Column(Integer, ForeignKey('pet.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(String(128), nullable=False)
+    audio_path = Column(String(512), nullable=False)
+    digest = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False, default='queued')
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    cry_id = Column(Integer, nullable=True)
+    # 작업을 가져간 worker와 lease 만료 시각. 처리 중에는 worker가 lease를 갱신하고, 만료된 running 작업만 복구한다
+    claimed_by = Column(String(64), nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+    next_run_at = Column(DateTime, nullable=False, default=datetime.now)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryJob(id={self.id}, pet_id={self.pet_id}, status={self.status}, attempts={self.attempts}, cry_id={self.cry_id})>"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "pet_id": self.pet_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "error": self.error,
+            "cry_id": self.cry_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    def update(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        return self
@@ -0,0 +1,57 @@
+# model/cry_rollup.py
+from __future__ import annotations
+from sqlalchemy import Column, String, Integer, ForeignKey, Date, Float
+
+from db_base import DB_Base
+
+
+class CryHourlyRollupTable(DB_Base):
+    """반려동물별 (날짜, 시간, 울음 원인) 단위 울음 횟수와 지속시간 합계. 울음 기록이 바뀔 때마다 함께 갱신된다."""
+    __tablename__ = 'cry_rollup_hourly'
+    pet_id = Column(Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True)
+    date = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)
+    state = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryHourlyRollup(pet_id={self.pet_id}, date={self.date}, hour={self.hour}, state={self.state}, count={self.count}, duration_sum={self.duration_sum})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "date": self.date,
+            "hour": self.hour,
+            "state": self.state,
+            "count": self.count,
+            "duration_sum": self.duration_sum
+        }
+
+
+class CryDailyRollupTable(DB_Base):
+    """반려동물별 (날짜, 울음 원인) 단위 울음 횟수와 지속시간 합계. 긴 분석 기간을 일 단위 bucket으로 합치는 데 사용된다."""
+    __tablename__ = 'cry_rollup_daily'
+    pet_id = Column(Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True)
+    date = Column(Date, primary_key=True)
+    state = Column(String(32), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(Float, nullable=False, default=0.0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryDailyRollup(pet_id={self.pet_id}, date={self.date}, state={self.state}, count={self.count}, duration_sum={self.duration_sum})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "date": self.date,
+            "state": self.state,
+            "count": self.count,
+            "duration_sum": self.duration_sum
+        }
@@ -0,0 +1,29 @@
+# model/cry_stats_snapshot.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, JSON
+
+from db_base import DB_Base
+
+
+class CryStatsSnapshotTable(DB_Base):
+    """반려동물별 실시간 울음 통계 누적값의 스냅샷. 프로세스 시작 시 이 값으로 통계를 복원한다."""
+    __tablename__ = 'cry_stats_snapshot'
+    pet_id = Column(Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    data = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now, onupdate=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryStatsSnapshot(pet_id={self.pet_id}, version={self.version}, updated_at={self.updated_at})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "version": self.version,
+            "data": self.data,
+            "updated_at": self.updated_at
+        }
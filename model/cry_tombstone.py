@@ -0,0 +1,25 @@
+# model/cry_tombstone.py
+from __future__ import annotations
+from datetime import datetime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+
+from db_base import DB_Base
+
+
+class CryTombstoneTable(DB_Base):
+    """
+    삭제된 울음 기록. 변경 feed(/cry/changes)가 삭제도 전달할 수 있도록 삭제 시점의 change_seq와 함께 남긴다.
+    기본 키 (pet_id, change_seq, cry_id)가 그대로 반려동물별 feed 조회 인덱스가 된다.
+    SQLite는 삭제된 울음 id를 다시 쓸 수 있어 같은 cry_id의 tombstone이 여러 개일 수 있다.
+    """
+    __tablename__ = 'cry_tombstone'
+    pet_id = Column(Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True)
+    change_seq = Column(Integer, primary_key=True, autoincrement=False)
+    cry_id = Column(Integer, primary_key=True, autoincrement=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<CryTombstone(pet_id={self.pet_id}, change_seq={self.change_seq}, cry_id={self.cry_id})>"
@@ -1,6 +1,6 @@
 # model/pet.py
 from __future__ import annotations
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from db_base import DB_Base
@@ -9,16 +9,19 @@ from enums.species import SPECIES_KR_TO_EN
 
 class PetTable(DB_Base):
     __tablename__ = 'pet'
+    __table_args__ = (
+        Index('ix_pet_user_id', 'user_id'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False)
-    gender = Column(String, nullable=False)
+    name = Column(String(64), nullable=False)
+    gender = Column(String(16), nullable=False)
     age = Column(Integer, nullable=False)
-    species = Column(String, nullable=False)
-    photo_id = Column(String, nullable=True)
-    sub_species = Column(String, nullable=False)
+    species = Column(String(16), nullable=False)
+    photo_id = Column(String(255), nullable=True)
+    sub_species = Column(String(64), nullable=False)
 
     # Foreign key to UserTable
-    user_id = Column(String, ForeignKey('user.uid'), nullable=False)
+    user_id = Column(String(128), ForeignKey('user.uid'), nullable=False)
 
     # Relationship to UserTable
     owner = relationship("UserTable", back_populates="pets")
@@ -0,0 +1,24 @@
+# model/pet_cry_version.py
+from __future__ import annotations
+from sqlalchemy import Column, Integer, ForeignKey
+
+from db_base import DB_Base
+
+
+class PetCryVersionTable(DB_Base):
+    """반려동물별 데이터 버전. 울음이 생성/수정/삭제되거나 반려동물이 수정될 때마다 1씩 증가하며 캐시 key와 ETag에 사용된다."""
+    __tablename__ = 'pet_cry_version'
+    pet_id = Column(Integer, ForeignKey('pet.id', ondelete='CASCADE'), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def __repr__(self):
+        return f"<PetCryVersion(pet_id={self.pet_id}, version={self.version})>"
+
+    def to_dict(self):
+        return {
+            "pet_id": self.pet_id,
+            "version": self.version
+        }
@@ -0,0 +1,63 @@
+# model/predict_map.py
+# predictMap(라벨 -> 확률)을 DB에 저장하는 압축 형식.
+# 라벨 순서를 고정한 label schema id와, 그 순서대로 확률을 담은 little-endian float 배열(blob)로 저장한다.
+# 라벨 이름은 행마다 반복되지 않고, 읽을 때는 JSON 파싱 대신 struct.unpack 한 번으로 복원한다.
+# 값이 모두 float32로 정확히 표현되면(AI 서버의 softmax 출력) float32, 아니면(예: 0.9) float64로 저장해
+# 복원한 값은 항상 저장 전과 같다. 두 형식은 blob 길이로 구분한다.
+import math
+import struct
+from typing import Dict, Optional, Tuple
+
+# label schema id -> 라벨 순서. 저장된 행이 참조하므로 이미 있는 항목은 절대 바꾸지 않는다.
+# 종에 새 울음 상태가 생기면 새 id로 추가한다.
+PREDICT_LABEL_SCHEMAS: Dict[int, Tuple[str, ...]] = {
+    1: ('anger', 'play', 'happy', 'sad'),   # DogCryStateEnum
+    2: ('happy', 'hunger', 'lonely'),       # CatCryStateEnum
+}
+
+_FLOAT32_STRUCTS = {schema_id: struct.Struct(f'<{len(labels)}f')
+                    for schema_id, labels in PREDICT_LABEL_SCHEMAS.items()}
+_FLOAT64_STRUCTS = {schema_id: struct.Struct(f'<{len(labels)}d')
+                    for schema_id, labels in PREDICT_LABEL_SCHEMAS.items()}
+# (label schema id, blob 길이) -> Struct
+_STRUCTS = {**{(schema_id, s.size): s for schema_id, s in _FLOAT32_STRUCTS.items()},
+            **{(schema_id, s.size): s for schema_id, s in _FLOAT64_STRUCTS.items()}}
+_LABEL_INDEX = {schema_id: {label: i for i, label in enumerate(labels)}
+                for schema_id, labels in PREDICT_LABEL_SCHEMAS.items()}
+_FLOAT32_MAX = 3.4028234663852886e38
+
+
+def encode_predict_map(predict_map: dict) -> Optional[Tuple[int, bytes]]:
+    """
+    predictMap을 (label schema id, blob)으로 만든다.
+    키가 등록된 schema 하나의 라벨에 모두 들어가는 경우만 압축하고, 없는 라벨은 NaN으로 채운다.
+    그 외(모르는 라벨, 숫자가 아닌 값, NaN/inf)는 None을 돌려주며 JSON 그대로 저장해야 한다.
+    """
+    if not isinstance(predict_map, dict) or not predict_map:
+        return None
+    for value in predict_map.values():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            return None
+    for schema_id, label_index in _LABEL_INDEX.items():
+        if not all(label in label_index for label in predict_map):
+            continue
+        values = [math.nan] * len(label_index)
+        for label, value in predict_map.items():
+            values[label_index[label]] = float(value)
+        if all(abs(value) <= _FLOAT32_MAX for value in predict_map.values()):
+            blob = _FLOAT32_STRUCTS[schema_id].pack(*values)
+            unpacked = _FLOAT32_STRUCTS[schema_id].unpack(blob)
+            if all(unpacked[label_index[label]] == value for label, value in predict_map.items()):
+                return schema_id, blob
+        return schema_id, _FLOAT64_STRUCTS[schema_id].pack(*values)
+    return None
+
+
+def decode_predict_map(schema_id: int, blob: bytes) -> Dict[str, float]:
+    values = _STRUCTS[schema_id, len(blob)].unpack(blob)
+    labels = PREDICT_LABEL_SCHEMAS[schema_id]
+    # 합이 NaN이 아니면 모든 라벨이 있는 경우 (대부분)
+    total = sum(values)
+    if total == total:
+        return dict(zip(labels, values))
+    return {label: value for label, value in zip(labels, values) if value == value}
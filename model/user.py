@@ -8,10 +8,10 @@ from db_base import DB_Base
 
 class UserTable(DB_Base):
     __tablename__ = 'user'
-    uid = Column(String, primary_key=True, unique=True, nullable=False)
-    email = Column(String, unique=True, nullable=False)
-    nickname = Column(String, nullable=False)
-    photoId = Column(String, nullable=True)
+    uid = Column(String(128), primary_key=True, unique=True, nullable=False)
+    email = Column(String(255), unique=True, nullable=False)
+    nickname = Column(String(64), nullable=False)
+    photoId = Column(String(255), nullable=True)
 
     # Relationship to PetTable
     pets = relationship("PetTable", back_populates="owner",
@@ -1,6 +1,22 @@
 # schemas/common.py
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Type, TypeVar
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+
+def construct_trusted(cls: Type[ModelT], fields: dict) -> ModelT:
+    """
+    검증 없이 cls 인스턴스를 만든다. DB에서 읽은 행처럼 이미 검증된 값에만 쓴다.
+    model_construct는 필드마다 기본값을 확인하느라 오히려 검증보다 느려서 __dict__를 직접 채운다.
+    fields에 없는 필드는 기본값도 채우지 않으므로 읽을 수 없다 (sparse fieldset 응답).
+    """
+    model = cls.__new__(cls)
+    object.__setattr__(model, '__dict__', fields)
+    object.__setattr__(model, '__pydantic_fields_set__', set(fields))
+    object.__setattr__(model, '__pydantic_extra__', None)
+    object.__setattr__(model, '__pydantic_private__', None)
+    return model
 
 
 class BaseOutput(BaseModel):
@@ -6,7 +6,11 @@ from datetime import datetime
 from enums.cry_state import CRY_STATE_EN_TO_KR, CRY_STATE_KR_TO_EN
 from enums.cry_intensity import CRY_INTENSITY_EN_TO_KR, CRY_INTENSITY_KR_TO_EN
 from validator.cry import validate_state, validate_intensity, validate_duration, validate_time
-from schemas.common import BaseOutput
+from schemas.common import BaseOutput, construct_trusted
+
+# 응답 직렬화 때 쓰는 한국어 lookup. 영어 값은 한국어로 바꾸고, 이미 한국어인 값은 그대로 둔다.
+CRY_STATE_TO_KR = {**{kr: kr for kr in CRY_STATE_KR_TO_EN}, **CRY_STATE_EN_TO_KR}
+CRY_INTENSITY_TO_KR = {**{kr: kr for kr in CRY_INTENSITY_KR_TO_EN}, **CRY_INTENSITY_EN_TO_KR}
 
 
 class Cry(BaseModel):
@@ -33,6 +37,11 @@ class Cry(BaseModel):
     _validate_duration = field_validator('duration')(validate_duration)
     _validate_time = field_validator('time')(validate_time)
 
+    @classmethod
+    def trusted(cls, **fields) -> 'Cry':
+        """검증 없이 Cry를 만든다 (construct_trusted). sparse fieldset 응답에서는 요청된 필드만 넣는다."""
+        return construct_trusted(cls, fields)
+
     def to_korean(self):
         """Convert state to Korean if it's in English."""
         if self.state in CRY_STATE_EN_TO_KR:
@@ -42,6 +51,20 @@ class Cry(BaseModel):
         return self
 
 
+# 목록 API의 fields= 로 고를 수 있는 필드
+CRY_FIELDS = tuple(Cry.model_fields)
+
+
+def localize_cry_dict(cry: dict) -> dict:
+    """model_dump()한 Cry dict의 state, intensity를 한국어로 바꾼다 (to_korean의 직렬화 단계 버전)"""
+    state, intensity = cry.get('state'), cry.get('intensity')
+    if state is not None:
+        cry['state'] = CRY_STATE_TO_KR.get(state, state)
+    if intensity is not None:
+        cry['intensity'] = CRY_INTENSITY_TO_KR.get(intensity, intensity)
+    return cry
+
+
 class CreateCryInput(BaseModel):
     pet_id: int
     time: datetime
@@ -61,12 +84,33 @@ class CreateCryOutput(BaseOutput):
     cry: Optional[Cry] = None
 
 
+class BulkCreateCryInput(BaseModel):
+    cries: List[CreateCryInput] = Field(..., min_length=1)
+
+
+class BulkCryItemResult(BaseModel):
+    index: int
+    status: str  # 'created' | 'rejected'
+    cry_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkCreateCryOutput(BaseOutput):
+    results: Optional[List[BulkCryItemResult]] = None
+    created: int = 0
+    rejected: int = 0
+    # 같은 idempotency key로 이미 처리된 요청이면 True (저장하지 않고 처음 결과를 돌려줌)
+    replayed: bool = False
+
+
 class GetCryOutput(BaseOutput):
     cry: Optional[Cry] = None
 
 
 class GetPetCriesOutput(BaseOutput):
     cries: Optional[List[Cry]] = None
+    # 다음 페이지 cursor (마지막 페이지면 None)
+    next_cursor: Optional[str] = None
 
 
 class UpdateCryInput(BaseModel):
@@ -97,11 +141,49 @@ class DeleteCryOutput(BaseOutput):
 
 class GetCriesWithStateOutput(BaseOutput):
     cries: Optional[List[Cry]] = None
+    # 다음 페이지 cursor (마지막 페이지면 None)
+    next_cursor: Optional[str] = None
 
 
 class GetCriesBetweenTimeOutput(BaseOutput):
     cries: Optional[List[Cry]] = None
+    # 다음 페이지 cursor (마지막 페이지면 None)
+    next_cursor: Optional[str] = None
+
+
+class GetCryChangesOutput(BaseOutput):
+    # cursor 이후 생성/수정된 울음의 현재 값
+    cries: Optional[List[Cry]] = None
+    # cursor 이후 삭제된 울음 id. 다시 쓰인 id가 cries에도 있을 수 있으므로 deleted를 먼저 적용한다
+    deleted: Optional[List[int]] = None
+    # 다음 동기화(또는 다음 페이지)에 쓸 cursor. 변경이 없어도 항상 있다
+    next_cursor: Optional[str] = None
+    # True면 next_cursor로 바로 이어서 요청한다
+    has_more: bool = False
 
 
 class PredictCryOutput(BaseOutput):
     cry: Optional[Cry] = None
+    job: Optional["CryJob"] = None
+
+
+class PredictLongCryOutput(BaseOutput):
+    cries: Optional[List[Cry]] = None
+
+
+class CryJob(BaseModel):
+    id: str
+    pet_id: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    cry: Optional[Cry] = None
+
+
+class GetCryJobOutput(BaseOutput):
+    job: Optional[CryJob] = None
+
+
+PredictCryOutput.model_rebuild()
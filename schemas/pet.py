@@ -6,7 +6,7 @@ from schemas.cry import Cry
 from enums.species import *
 from enums.pet_gender import *
 from validator.species import *
-from schemas.common import BaseOutput
+from schemas.common import BaseOutput, construct_trusted
 
 
 class Pet(BaseModel):
@@ -29,11 +29,17 @@ class Pet(BaseModel):
     _validate_gender = field_validator('gender')(validate_gender)
     _validate_age = field_validator('age')(validate_age)
 
+    @classmethod
+    def trusted(cls, **fields) -> 'Pet':
+        """검증 없이 Pet을 만든다 (construct_trusted). sparse fieldset 응답에서는 요청된 필드만 넣는다."""
+        return construct_trusted(cls, fields)
+
     def to_korean(self):
         """Convert species to Korean if it's in English."""
-        if self.species in SPECIES_EN_TO_KR:
+        # sparse fieldset으로 만든 Pet에는 species, gender가 없을 수 있다
+        if getattr(self, 'species', None) in SPECIES_EN_TO_KR:
             self.species = SPECIES_EN_TO_KR[self.species]
-        if self.gender in PET_GENDER_EN_TO_KR:
+        if getattr(self, 'gender', None) in PET_GENDER_EN_TO_KR:
             self.gender = PET_GENDER_EN_TO_KR[self.gender]
         return self
 
@@ -43,6 +49,10 @@ class Pet(BaseModel):
         super().__init__(**kwargs)
 
 
+# 목록 API의 fields= 로 고를 수 있는 필드
+PET_FIELDS = tuple(Pet.model_fields)
+
+
 class CreatePetInput(BaseModel):
     user_id: str
     name: str
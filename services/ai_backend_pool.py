@@ -0,0 +1,252 @@
+# services/ai_backend_pool.py
+import time
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+import httpx
+
+from core.env import env
+from error.exceptions import PredictionServerError
+from log import logger
+
+T = TypeVar('T')
+
+
+def is_replica_failure(error: BaseException) -> bool:
+    """
+    replica 자체의 장애인지: 연결 실패/timeout과 5xx 응답만 해당한다.
+    4xx나 응답 형식 오류(PredictionServerError)는 요청의 문제이므로 circuit breaker 실패로 세지 않고 다른 replica로 재시도하지 않는다.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class Replica:
+    """AI 추론 서버 replica 하나의 상태: 진행 중인 요청 수, circuit breaker, 지연 시간 통계."""
+
+    def __init__(self, url: str, latency_window: int = 200):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.hedges = 0
+        self.consecutive_failures = 0
+        # circuit breaker: open_until이 0이면 closed, 그 전까지는 open, 지나면 half-open
+        self.open_until = 0.0
+        self.reopen_count = 0
+        self.trial_in_flight = False
+        self.latencies = deque(maxlen=latency_window)
+
+    def circuit_state(self, now: float) -> str:
+        if not self.open_until:
+            return 'closed'
+        return 'open' if now < self.open_until else 'half_open'
+
+    def is_available(self, now: float) -> bool:
+        state = self.circuit_state(now)
+        # half-open이면 시험 요청 하나만 보낸다
+        return state == 'closed' or (state == 'half_open' and not self.trial_in_flight)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            'url': self.url,
+            'outstanding': self.outstanding,
+            'requests': self.requests,
+            'failures': self.failures,
+            'hedges': self.hedges,
+            'circuit': self.circuit_state(time.monotonic()),
+            'p50_ms': round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+            'p95_ms': round(self.p95() * 1000, 1) if self.p95() is not None else None,
+        }
+
+
+class AIBackendPool:
+    """
+    여러 AI 추론 서버 replica 중 진행 중인 요청이 가장 적은 replica로 요청을 보낸다.
+    연속으로 실패한 replica는 circuit breaker로 cooldown 동안 제외한다. cooldown이 지나면(half-open) 시험 요청 하나만 보내
+    성공하면 다시 닫고, 실패하면 cooldown을 두 배로 늘려(max_cooldown까지) 다시 연다.
+    첫 요청이 replica의 p95 지연 시간을 넘기면 다른 replica로 hedged 요청을 보내 먼저 온 응답을 사용한다.
+    """
+
+    def __init__(self, urls_by_species: Dict[Optional[str], List[str]],
+                 failure_threshold: int = 3, cooldown: float = 30.0, max_cooldown: float = 300.0,
+                 hedge_enabled: bool = True, hedge_min_delay: float = 0.05,
+                 max_attempts: int = 2):
+        self.replicas: Dict[Optional[str], List[Replica]] = {
+            species: [Replica(url) for url in urls]
+            for species, urls in urls_by_species.items() if urls
+        }
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self.max_attempts = max_attempts
+
+    @classmethod
+    def from_env(cls) -> 'AIBackendPool':
+        default_urls = env.get_list("AI_SERVER_APIS") or env.get_list("AI_SERVER_API")
+        urls_by_species = {None: default_urls}
+        for species in ('dog', 'cat'):
+            urls_by_species[species] = env.get_list(
+                f"AI_SERVER_APIS_{species.upper()}")
+        return cls(
+            urls_by_species,
+            failure_threshold=env.get_int("AI_SERVER_FAILURE_THRESHOLD", 3),
+            cooldown=env.get_float("AI_SERVER_COOLDOWN", 30.0),
+            max_cooldown=env.get_float("AI_SERVER_MAX_COOLDOWN", 300.0),
+            hedge_enabled=env.get_bool("AI_SERVER_HEDGE_ENABLED", True),
+            hedge_min_delay=env.get_float("AI_SERVER_HEDGE_MIN_DELAY_MS", 50.0) / 1000,
+            max_attempts=env.get_int("AI_SERVER_MAX_ATTEMPTS", 2),
+        )
+
+    def replicas_for(self, species: Optional[str]) -> List[Replica]:
+        replicas = self.replicas.get(species) or self.replicas.get(None)
+        if not replicas:
+            raise PredictionServerError(
+                f"No AI server configured for species {species}")
+        return replicas
+
+    def choose(self, species: Optional[str], exclude: Sequence[Replica] = ()) -> Optional[Replica]:
+        now = time.monotonic()
+        candidates = [replica for replica in self.replicas_for(species)
+                      if replica not in exclude]
+        available = [replica for replica in candidates
+                     if replica.is_available(now)]
+        # 모든 replica의 circuit이 열려 있으면(half-open 시험 요청 중 포함) 보내지 않는다
+        return min(available, key=lambda replica: replica.outstanding) if available else None
+
+    def _open(self, replica: Replica, error: Exception) -> None:
+        cooldown = min(self.cooldown * 2 ** replica.reopen_count, self.max_cooldown)
+        replica.open_until = time.monotonic() + cooldown
+        logger.warning(
+            f"AI server {replica.url} circuit opened for {cooldown}s: {error}")
+
+    def _record_success(self, replica: Replica, latency: Optional[float], trial: bool) -> None:
+        # latency가 None이면 지연 시간 표본에 넣지 않는다 (hedge 기준 p95에 섞이지 않도록)
+        if latency is not None:
+            replica.latencies.append(latency)
+        replica.consecutive_failures = 0
+        # circuit이 열리기 전에 보낸 요청의 응답으로는 닫지 않는다 (half-open 시험 요청만 닫는다)
+        if trial:
+            replica.open_until = 0.0
+            replica.reopen_count = 0
+            logger.info(f"AI server {replica.url} circuit closed")
+
+    def _record_failure(self, replica: Replica, error: Exception, trial: bool) -> None:
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if trial:
+            replica.reopen_count += 1
+            self._open(replica, error)
+        elif not replica.open_until and replica.consecutive_failures >= self.failure_threshold:
+            self._open(replica, error)
+
+    def _start(self, replica: Replica, send: Callable[[str], Awaitable[T]]) -> asyncio.Task:
+        # 다음 요청의 replica 선택에 바로 반영되도록 task 생성 시점에 진행 중 요청 수를 증가시킨다
+        replica.outstanding += 1
+        replica.requests += 1
+        # choose()는 half-open인 replica를 시험 요청이 없을 때만 고르므로, 열린 replica로 가는 요청은 시험 요청이다
+        trial = bool(replica.open_until)
+        if trial:
+            replica.trial_in_flight = True
+        task = asyncio.create_task(self._attempt(replica, send, trial))
+        task.add_done_callback(lambda _: self._finish(replica, trial))
+        return task
+
+    def _finish(self, replica: Replica, trial: bool) -> None:
+        replica.outstanding -= 1
+        # hedged 요청에서 취소된 시험 요청도 여기서 풀려 다음 요청이 다시 시험한다
+        if trial:
+            replica.trial_in_flight = False
+
+    async def _attempt(self, replica: Replica, send: Callable[[str], Awaitable[T]], trial: bool) -> T:
+        """
+        send(url)을 보내고 replica 상태를 기록한다. replica 장애가 아닌 에러(4xx 등)는 replica가 응답한 것이므로 성공으로 기록한다.
+        send가 None을 돌려주면(endpoint가 없어 요청을 처리하지 않은 경우) 지연 시간 표본에 넣지 않는다.
+        """
+        started = time.monotonic()
+        try:
+            result = await send(replica.url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_replica_failure(e):
+                self._record_failure(replica, e, trial)
+            else:
+                self._record_success(replica, None, trial)
+            raise
+        self._record_success(
+            replica, None if result is None else time.monotonic() - started, trial)
+        return result
+
+    async def _hedged(self, species: Optional[str], replica: Replica, tried: List[Replica],
+                      send: Callable[[str], Awaitable[T]]) -> T:
+        primary = self._start(replica, send)
+        tasks = {primary}
+        try:
+            p95 = replica.p95()
+            if self.hedge_enabled and p95 is not None:
+                done, _ = await asyncio.wait(tasks, timeout=max(p95, self.hedge_min_delay))
+                if not done:
+                    secondary = self.choose(species, exclude=tried)
+                    if secondary is not None:
+                        tried.append(secondary)
+                        secondary.hedges += 1
+                        tasks.add(self._start(secondary, send))
+
+            # 먼저 성공한 응답을 사용하고, 모두 실패하면 마지막 에러를 전달
+            # (replica 장애가 아닌 에러는 다른 replica의 응답도 같을 것이므로 바로 전달)
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                    if not is_replica_failure(error):
+                        raise error
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def request(self, species: Optional[str], send: Callable[[str], Awaitable[T]]) -> T:
+        """
+        send(url)을 건강한 replica에 보내고, replica 장애(연결 실패/timeout/5xx)이면 다른 replica로 최대 max_attempts번 시도한다.
+        4xx 응답은 재시도하지 않고 바로 PredictionServerError로, send가 던진 PredictionServerError는 그대로 전달한다.
+        """
+        tried: List[Replica] = []
+        error = None
+        for _ in range(self.max_attempts):
+            replica = self.choose(species, exclude=tried)
+            if replica is None:
+                break
+            tried.append(replica)
+            try:
+                return await self._hedged(species, replica, tried, send)
+            except PredictionServerError:
+                raise
+            except Exception as e:
+                if not is_replica_failure(e):
+                    raise PredictionServerError(f"AI server request failed: {e}") from e
+                error = e
+                logger.warning(f"AI server request to {replica.url} failed: {e}")
+        if error is None:
+            raise PredictionServerError(
+                f"No AI server available for species {species} (circuit open)")
+        raise PredictionServerError(f"AI server request failed: {error}")
+
+    def stats(self) -> dict:
+        return {
+            species or 'default': [replica.stats() for replica in replicas]
+            for species, replicas in self.replicas.items()
+        }
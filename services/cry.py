@@ -1,33 +1,88 @@
 # services/cry.py
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import insert, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, Query
+from typing import List, Tuple
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar
 import os
 import json
-import pandas as pd
-from sqlalchemy.dialects import sqlite
+import uuid
+import asyncio
+import hashlib
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from schemas.cry import *
 from model.cry import CryTable
 from model.pet import PetTable
+from model.cry_bulk_request import CryBulkRequestTable
+from model.cry_tombstone import CryTombstoneTable
 from error.exceptions import (
-    CryNotFoundError, UnauthorizedError, WrongCryOfSpeciesError)
-from utils.converters import cry_table_to_schema
+    CryNotFoundError, UnauthorizedError, ValidationError, WrongCryOfSpeciesError, WavFileNotFoundError,
+    IdempotencyKeyConflictError)
+from utils.converters import cry_table_to_schema, cry_row_to_schema
+from utils.async_db import DBSession, run_db, run_db_write, release_connection
+from utils.pagination import encode_cursor, decode_cursor, encode_change_cursor, decode_change_cursor
+from utils.os_utils import save_upload_to_temp, link_file, remove_file
+from utils.audio import analyze_wav, analyze_samples, decode_wav, detect_segments, write_wav
 from enums.cry_state import check_right_cry_state
-from constants.path import CRY_INSPECT_LOG_DIR, CRY_DATASET_DIR
+from enums.inspect import InspectGranularityEnum, allowed_inspect_window_days, allowed_inspect_granularity
+from constants.path import CRY_DATASET_DIR
 from services.cry_predict import cry_predict
+from services.cry_rollup import cry_rollup_service
+from services.cry_inspect import CryAggregate, cry_inspect_engine
+from services.cry_inspect_cache import inspect_cache, make_inspect_cache_key
+from services.cry_version import cry_version_service
+from services.cry_stats import cry_stats_engine
+from services.cry_batcher import cry_predict_batcher
+from services.cry_predict_cache import predict_cache, make_predict_cache_key
+from services.pet_owner_cache import PetOwner, pet_owner_cache
+from core.env import env
+from log import logger
+
+T = TypeVar('T')
+
+UPLOAD_CHUNK_SIZE = env.get_int("CRY_UPLOAD_CHUNK_SIZE", 1024 * 1024)
+SEGMENT_MIN_DURATION = env.get_float("CRY_SEGMENT_MIN_DURATION", 0.3)
+SEGMENT_MIN_GAP = env.get_float("CRY_SEGMENT_MIN_GAP", 0.3)
+SEGMENT_MAX_DURATION = env.get_float("CRY_SEGMENT_MAX_DURATION", 10.0)
+INSPECT_MIN_CRIES = env.get_int("CRY_INSPECT_MIN_CRIES", 100)
+# 울음 목록/검색 한 페이지의 기본/최대 크기
+CRY_PAGE_SIZE = env.get_int("CRY_PAGE_SIZE", 50)
+CRY_PAGE_SIZE_MAX = env.get_int("CRY_PAGE_SIZE_MAX", 200)
+# /cry/bulk 한 요청의 최대 울음 개수와 idempotency key 보관 시간
+CRY_BULK_MAX_ITEMS = env.get_int("CRY_BULK_MAX_ITEMS", 500)
+CRY_BULK_IDEMPOTENCY_TTL_HOURS = env.get_int("CRY_BULK_IDEMPOTENCY_TTL_HOURS", 24)
+
+
+def make_audio_id(pet_id: int, curtime: datetime) -> str:
+    """dataset wav 파일 id. 같은 초에 올라온 녹음끼리 겹치지 않도록 마이크로초와 임의 접미사를 붙인다."""
+    return f'{pet_id}_{curtime.strftime("%Y%m%d-%H%M%S-%f")}_{uuid.uuid4().hex[:8]}'
 
 
 class CryService:
-    def _get_user_pet(self, db: Session, pet_id: int, user_id: str) -> Optional[PetTable]:
-        return db.query(PetTable).filter(
-            PetTable.id == pet_id,
-            PetTable.user_id == user_id
-        ).first()
+    def _get_user_pet(self, db: Session, pet_id: int, user_id: str) -> Optional[PetOwner]:
+        """user_id가 소유한 반려동물 정보. pet_owner_cache에 있으면 쿼리하지 않는다."""
+        pet = pet_owner_cache.load(db, [pet_id]).get(pet_id)
+        return pet if pet is not None and pet.user_id == user_id else None
+
+    def _pets_gone(self, db: Session, pet_ids: Iterable[int], user_id: str) -> bool:
+        """
+        울음 저장이 IntegrityError로 실패한 뒤(롤백 후) 호출한다. pet_owner_cache로 확인한 반려동물이
+        그 사이 다른 프로세스에서 삭제되었는지(외래 키 위반) 캐시 항목을 지우고 DB에서 다시 확인한다.
+        """
+        pet_ids = set(pet_ids)
+        pet_owner_cache.invalidate(pet_ids)
+        pets = pet_owner_cache.load(db, pet_ids)
+        return any(pet_id not in pets or pets[pet_id].user_id != user_id for pet_id in pet_ids)
 
     async def create_cry(self, db: Session, create_cry_input: CreateCryInput, user_id: str) -> Cry:
+        return self._create_cry(db, create_cry_input, user_id)
+
+    def _create_cry(self, db: Session, create_cry_input: CreateCryInput, user_id: str,
+                    before_commit: Optional[Callable[[CryTable], None]] = None) -> Cry:
+        """before_commit은 울음 INSERT 직후 같은 트랜잭션 안에서 호출된다 (울음 분석 작업의 완료 처리 등)."""
         pet = self._get_user_pet(db, create_cry_input.pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
@@ -38,13 +93,151 @@ class CryService:
         if notRightSpeciesError:
             raise WrongCryOfSpeciesError(notRightSpeciesError)
 
-        cry_table = CryTable(**create_cry_input.model_dump())
-        db.add(cry_table)
-        db.commit()
+        try:
+            cry_table = CryTable(**create_cry_input.model_dump())
+            db.add(cry_table)
+            cry_rollup_service.add(db, [cry_table])
+            cry_table.change_seq = cry_version_service.bump(db, pet.id)
+            if before_commit is not None:
+                db.flush()
+                before_commit(cry_table)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            # 캐시로 확인한 반려동물이 그 사이 삭제됨: 캐시가 없을 때와 같은 에러
+            if self._pets_gone(db, [pet.id], user_id):
+                raise UnauthorizedError(
+                    "You are not authorized to create a cry for this pet")
+            raise
         db.refresh(cry_table)
+        cry_stats_engine.on_create(
+            pet.id, [(cry_table.time, cry_table.state, cry_table.duration)], cry_table.change_seq)
 
         return cry_table_to_schema(cry_table)
 
+    def _insert_cries(self, db: Session, pet: PetOwner, create_cry_inputs: List[CreateCryInput]) -> List[Cry]:
+        """같은 반려동물의 울음 여러 개를 한 트랜잭션으로 저장한다."""
+        for create_cry_input in create_cry_inputs:
+            notRightSpeciesError = check_right_cry_state(
+                pet.species, create_cry_input.state)
+            if notRightSpeciesError:
+                raise WrongCryOfSpeciesError(notRightSpeciesError)
+
+        try:
+            change_seq = cry_version_service.bump(db, pet.id)
+            cry_tables = [CryTable(**create_cry_input.model_dump(), change_seq=change_seq)
+                          for create_cry_input in create_cry_inputs]
+            db.add_all(cry_tables)
+            cry_rollup_service.add(db, cry_tables)
+            db.flush()
+            cries = [cry_table_to_schema(cry_table) for cry_table in cry_tables]
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            if self._pets_gone(db, [pet.id], pet.user_id):
+                raise UnauthorizedError(
+                    "You are not authorized to create a cry for this pet")
+            raise
+        cry_stats_engine.on_create(
+            pet.id, [(cry.time, cry.state, cry.duration) for cry in cries], change_seq)
+
+        return cries
+
+    def bulk_create_cries(self, db: Session, create_cry_inputs: List[CreateCryInput], user_id: str,
+                          idempotency_key: Optional[str] = None) -> Tuple[List[BulkCryItemResult], bool]:
+        """
+        오프라인 동안 기기에 쌓인 울음들을 한 번에 저장하고 (항목별 결과, 재요청 여부)를 돌려준다.
+        소유권은 서로 다른 pet_id 전체를 쿼리 한 번으로 확인하고, 통과한 항목만 한 트랜잭션에서 executemany로 넣는다.
+        idempotency_key가 같은 재요청은 저장하지 않고 처음 결과를 그대로 돌려준다.
+        """
+        if len(create_cry_inputs) > CRY_BULK_MAX_ITEMS:
+            raise ValidationError(
+                f"Too many cries in one request (max {CRY_BULK_MAX_ITEMS})")
+
+        request_hash = None
+        if idempotency_key:
+            request_hash = hashlib.sha256(json.dumps(
+                [create_cry_input.model_dump(mode='json') for create_cry_input in create_cry_inputs],
+                sort_keys=True).encode()).hexdigest()
+            replay = self._find_bulk_request(db, user_id, idempotency_key, request_hash)
+            if replay is not None:
+                return replay, True
+
+        pets = {pet.id: pet for pet in pet_owner_cache.load(
+            db, (create_cry_input.pet_id for create_cry_input in create_cry_inputs)).values()
+            if pet.user_id == user_id}
+
+        results: List[Optional[BulkCryItemResult]] = [None] * len(create_cry_inputs)
+        accepted = []
+        for index, create_cry_input in enumerate(create_cry_inputs):
+            pet = pets.get(create_cry_input.pet_id)
+            error = (f"You are not authorized to create a cry for pet {create_cry_input.pet_id}" if pet is None
+                     else check_right_cry_state(pet.species, create_cry_input.state))
+            if error:
+                results[index] = BulkCryItemResult(
+                    index=index, status='rejected', error=error)
+            else:
+                accepted.append((index, create_cry_input.model_dump()))
+
+        try:
+            if accepted:
+                rows = [row for _, row in accepted]
+                change_seqs = {pet_id: cry_version_service.bump(db, pet_id)
+                               for pet_id in sorted({row['pet_id'] for row in rows})}
+                cry_ids = self._insert_rows(
+                    db, [{**row, 'change_seq': change_seqs[row['pet_id']]} for row in rows])
+                for (index, _), cry_id in zip(accepted, cry_ids):
+                    results[index] = BulkCryItemResult(
+                        index=index, status='created', cry_id=cry_id)
+                cry_rollup_service.add(db, [CryTable(**row) for row in rows])
+
+            if idempotency_key:
+                db.query(CryBulkRequestTable).filter(
+                    CryBulkRequestTable.created_at < datetime.now() - timedelta(hours=CRY_BULK_IDEMPOTENCY_TTL_HOURS)
+                ).delete(synchronize_session=False)
+                db.add(CryBulkRequestTable(
+                    user_id=user_id, idempotency_key=idempotency_key, request_hash=request_hash,
+                    result=[result.model_dump() for result in results]))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            # 같은 key의 요청이 동시에 처리되어 먼저 commit됨
+            if idempotency_key:
+                replay = self._find_bulk_request(db, user_id, idempotency_key, request_hash)
+                if replay is not None:
+                    return replay, True
+            # 캐시로 확인한 반려동물이 그 사이 삭제됨: 다시 확인해 그 반려동물의 항목만 거절한다
+            if self._pets_gone(db, {row['pet_id'] for _, row in accepted}, user_id):
+                return self.bulk_create_cries(db, create_cry_inputs, user_id, idempotency_key)
+            raise
+
+        for pet_id in {row['pet_id'] for _, row in accepted}:
+            cry_stats_engine.on_create(pet_id, [
+                (row['time'], row['state'], row['duration']) for _, row in accepted if row['pet_id'] == pet_id],
+                change_seqs[pet_id])
+        return results, False
+
+    def _insert_rows(self, db: Session, rows: List[dict]) -> List[Optional[int]]:
+        """executemany로 울음을 넣는다. RETURNING을 executemany와 함께 쓸 수 있는 DB(SQLite 등)에서만 id를 돌려준다."""
+        rows = [{**row, **CryTable.predict_columns(row['predictMap'])} for row in rows]
+        dialect = db.get_bind().dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            return list(db.execute(insert(CryTable.__table__).returning(
+                CryTable.__table__.c.id, sort_by_parameter_order=True), rows).scalars())
+        db.execute(insert(CryTable.__table__), rows)
+        return [None] * len(rows)
+
+    def _find_bulk_request(self, db: Session, user_id: str, idempotency_key: str,
+                           request_hash: str) -> Optional[List[BulkCryItemResult]]:
+        bulk_request = db.get(CryBulkRequestTable, (user_id, idempotency_key))
+        if bulk_request is None or \
+                bulk_request.created_at < datetime.now() - timedelta(hours=CRY_BULK_IDEMPOTENCY_TTL_HOURS):
+            return None
+        if bulk_request.request_hash != request_hash:
+            raise IdempotencyKeyConflictError(
+                "Idempotency key was already used with a different request")
+        return [BulkCryItemResult(**result) for result in bulk_request.result]
+
     def get_cry_by_id(self, db: Session, cry_id: int, user_id: str) -> Cry:
         cry_table = db.query(CryTable).join(PetTable).filter(
             CryTable.id == cry_id,
@@ -54,36 +247,82 @@ class CryService:
             raise CryNotFoundError(f"Cry with id {cry_id} not found")
         return cry_table_to_schema(cry_table)
 
-    def get_all_cries_by_pet(self, db: Session, pet_id: int, user_id: str) -> List[Cry]:
-        pet = self._get_user_pet(db, pet_id, user_id)
-        if not pet:
+    def _cry_columns(self, fields: Tuple[str, ...]) -> list:
+        """fields만 응답할 때 읽을 컬럼. cursor를 만들 id, time은 항상 읽고 predictMap은 저장 컬럼 3개로 읽는다."""
+        columns = {'id': CryTable.id, 'time': CryTable.time}
+        for field in fields:
+            if field == 'predictMap':
+                columns.update(predict_schema=CryTable.predict_schema, predict_probs=CryTable.predict_probs,
+                               predict_map_json=CryTable.predict_map_json)
+            else:
+                columns[field] = getattr(CryTable, field)
+        return list(columns.values())
+
+    def _paginate(self, query: Query, cursor: Optional[str], limit: Optional[int],
+                  fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
+        """
+        최신 기록부터 (time, id) 내림차순 keyset pagination.
+        OFFSET과 달리 cursor 위치에서 (pet_id[, state], time) 인덱스를 바로 이어 읽으므로 페이지 깊이와 관계없이 비용이 같다.
+        fields가 있으면 그 필드에 필요한 컬럼만 SELECT하고, 돌려주는 Cry에도 그 필드만 있다.
+        """
+        limit = min(limit or CRY_PAGE_SIZE, CRY_PAGE_SIZE_MAX)
+        if cursor:
+            cursor_time, cursor_id = decode_cursor(cursor)
+            # time <= cursor_time은 (time, id) 비교와 같은 뜻이지만 인덱스 범위 조건으로 쓰이도록 함께 둔다
+            query = query.filter(
+                CryTable.time <= cursor_time,
+                tuple_(CryTable.time, CryTable.id) < tuple_(cursor_time, cursor_id))
+        if fields is not None:
+            query = query.with_entities(*self._cry_columns(fields))
+        cry_tables = query.order_by(
+            CryTable.time.desc(), CryTable.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(cry_tables) > limit:
+            cry_tables = cry_tables[:limit]
+            next_cursor = encode_cursor(cry_tables[-1].time, cry_tables[-1].id)
+        if fields is not None:
+            return [cry_row_to_schema(row, fields) for row in cry_tables], next_cursor
+        return [cry_table_to_schema(cry) for cry in cry_tables], next_cursor
+
+    def get_all_cries_by_pet(self, db: Session, pet_id: int, user_id: str, cursor: Optional[str] = None,
+                             limit: Optional[int] = None,
+                             fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
+        query = db.query(CryTable).join(PetTable).filter(
+            CryTable.pet_id == pet_id,
+            PetTable.user_id == user_id
+        )
+        cries, next_cursor = self._paginate(query, cursor, limit, fields)
+        # 빈 페이지일 때만 울음이 없는 것인지 소유자가 아닌 것인지 구분한다
+        if not cries and not self._get_user_pet(db, pet_id, user_id):
             raise UnauthorizedError(
                 "You are not authorized to view cries for this pet")
-
-        cry_tables = db.query(CryTable).filter(CryTable.pet_id == pet_id).all()
-        return [cry_table_to_schema(cry) for cry in cry_tables]
+        return cries, next_cursor
 
     def update_cry(self, db: Session, cry_id: int, update_cry_input: UpdateCryInput, user_id: str) -> Cry:
-        cry_table = db.query(CryTable).join(PetTable).filter(
+        row = db.query(CryTable, PetTable.species).join(PetTable).filter(
             CryTable.id == cry_id,
             PetTable.user_id == user_id
         ).first()
-        if not cry_table:
+        if not row:
             raise CryNotFoundError(f"Cry with id {cry_id} not found")
-
-        pet = self._get_user_pet(db, cry_table.pet_id, user_id)
-        if not pet:
-            raise UnauthorizedError(
-                "You are not authorized to view cries for this pet")
+        cry_table, species = row
 
         notRightSpeciesError = check_right_cry_state(
-            pet.species, update_cry_input.state)
+            species, update_cry_input.state)
         if notRightSpeciesError:
             raise WrongCryOfSpeciesError(notRightSpeciesError)
 
+        previous = (cry_table.time, cry_table.state, cry_table.duration)
         cry_table.update(**update_cry_input.model_dump(exclude_unset=True))
+        if previous != (cry_table.time, cry_table.state, cry_table.duration):
+            cry_rollup_service.remove(db, cry_table.pet_id, *previous)
+            cry_rollup_service.add(db, [cry_table])
+        cry_table.change_seq = cry_version_service.bump(db, cry_table.pet_id)
         db.commit()
         db.refresh(cry_table)
+        cry_stats_engine.on_update(cry_table.pet_id, previous, (
+            cry_table.time, cry_table.state, cry_table.duration), cry_table.change_seq)
 
         return cry_table_to_schema(cry_table)
 
@@ -95,10 +334,19 @@ class CryService:
         if not cry_table:
             raise CryNotFoundError(f"Cry with id {cry_id} not found")
 
+        pet_id = cry_table.pet_id
+        removed = (cry_table.time, cry_table.state, cry_table.duration)
+        cry_rollup_service.remove(db, pet_id, *removed)
+        version = cry_version_service.bump(db, pet_id)
+        db.add(CryTombstoneTable(
+            pet_id=pet_id, change_seq=version, cry_id=cry_id))
         db.delete(cry_table)
         db.commit()
+        cry_stats_engine.on_delete(pet_id, *removed, version)
 
-    def get_pets_with_state(self, db: Session, pet_id: int, query_state: str, user_id: str) -> List[Cry]:
+    def get_pets_with_state(self, db: Session, pet_id: int, query_state: str, user_id: str,
+                            cursor: Optional[str] = None, limit: Optional[int] = None,
+                            fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
         pet = self._get_user_pet(db, pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
@@ -110,101 +358,154 @@ class CryService:
         if notRightSpeciesError:
             raise WrongCryOfSpeciesError(notRightSpeciesError)
 
-        cry_tables = db.query(CryTable).filter(
+        # 캐시된 소유자 정보가 다른 프로세스의 변경으로 오래되었더라도 다른 사용자의 울음은 읽지 않는다
+        query = db.query(CryTable).join(PetTable).filter(
             CryTable.pet_id == pet_id,
             CryTable.state == standardized_state,
-        ).all()
-        return [cry_table_to_schema(cry) for cry in cry_tables]
+            PetTable.user_id == user_id
+        )
+        return self._paginate(query, cursor, limit, fields)
 
-    def get_pets_between_time(self, db: Session, pet_id: int, start_time: datetime, end_time: datetime, user_id: str) -> List[Cry]:
-        cry_tables = db.query(CryTable).join(PetTable).filter(
+    def get_pets_between_time(self, db: Session, pet_id: int, start_time: datetime, end_time: datetime, user_id: str,
+                              cursor: Optional[str] = None, limit: Optional[int] = None,
+                              fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
+        query = db.query(CryTable).join(PetTable).filter(
             CryTable.pet_id == pet_id,
             CryTable.time >= start_time,
             CryTable.time <= end_time + timedelta(days=1),
             PetTable.user_id == user_id
-        ).all()
-        return [cry_table_to_schema(cry) for cry in cry_tables]
+        )
+        return self._paginate(query, cursor, limit, fields)
+
+    def _changes_after(self, query: Query, seq_column, id_column, cursor_seq: int, cursor_id: int,
+                       limit: int) -> list:
+        """
+        (seq_column, id_column) > (cursor_seq, cursor_id)인 행을 그 순서로 limit개까지 읽는다.
+        bulk 저장이나 m0006 이전 울음(change_seq 0)처럼 같은 change_seq의 행이 많으면 한 번의 row value 비교로는
+        인덱스에서 cursor 위치를 바로 찾지 못하므로, 같은 change_seq의 나머지와 그 다음 change_seq를 나눠 읽는다.
+        """
+        rows = query.filter(seq_column == cursor_seq, id_column > cursor_id) \
+            .order_by(id_column).limit(limit).all()
+        if len(rows) < limit:
+            rows += query.filter(seq_column > cursor_seq) \
+                .order_by(seq_column, id_column).limit(limit - len(rows)).all()
+        return rows
+
+    def get_cry_changes(self, db: Session, pet_id: int, user_id: str, cursor: Optional[str] = None,
+                        limit: Optional[int] = None, fields: Optional[Tuple[str, ...]] = None
+                        ) -> Tuple[List[Cry], List[int], str, bool]:
+        """
+        cursor 이후 생성/수정된 울음과 삭제된 울음 id를 (change_seq, id) 순서로 limit개까지 돌려준다.
+        (울음, 삭제된 id, 다음 cursor, 더 있는지). cursor가 없으면 처음부터(현재 울음 전체) 돌려준다.
+        change_seq는 반려동물 울음 버전이라 commit 순서대로 증가하므로 cursor 뒤에 늦게 commit된 변경이 끼어들지 않는다.
+        """
+        limit = min(limit or CRY_PAGE_SIZE, CRY_PAGE_SIZE_MAX)
+        cursor_seq, cursor_id = decode_change_cursor(cursor) if cursor else (0, 0)
+
+        query = db.query(CryTable).join(PetTable).filter(
+            CryTable.pet_id == pet_id,
+            PetTable.user_id == user_id)
+        if fields is not None:
+            query = query.with_entities(CryTable.change_seq, *self._cry_columns(fields))
+        cry_rows = self._changes_after(
+            query, CryTable.change_seq, CryTable.id, cursor_seq, cursor_id, limit + 1)
+        tombstones = self._changes_after(
+            db.query(CryTombstoneTable.change_seq, CryTombstoneTable.cry_id).join(PetTable).filter(
+                CryTombstoneTable.pet_id == pet_id,
+                PetTable.user_id == user_id),
+            CryTombstoneTable.change_seq, CryTombstoneTable.cry_id, cursor_seq, cursor_id, limit + 1)
+        if not cry_rows and not tombstones and not self._get_user_pet(db, pet_id, user_id):
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+
+        # 두 목록을 (change_seq, id) 순서로 합쳐 limit개만 쓴다
+        changes = sorted([(row.change_seq, row.id, row) for row in cry_rows] +
+                         [(change_seq, cry_id, None) for change_seq, cry_id in tombstones],
+                         key=lambda change: change[:2])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        to_schema = cry_table_to_schema if fields is None else (lambda row: cry_row_to_schema(row, fields))
+        cries = [to_schema(row) for _, _, row in changes if row is not None]
+        deleted = [cry_id for _, cry_id, row in changes if row is None]
+        next_cursor = encode_change_cursor(*changes[-1][:2]) if changes else \
+            (cursor or encode_change_cursor(cursor_seq, cursor_id))
+        return cries, deleted, next_cursor, has_more
+
+    def get_data_version(self, db: Session, pet_id: int, user_id: str) -> Optional[int]:
+        """user_id가 소유한 반려동물의 데이터 버전 (ETag용). 소유자가 아니면 None."""
+        pet = self._get_user_pet(db, pet_id, user_id)
+        if not pet:
+            return None
+        return cry_version_service.get(db, pet.id)
 
-    def inspect_cry(self, db: Session, pet_id: int, user_id: str):
+    def inspect_cry(self, db: Session, pet_id: int, user_id: str, window_days: int = 30,
+                    granularity: str = InspectGranularityEnum.DAILY.value):
         # 유저의 반려동물인지 확인
         pet = self._get_user_pet(db, pet_id, user_id)
         if not pet:
             raise UnauthorizedError(
                 "You are not authorized to view cries for this pet")
 
-        # 분석 기간 설정
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)
-
-        # 파일 이름 설정: 로그 파일이 있는 경우 가져오며 그렇지 않을 경우 분석을 수행
-        file_name = f"{pet.id}_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}"
-        file_path = os.path.join(CRY_INSPECT_LOG_DIR, f'{file_name}.json')
-
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                res = json.loads(f.read())
-            return res
-
-        query = db.query(CryTable).filter(
-            CryTable.pet_id == pet_id,
-            CryTable.time >= start_date,
-            CryTable.time <= end_date
-        )
-        sql_query = query.statement.compile(
-            dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+        if window_days not in allowed_inspect_window_days:
+            raise ValidationError(
+                f"Invalid window: {window_days}. Allowed windows are {allowed_inspect_window_days}")
+        if granularity not in allowed_inspect_granularity:
+            raise ValidationError(
+                f"Invalid granularity: {granularity}. Allowed granularities are {allowed_inspect_granularity}")
+
+        start_date, end_date = self.inspect_period(window_days)
+
+        # 캐시 key에 울음 데이터 버전을 넣어, 울음이 추가/수정/삭제된 뒤에는 다시 분석
+        version = cry_version_service.get(db, pet.id)
+        cached = inspect_cache.get(make_inspect_cache_key(
+            pet.id, version, start_date, end_date, granularity))
+        if cached is not None:
+            return cached
+
+        # 원본 울음 기록을 읽지 않고 미리 계산된 bucket을 DB에서 합쳐 분석
+        aggregate = cry_inspect_engine.aggregate(
+            db, pet.id, start_date, end_date, granularity)
+        return self.store_inspect_result(
+            pet.id, version, start_date, end_date, granularity, aggregate)
+
+    def get_live_stats(self, db: Session, pet_id: int, user_id: str) -> dict:
+        pet = self._get_user_pet(db, pet_id, user_id)
+        if not pet:
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+        return cry_stats_engine.get(db, pet.id)
 
-        df = pd.read_sql(sql_query, db.connection())
+    def inspect_period(self, window_days: int, end_date: Optional[datetime] = None):
+        end_date = end_date or datetime.now()
+        return end_date - timedelta(days=window_days), end_date
 
-        if len(df) < 100:
+    def store_inspect_result(self, pet_id: int, version: int, start_date: datetime, end_date: datetime,
+                             granularity: str, aggregate: CryAggregate) -> Optional[dict]:
+        """집계로부터 분석 결과를 만들어 캐시에 저장한다. 울음이 너무 적으면 None."""
+        if aggregate.total < INSPECT_MIN_CRIES:
             return None
 
+        file_name = f"{pet_id}_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}"
         try:
-            # 1. 주로 우는 시간대 분석
-            cry_freq_hour = df['time'].dt.hour.value_counts().sort_index()
-
-            # 2. 일별 울음 빈도 분석
-            cry_freq_date = df[['id']].groupby(
-                df['time'].dt.date).count().reset_index()
-            cry_freq_date['time'] = cry_freq_date['time'].astype(str)
-
-            # 3. 울음 원인 빈도 분석
-            type_freq = df['state'].value_counts()
-            type_freq.sort_values(ascending=True, inplace=True)
-
-            # 4. 울음 원인에 따른 울음 지속시간 분석
-            duration_of_type = df[['state', 'duration']
-                                  ].groupby('state').mean()
-            duration_of_type.sort_values(by='duration', inplace=True)
-
-            min_value = duration_of_type['duration'].min().astype(int)
-            duration_of_type['duration'] -= min_value
-            bar_percent = (duration_of_type['duration'] /
-                           duration_of_type['duration'].max()).round(3)
-
-            inspect_result = {
-                'logId': file_name,
-                'cry_freq_hour': cry_freq_hour.tolist(),
-                'cry_freq_date': {
-                    'date': cry_freq_date['time'].tolist(),
-                    'freqs': cry_freq_date['id'].tolist()
-                },
-                'type_freq': type_freq.to_dict(),
-                'duration_of_type': {
-                    'type': duration_of_type.index.tolist(),
-                    'duration': duration_of_type['duration'].round(3).tolist(),
-                    'bar_percent': bar_percent.tolist()
-                }
-            }
-
-            # 결과를 파일로 저장
-            with open(file_path, 'w') as f:
-                f.write(json.dumps(inspect_result, indent=4, ensure_ascii=False))
-
-            return inspect_result
-
+            inspect_result = aggregate.to_inspect_result(file_name)
         except Exception as e:
             raise Exception(f"Failed to inspect cry: {e}")
 
+        inspect_cache.set(make_inspect_cache_key(
+            pet_id, version, start_date, end_date, granularity), inspect_result)
+        return inspect_result
+
+    def _analyze_audio(self, file_path: str) -> Optional[dict]:
+        """울음 파일의 실제 길이와 강도를 계산한다. 디코딩할 수 없는 파일이면 기본값을 사용하도록 None을 반환한다."""
+        try:
+            analysis = analyze_wav(file_path)
+        except Exception as e:
+            logger.warning(f"Failed to analyze audio {file_path}: {e}")
+            return None
+        if analysis.duration <= 0:
+            return None
+        return {'duration': analysis.duration, 'intensity': analysis.intensity}
+
     async def predict_cry(self, db: Session, file: UploadFile, pet_id: int, user_id: str) -> Cry:
         # 유저의 반려동물인지 확인
         pet = self._get_user_pet(db, pet_id, user_id)
@@ -212,30 +513,279 @@ class CryService:
             raise UnauthorizedError(
                 "You are not authorized to view cries for this pet")
 
-        # 반려동물 울음 분석
-        content = await file.read()
-        predictMap = await cry_predict(content, pet.species, user_id)
-
-        # wav 파일 저장
-        curtime = datetime.now()
-        timestamp = curtime.strftime("%Y%m%d-%H%M%S")
-        file_id = f'{pet_id}_{timestamp}'
-        file_path = os.path.join(CRY_DATASET_DIR, f"{file_id}.wav")
-        with open(file_path, 'wb') as f:
-            f.write(content)
+        # 업로드 파일을 청크 단위로 임시 파일에 저장 (메모리에 전체를 올리지 않음)
+        tmp_path, digest, _ = await save_upload_to_temp(
+            file, CRY_DATASET_DIR, UPLOAD_CHUNK_SIZE)
+        try:
+            return await self.predict_file(db, pet, tmp_path, digest, user_id)
+        finally:
+            remove_file(tmp_path)
+
+    async def predict_file(self, db: Session, pet: PetOwner, file_path: str, digest: str, user_id: str,
+                           curtime: Optional[datetime] = None) -> Cry:
+        """
+        저장된 울음 파일을 분석해 울음 기록을 생성한다.
+        울음 기록이 저장되면 파일은 dataset에도 남으며, 원래 파일은 성공 여부와 관계없이 호출자가 정리한다.
+        """
+        create_cry_input, cache_entry = await self._predict_input(
+            pet, file_path, digest, user_id, curtime)
+        return await self._save_prediction(
+            file_path, create_cry_input, cache_entry,
+            lambda: self.create_cry(db, create_cry_input, user_id))
+
+    async def _predict_input(self, pet: PetOwner, file_path: str, digest: str, user_id: str,
+                             curtime: Optional[datetime] = None) -> Tuple[CreateCryInput, Optional[Tuple[str, dict]]]:
+        """
+        울음 파일을 분석해 저장할 울음 기록을 만든다 (DB 작업, 파일 이동 없음).
+        새로 분석한 경우 _save_prediction이 저장 후 채울 예측 캐시 항목 (key, value)도 함께 반환한다.
+        """
+        curtime = curtime or datetime.now()
+
+        # 반려동물 울음 분석: 같은 파일이 재전송된 경우 캐시된 결과를 사용
+        cache_key = make_predict_cache_key(digest, pet.species)
+        cached = await run_in_threadpool(predict_cache.get, cache_key)
+
+        cache_entry = None
+        if cached is not None:
+            predictMap = dict(cached['predictMap'])
+            file_id = cached['audioId']
+            analysis = cached.get('analysis')
+        else:
+            # AI 서버 분석과 서버 측 오디오 분석(길이, 강도)을 동시에 수행
+            predictMap, analysis = await asyncio.gather(
+                cry_predict_batcher(file_path, pet.species, user_id),
+                run_in_threadpool(self._analyze_audio, file_path))
+
+            file_id = make_audio_id(pet.id, curtime)
+            cache_entry = (cache_key, {
+                'predictMap': predictMap, 'audioId': file_id, 'analysis': analysis})
 
-        # 분석 결과 DB에 저장
         create_cry_input = CreateCryInput(
-            pet_id=pet_id,
+            pet_id=pet.id,
             time=curtime,
             state=max(predictMap, key=predictMap.get),
             audioId=file_id,
             predictMap=predictMap,
+            **(analysis or {}),
         )
         print("create cry: ", create_cry_input)
-        cry = await self.create_cry(db, create_cry_input, user_id)
 
-        return cry
+        return create_cry_input, cache_entry
+
+    async def _save_prediction(self, file_path: str, create_cry_input: CreateCryInput,
+                               cache_entry: Optional[Tuple[str, dict]],
+                               save: Callable[[], Awaitable[T]]) -> T:
+        """
+        _predict_input의 결과를 save로 저장한다.
+        새로 분석한 wav는 저장 전에 dataset에 링크하고 저장이 실패하면 지우므로, 커밋된 울음의 audioId는 항상 dataset에 있고
+        커밋되지 않은 울음의 wav는 남지 않는다. 예측 캐시도 저장이 끝난 뒤에 채운다.
+        """
+        if cache_entry is None:
+            return await save()
+
+        dataset_path = os.path.join(
+            CRY_DATASET_DIR, f"{create_cry_input.audioId}.wav")
+        link_file(file_path, dataset_path)
+        try:
+            result = await save()
+        except BaseException:
+            remove_file(dataset_path)
+            raise
+        await run_in_threadpool(predict_cache.set, *cache_entry)
+        return result
+
+    def _split_segments(self, file_path: str, dir_path: str, file_id: str):
+        """긴 녹음을 울음 구간별 wav 파일로 나누고 (파일 경로, 시작 시각(초), 분석 결과) 목록을 반환한다."""
+        samples, sample_rate = decode_wav(file_path)
+        segments = detect_segments(
+            samples, sample_rate, SEGMENT_MIN_DURATION, SEGMENT_MIN_GAP, SEGMENT_MAX_DURATION)
+
+        results = []
+        for idx, (start, end) in enumerate(segments):
+            segment = samples[start:end]
+            segment_path = os.path.join(dir_path, f".{file_id}_{idx}.part")
+            write_wav(segment_path, segment, sample_rate)
+            results.append((segment_path, start / sample_rate,
+                            analyze_samples(segment, sample_rate)))
+        return results
+
+    async def predict_long_cry(self, db: Session, file: UploadFile, pet_id: int, user_id: str,
+                               recorded_at: Optional[datetime] = None) -> List[Cry]:
+        # 유저의 반려동물인지 확인
+        pet = self._get_user_pet(db, pet_id, user_id)
+        if not pet:
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+
+        async def save(create_cry_inputs: List[CreateCryInput]) -> List[Cry]:
+            return self._insert_cries(db, pet, create_cry_inputs)
+
+        return await self._predict_long_inputs(pet, file, user_id, save, recorded_at)
+
+    async def _save_segments(self, segment_paths: List[str], create_cry_inputs: List[CreateCryInput],
+                             save: Callable[[List[CreateCryInput]], Awaitable[T]]) -> T:
+        """
+        구간별 울음 기록들을 save로 저장한다. _save_prediction과 같이 구간 wav를 저장 전에 dataset에 링크하고
+        저장이 실패하면 지우므로, 커밋되지 않은 울음의 wav는 dataset에 남지 않는다.
+        """
+        dataset_paths = []
+        try:
+            for segment_path, create_cry_input in zip(segment_paths, create_cry_inputs):
+                dataset_path = os.path.join(
+                    CRY_DATASET_DIR, f"{create_cry_input.audioId}.wav")
+                link_file(segment_path, dataset_path)
+                dataset_paths.append(dataset_path)
+            return await save(create_cry_inputs)
+        except BaseException:
+            for dataset_path in dataset_paths:
+                remove_file(dataset_path)
+            raise
+
+    async def _predict_long_inputs(self, pet: PetOwner, file: UploadFile, user_id: str,
+                                   save: Callable[[List[CreateCryInput]], Awaitable[List[Cry]]],
+                                   recorded_at: Optional[datetime] = None) -> List[Cry]:
+        """
+        긴 녹음을 울음 구간별로 나누어 분석하고, 만든 울음 기록들을 save로 저장한다 (이 메서드는 DB 작업 없음).
+        울음 구간이 없으면 저장하지 않고 빈 목록을 반환한다.
+        """
+        pet_id = pet.id
+        tmp_path, _, _ = await save_upload_to_temp(
+            file, CRY_DATASET_DIR, UPLOAD_CHUNK_SIZE)
+        curtime = datetime.now()
+        file_id = make_audio_id(pet_id, curtime)
+
+        segments = []
+        try:
+            # 울음 구간 검출 후 구간별 wav 생성
+            try:
+                segments = await run_in_threadpool(
+                    self._split_segments, tmp_path, CRY_DATASET_DIR, file_id)
+            except Exception as e:
+                raise WavFileNotFoundError(f"Failed to decode wav file: {e}")
+            if not segments:
+                return []
+
+            # 모든 구간을 한 번의 batch 요청으로 분석
+            segment_paths = [segment_path for segment_path, _, _ in segments]
+            predictMaps = await cry_predict.predict_batch(
+                segment_paths, pet.species, [user_id] * len(segments))
+            if predictMaps is None:
+                # AI 서버에 batch endpoint가 없으면 구간별로 요청
+                predictMaps = await asyncio.gather(
+                    *(cry_predict(segment_path, pet.species, user_id) for segment_path in segment_paths))
+
+            # 녹음 시작 시각 기준으로 각 울음의 발생 시각 계산
+            total_duration = max(
+                offset + analysis.duration for _, offset, analysis in segments)
+            start_time = recorded_at or curtime - timedelta(seconds=total_duration)
+
+            create_cry_inputs = []
+            for idx, ((segment_path, offset, analysis), predictMap) in enumerate(zip(segments, predictMaps)):
+                segment_id = f'{file_id}_{idx}'
+                create_cry_inputs.append(CreateCryInput(
+                    pet_id=pet_id,
+                    time=start_time + timedelta(seconds=offset),
+                    state=max(predictMap, key=predictMap.get),
+                    audioId=segment_id,
+                    predictMap=predictMap,
+                    intensity=analysis.intensity,
+                    duration=analysis.duration,
+                ))
+            return await self._save_segments(segment_paths, create_cry_inputs, save)
+        finally:
+            remove_file(tmp_path)
+            for segment_path, _, _ in segments:
+                remove_file(segment_path)
 
 
 cry_service = CryService()
+
+
+class AsyncCryService:
+    """
+    CryService의 async 버전. DB 작업은 run_db로 실행되어 이벤트 루프를 막지 않으며,
+    AI 서버 요청과 오디오 분석은 DB 세션을 잡지 않은 채로 기다린다.
+    """
+
+    async def create_cry(self, db: DBSession, create_cry_input: CreateCryInput, user_id: str) -> Cry:
+        return await run_db_write(db, cry_service._create_cry, create_cry_input, user_id)
+
+    async def bulk_create_cries(self, db: DBSession, create_cry_inputs: List[CreateCryInput], user_id: str,
+                                idempotency_key: Optional[str] = None) -> Tuple[List[BulkCryItemResult], bool]:
+        return await run_db_write(db, cry_service.bulk_create_cries, create_cry_inputs, user_id, idempotency_key)
+
+    async def get_cry_by_id(self, db: DBSession, cry_id: int, user_id: str) -> Cry:
+        return await run_db(db, cry_service.get_cry_by_id, cry_id, user_id)
+
+    async def get_all_cries_by_pet(self, db: DBSession, pet_id: int, user_id: str, cursor: Optional[str] = None,
+                                   limit: Optional[int] = None,
+                                   fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
+        return await run_db(db, cry_service.get_all_cries_by_pet, pet_id, user_id, cursor, limit, fields)
+
+    async def update_cry(self, db: DBSession, cry_id: int, update_cry_input: UpdateCryInput, user_id: str) -> Cry:
+        return await run_db_write(db, cry_service.update_cry, cry_id, update_cry_input, user_id)
+
+    async def delete_cry(self, db: DBSession, cry_id: int, user_id: str) -> None:
+        return await run_db_write(db, cry_service.delete_cry, cry_id, user_id)
+
+    async def get_pets_with_state(self, db: DBSession, pet_id: int, query_state: str, user_id: str,
+                                  cursor: Optional[str] = None, limit: Optional[int] = None,
+                                  fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
+        return await run_db(db, cry_service.get_pets_with_state, pet_id, query_state, user_id, cursor, limit,
+                            fields)
+
+    async def get_pets_between_time(self, db: DBSession, pet_id: int, start_time: datetime, end_time: datetime,
+                                    user_id: str, cursor: Optional[str] = None, limit: Optional[int] = None,
+                                    fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Cry], Optional[str]]:
+        return await run_db(db, cry_service.get_pets_between_time, pet_id, start_time, end_time, user_id,
+                            cursor, limit, fields)
+
+    async def get_cry_changes(self, db: DBSession, pet_id: int, user_id: str, cursor: Optional[str] = None,
+                              limit: Optional[int] = None, fields: Optional[Tuple[str, ...]] = None
+                              ) -> Tuple[List[Cry], List[int], str, bool]:
+        return await run_db(db, cry_service.get_cry_changes, pet_id, user_id, cursor, limit, fields)
+
+    async def get_data_version(self, db: DBSession, pet_id: int, user_id: str) -> Optional[int]:
+        return await run_db(db, cry_service.get_data_version, pet_id, user_id)
+
+    async def inspect_cry(self, db: DBSession, pet_id: int, user_id: str, window_days: int = 30,
+                          granularity: str = InspectGranularityEnum.DAILY.value):
+        return await run_db(db, cry_service.inspect_cry, pet_id, user_id, window_days, granularity)
+
+    async def get_live_stats(self, db: DBSession, pet_id: int, user_id: str) -> dict:
+        return await run_db(db, cry_service.get_live_stats, pet_id, user_id)
+
+    async def _get_user_pet(self, db: DBSession, pet_id: int, user_id: str) -> PetOwner:
+        pet = await run_db(db, cry_service._get_user_pet, pet_id, user_id)
+        if not pet:
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+        return pet
+
+    async def predict_cry(self, db: DBSession, file: UploadFile, pet_id: int, user_id: str) -> Cry:
+        pet = await self._get_user_pet(db, pet_id, user_id)
+        await release_connection(db)
+
+        tmp_path, digest, _ = await save_upload_to_temp(
+            file, CRY_DATASET_DIR, UPLOAD_CHUNK_SIZE)
+        try:
+            create_cry_input, cache_entry = await cry_service._predict_input(
+                pet, tmp_path, digest, user_id)
+            return await cry_service._save_prediction(
+                tmp_path, create_cry_input, cache_entry,
+                lambda: self.create_cry(db, create_cry_input, user_id))
+        finally:
+            remove_file(tmp_path)
+
+    async def predict_long_cry(self, db: DBSession, file: UploadFile, pet_id: int, user_id: str,
+                               recorded_at: Optional[datetime] = None) -> List[Cry]:
+        pet = await self._get_user_pet(db, pet_id, user_id)
+        await release_connection(db)
+
+        return await cry_service._predict_long_inputs(
+            pet, file, user_id,
+            lambda create_cry_inputs: run_db_write(db, cry_service._insert_cries, pet, create_cry_inputs),
+            recorded_at)
+
+
+async_cry_service = AsyncCryService()
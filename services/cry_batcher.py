@@ -0,0 +1,106 @@
+# services/cry_batcher.py
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from core.env import env
+from log import logger
+from services.cry_predict import CryPredictService, cry_predict
+
+
+class CryPredictBatcher:
+    """
+    cry_predict 앞단의 micro-batching 단계.
+    종(species)별로 batch_window_ms 동안 또는 max_batch_size 개가 모일 때까지 울음 파일을 모아
+    AI 서버에 한 번의 batch 요청으로 보내고, 각 호출자에게 자신의 predictMap을 돌려준다.
+    AI 서버가 batch endpoint를 제공하지 않으면 그 batch를 파일별 요청으로 보내고, 이후로는 batching을 하지 않는다.
+    """
+
+    def __init__(self, predictor: CryPredictService):
+        self.predictor = predictor
+        self.enabled = env.get_bool("CRY_PREDICT_BATCH_ENABLED", True)
+        self.batch_window = env.get_float(
+            "CRY_PREDICT_BATCH_WINDOW_MS", 10.0) / 1000
+        self.max_batch_size = env.get_int("CRY_PREDICT_BATCH_MAX_SIZE", 16)
+        # AI 서버가 batch endpoint에 404/405로 응답하면 False
+        self.batch_supported = True
+
+        self._pending: Dict[str, List[Tuple[str, str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._inflight: set = set()
+
+    async def __call__(self, file_path: str, species: str, user_id: str) -> Dict[str, float]:
+        if not self.enabled or not self.batch_supported or self.max_batch_size <= 1:
+            return await self.predictor(file_path, species, user_id)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(species, [])
+        batch.append((file_path, user_id, future))
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(species)
+        elif species not in self._timers:
+            self._timers[species] = loop.call_later(
+                self.batch_window, self._flush, species)
+
+        return await future
+
+    def _flush(self, species: str) -> None:
+        timer = self._timers.pop(species, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(species, None)
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(
+            self._dispatch(species, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, species: str, batch: List[Tuple[str, str, asyncio.Future]]) -> None:
+        # 대기 중에 취소된 호출자는 제외
+        batch = [item for item in batch if not item[2].done()]
+        if not batch:
+            return
+
+        try:
+            results = None
+            if len(batch) > 1 and self.batch_supported:
+                results = await self.predictor.predict_batch(
+                    [file_path for file_path, _, _ in batch], species,
+                    [user_id for _, user_id, _ in batch])
+                if results is None:
+                    logger.warning(
+                        "AI server has no batch endpoint, falling back to per-clip requests")
+                    self.batch_supported = False
+            if results is None:
+                # 파일별 요청: 한 파일의 실패는 그 호출자에게만 전달한다
+                results = await asyncio.gather(
+                    *(self.predictor(file_path, species, user_id) for file_path, user_id, _ in batch),
+                    return_exceptions=True)
+        except Exception as e:
+            logger.error(
+                f"Batch prediction failed ({species}, {len(batch)} clips): {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def shutdown(self) -> None:
+        """대기 중인 batch를 모두 보내고 완료될 때까지 기다린다."""
+        for species in list(self._pending):
+            self._flush(species)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+
+cry_predict_batcher = CryPredictBatcher(cry_predict)
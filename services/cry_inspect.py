@@ -0,0 +1,266 @@
+# services/cry_inspect.py
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from model.cry import CryTable
+from model.cry_rollup import CryHourlyRollupTable, CryDailyRollupTable
+from enums.inspect import InspectGranularityEnum
+from services.cry_rollup import cry_rollup_service
+from utils.sql import sql_date, sql_hour
+
+
+def _nargsort(values: List[int], ascending: bool) -> List[int]:
+    """pandas Series.sort_values(kind='quicksort')의 정렬 순서 (numpy quicksort는 안정 정렬이 아니다)"""
+    indexes = np.arange(len(values))
+    array = np.asarray(values)
+    if not ascending:
+        array, indexes = array[::-1], indexes[::-1]
+    ordered = indexes[array.argsort(kind='quicksort')]
+    return (ordered if ascending else ordered[::-1]).tolist()
+
+
+def sort_type_freq(states: List[str], counts: List[int]) -> Dict[str, int]:
+    """
+    기존 pandas 구현(value_counts() 후 sort_values())과 같은 순서의 울음 원인별 횟수.
+    states는 기간에서 처음 나온 순서여야 한다 (value_counts의 초기 순서). 횟수가 같은 원인의 순서도 그대로 재현한다.
+    """
+    order = _nargsort(counts, ascending=False)
+    states, counts = [states[i] for i in order], [counts[i] for i in order]
+    order = _nargsort(counts, ascending=True)
+    return {states[i]: counts[i] for i in order}
+
+
+class CryAggregate:
+    """
+    울음 횟수와 지속시간 합계를 bucket 단위로 합쳐 분석 결과를 만든다.
+    granularity에 따라 일별 빈도 bucket이 시간/일/주(월요일 시작) 단위가 된다.
+    """
+
+    def __init__(self, granularity: str = InspectGranularityEnum.DAILY.value):
+        self.granularity = granularity
+        self.hour_counts: Dict[int, int] = {}
+        self.bucket_counts: Dict[str, int] = {}
+        self.state_counts: Dict[str, int] = {}
+        self.state_durations: Dict[str, float] = {}
+        # 울음 원인별 기간 내 첫 울음의 (time, id). 횟수가 같은 원인이 있을 때만 채운다 (CryInspectEngine.load_first_seen)
+        self.first_seen: Dict[str, Tuple[datetime, int]] = {}
+
+    def _bucket(self, day, hour: Optional[int]) -> str:
+        if self.granularity == InspectGranularityEnum.HOURLY.value:
+            return f"{day} {hour:02d}:00"
+        if self.granularity == InspectGranularityEnum.WEEKLY.value:
+            day = day if isinstance(day, date) else date.fromisoformat(day)
+            return str(day - timedelta(days=day.weekday()))
+        return str(day)
+
+    def add(self, day, hour: int, state: str, count: int, duration_sum: float) -> None:
+        """시간 단위 bucket 하나를 더한다."""
+        self.add_hour_of_day(hour, count)
+        self._add_bucket(self._bucket(day, hour), state, count, duration_sum)
+
+    def add_day(self, day, state: str, count: int, duration_sum: float) -> None:
+        """일 단위 bucket 하나를 더한다. 시간대 분포는 add_hour_of_day로 따로 더해야 한다."""
+        self._add_bucket(self._bucket(day, None), state, count, duration_sum)
+
+    def add_hour_of_day(self, hour: int, count: int) -> None:
+        self.hour_counts[hour] = self.hour_counts.get(hour, 0) + count
+
+    def _add_bucket(self, bucket: str, state: str, count: int, duration_sum: float) -> None:
+        self.bucket_counts[bucket] = self.bucket_counts.get(bucket, 0) + count
+        self.state_counts[state] = self.state_counts.get(state, 0) + count
+        self.state_durations[state] = self.state_durations.get(
+            state, 0.0) + duration_sum
+
+    @property
+    def total(self) -> int:
+        return sum(self.state_counts.values())
+
+    def has_tied_states(self) -> bool:
+        return len(set(self.state_counts.values())) < len(self.state_counts)
+
+    def to_inspect_result(self, log_id: str) -> dict:
+        # 1. 주로 우는 시간대 분석
+        cry_freq_hour = [self.hour_counts[hour]
+                         for hour in sorted(self.hour_counts)]
+
+        # 2. 일별(시간별/주별) 울음 빈도 분석
+        buckets = sorted(self.bucket_counts)
+
+        # 3. 울음 원인 빈도 분석
+        # 기존 구현은 시간순으로 읽은 울음에서 처음 나온 순서로 원인을 세었다 (first_seen이 없으면 이름순)
+        states = sorted(self.state_counts,
+                        key=lambda state: (self.first_seen.get(state, (datetime.max, 0)), state))
+        type_freq = sort_type_freq(
+            states, [self.state_counts[state] for state in states])
+
+        # 4. 울음 원인에 따른 울음 지속시간 분석
+        # 합계를 더한 순서에 따른 부동소수점 오차가 반올림 결과를 바꾸지 않도록 먼저 정리
+        mean_durations = sorted(
+            ((state, round(self.state_durations[state] / self.state_counts[state], 9))
+             for state in sorted(self.state_counts)), key=lambda item: item[1])
+        min_value = int(mean_durations[0][1])
+        shifted = [(state, duration - min_value)
+                   for state, duration in mean_durations]
+        max_value = shifted[-1][1]
+
+        return {
+            'logId': log_id,
+            'cry_freq_hour': cry_freq_hour,
+            'cry_freq_date': {
+                'date': buckets,
+                'freqs': [self.bucket_counts[bucket] for bucket in buckets]
+            },
+            'type_freq': type_freq,
+            'duration_of_type': {
+                'type': [state for state, _ in shifted],
+                'duration': [round(duration, 3) for _, duration in shifted],
+                'bar_percent': [round(duration / max_value, 3) if max_value else 0.0
+                                for _, duration in shifted]
+            }
+        }
+
+
+def floor_hour(time: datetime) -> datetime:
+    return time.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(time: datetime) -> datetime:
+    floored = floor_hour(time)
+    return floored if floored == time else floored + timedelta(hours=1)
+
+
+def floor_day(time: datetime) -> datetime:
+    return time.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_day(time: datetime) -> datetime:
+    floored = floor_day(time)
+    return floored if floored == time else floored + timedelta(days=1)
+
+
+class CryInspectEngine:
+    """
+    inspect 분석을 DB에서 GROUP BY로 집계한다 (SQLite, MySQL 공용).
+    기간을 작은 bucket부터 큰 bucket 순으로 나누어, 각 부분을 이미 계산된 가장 큰 bucket에서 읽는다.
+    - 기간 양 끝의 부분 시간: cry 테이블에서 필요한 컬럼(time, state, duration)만 집계
+    - 양 끝의 부분 날짜에 속한 온전한 시간: cry_rollup_hourly
+    - 온전한 날짜: cry_rollup_daily (시간대 분포만 cry_rollup_hourly에서 시간별로 합쳐 읽음)
+    따라서 읽는 행 수는 원본 울음 수가 아니라 기간의 날짜 수에 비례한다.
+    """
+
+    def aggregate_raw(self, db: Session, pet_id: int, start: datetime, end: datetime,
+                      aggregate: CryAggregate, include_end: bool = True) -> CryAggregate:
+        dialect_name = db.get_bind().dialect.name
+        cry_date = sql_date(CryTable.time, dialect_name)
+        cry_hour = sql_hour(CryTable.time, dialect_name)
+
+        rows = db.execute(
+            select(cry_date, cry_hour, CryTable.state,
+                   func.count(), func.coalesce(func.sum(CryTable.duration), 0.0))
+            .where(CryTable.pet_id == pet_id,
+                   CryTable.time >= start,
+                   CryTable.time <= end if include_end else CryTable.time < end)
+            .group_by(cry_date, cry_hour, CryTable.state)
+        ).all()
+        for row in rows:
+            aggregate.add(*row)
+        return aggregate
+
+    def aggregate_hourly(self, db: Session, pet_id: int, start_hour: datetime, end_hour: datetime,
+                         aggregate: CryAggregate) -> CryAggregate:
+        """[start_hour, end_hour) 범위의 온전한 시간 bucket 집계."""
+        if start_hour >= end_hour:
+            return aggregate
+        table = CryHourlyRollupTable.__table__
+        rows = db.execute(
+            select(table.c.date, table.c.hour, table.c.state,
+                   table.c.count, table.c.duration_sum)
+            .where(table.c.pet_id == pet_id,
+                   cry_rollup_service.hour_range_filter(start_hour, end_hour))
+        ).all()
+        for row in rows:
+            aggregate.add(*row)
+        return aggregate
+
+    def aggregate_daily(self, db: Session, pet_id: int, start_day: datetime, end_day: datetime,
+                        aggregate: CryAggregate) -> CryAggregate:
+        """[start_day, end_day) 범위의 온전한 날짜 bucket 집계."""
+        if start_day >= end_day:
+            return aggregate
+        daily = CryDailyRollupTable.__table__
+        rows = db.execute(
+            select(daily.c.date, daily.c.state, daily.c.count, daily.c.duration_sum)
+            .where(daily.c.pet_id == pet_id,
+                   daily.c.date >= start_day.date(),
+                   daily.c.date < end_day.date())
+        ).all()
+        for row in rows:
+            aggregate.add_day(*row)
+
+        # 시간대 분포는 DB에서 시간별로 합쳐 최대 24행만 가져온다
+        hourly = CryHourlyRollupTable.__table__
+        rows = db.execute(
+            select(hourly.c.hour, func.sum(hourly.c.count))
+            .where(hourly.c.pet_id == pet_id,
+                   hourly.c.date >= start_day.date(),
+                   hourly.c.date < end_day.date())
+            .group_by(hourly.c.hour)
+        ).all()
+        for row in rows:
+            aggregate.add_hour_of_day(*row)
+        return aggregate
+
+    def load_first_seen(self, db: Session, pet_id: int, start: datetime, end: datetime,
+                        aggregate: CryAggregate) -> CryAggregate:
+        """
+        횟수가 같은 울음 원인이 있으면 원인별로 [start, end]의 첫 울음을 읽는다 (type_freq 순서에 사용).
+        원인마다 ix_cry_pet_id_state_time 인덱스에서 한 행만 읽는다.
+        """
+        if not aggregate.has_tied_states():
+            return aggregate
+        for state in aggregate.state_counts:
+            row = db.execute(
+                select(CryTable.time, CryTable.id)
+                .where(CryTable.pet_id == pet_id,
+                       CryTable.state == state,
+                       CryTable.time >= start,
+                       CryTable.time <= end)
+                .order_by(CryTable.time, CryTable.id)
+                .limit(1)
+            ).first()
+            if row is not None:
+                aggregate.first_seen[state] = tuple(row)
+        return aggregate
+
+    def aggregate(self, db: Session, pet_id: int, start: datetime, end: datetime,
+                  granularity: str = InspectGranularityEnum.DAILY.value) -> CryAggregate:
+        """[start, end] 구간의 울음 집계. 결과는 cry 테이블을 직접 집계한 것과 같다."""
+        aggregate = self._aggregate(db, pet_id, start, end, granularity)
+        return self.load_first_seen(db, pet_id, start, end, aggregate)
+
+    def _aggregate(self, db: Session, pet_id: int, start: datetime, end: datetime,
+                   granularity: str) -> CryAggregate:
+        aggregate = CryAggregate(granularity)
+        first_hour, last_hour = ceil_hour(start), floor_hour(end)
+        if first_hour >= last_hour:
+            return self.aggregate_raw(db, pet_id, start, end, aggregate)
+
+        self.aggregate_raw(db, pet_id, start, first_hour,
+                           aggregate, include_end=False)
+        self.aggregate_raw(db, pet_id, last_hour, end, aggregate)
+
+        # 시간 단위 결과는 어차피 시간 bucket이 모두 필요하므로 시간 단위 집계만 읽는다
+        first_day, last_day = ceil_day(first_hour), floor_day(last_hour)
+        if granularity == InspectGranularityEnum.HOURLY.value or first_day >= last_day:
+            return self.aggregate_hourly(db, pet_id, first_hour, last_hour, aggregate)
+
+        self.aggregate_hourly(db, pet_id, first_hour, first_day, aggregate)
+        self.aggregate_daily(db, pet_id, first_day, last_day, aggregate)
+        self.aggregate_hourly(db, pet_id, last_day, last_hour, aggregate)
+        return aggregate
+
+
+cry_inspect_engine = CryInspectEngine()
@@ -0,0 +1,21 @@
+# services/cry_inspect_cache.py
+from datetime import datetime
+
+from core.env import env
+from constants.path import CRY_INSPECT_LOG_DIR
+from utils.cache import LRUCache, DiskCache, TwoTierCache
+
+_ttl = env.get_float("CRY_INSPECT_CACHE_TTL", 24 * 60 * 60)
+
+# 반려동물의 울음 분석 결과 캐시. key에 울음 데이터 버전이 들어가므로 울음이 바뀌면 이전 결과는 더 이상 조회되지 않는다
+inspect_cache = TwoTierCache(
+    LRUCache(max_size=env.get_int("CRY_INSPECT_CACHE_SIZE", 512), ttl=_ttl),
+    DiskCache(CRY_INSPECT_LOG_DIR, ttl=_ttl,
+              max_bytes=env.get_int("CRY_INSPECT_CACHE_DISK_MAX_MB", 100) * 1024 * 1024)
+    if env.get_bool("CRY_INSPECT_CACHE_DISK", True) else None,
+)
+
+
+def make_inspect_cache_key(pet_id: int, version: int, start: datetime, end: datetime,
+                           granularity: str) -> str:
+    return f"{pet_id}_v{version}_{start.strftime('%Y-%m-%d')}_{end.strftime('%Y-%m-%d')}_{granularity}"
@@ -0,0 +1,189 @@
+# services/cry_inspect_precompute.py
+import sys
+import json
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+
+from model.pet import PetTable
+from enums.inspect import allowed_inspect_window_days, allowed_inspect_granularity
+from constants.path import CRY_INSPECT_PRECOMPUTE_CHECKPOINT
+from utils.os_utils import atomic_write_text
+from services.cry_inspect_cache import inspect_cache
+from core.env import env
+from log import logger
+
+# worker 프로세스 전역 상태 (_init_worker에서 설정)
+_db_semaphore = None
+_session_factory = None
+
+
+def _init_worker(db_semaphore) -> None:
+    global _db_semaphore, _session_factory
+    from db import engine, SessionLocal
+
+    # fork로 물려받은 부모 프로세스의 DB 연결은 쓰지 않는다
+    engine.dispose(close=False)
+    _db_semaphore = db_semaphore
+    _session_factory = SessionLocal
+
+
+def _precompute_pets(pet_ids: List[int], end_date: datetime,
+                     windows: Tuple[int, ...], granularities: Tuple[str, ...]) -> Tuple[int, int]:
+    """pet_ids의 분석 결과를 모든 (기간, bucket 단위)에 대해 계산해 inspect 캐시에 저장한다. (반려동물 수, 저장한 결과 수)"""
+    from services.cry import cry_service
+    from services.cry_inspect import cry_inspect_engine
+    from services.cry_version import cry_version_service
+
+    stored = 0
+    with _session_factory() as db:
+        for pet_id in pet_ids:
+            # DB 읽기만 동시 실행 수를 제한하고, 결과 생성/저장은 병렬로 처리
+            with _db_semaphore:
+                version = cry_version_service.get(db, pet_id)
+                aggregates = []
+                for window_days in windows:
+                    start_date, _ = cry_service.inspect_period(window_days, end_date)
+                    for granularity in granularities:
+                        aggregates.append((start_date, granularity, cry_inspect_engine.aggregate(
+                            db, pet_id, start_date, end_date, granularity)))
+                db.rollback()
+
+            for start_date, granularity, aggregate in aggregates:
+                if cry_service.store_inspect_result(
+                        pet_id, version, start_date, end_date, granularity, aggregate) is not None:
+                    stored += 1
+    return len(pet_ids), stored
+
+
+class CryInspectPrecomputeJob:
+    """
+    모든 반려동물의 inspect 결과를 미리 계산해 inspect 캐시(디스크)에 저장하는 야간 작업.
+    요청 처리 시에는 캐시만 읽게 되어 아침에 요청이 몰려도 집계를 다시 하지 않는다.
+    반려동물 id 순서로 batch를 나누어 process pool에서 처리하며,
+    끝난 구간까지를 checkpoint 파일에 기록해 중단된 작업을 이어서 실행할 수 있다.
+    """
+
+    def __init__(self):
+        self.workers = env.get_int("CRY_INSPECT_PRECOMPUTE_WORKERS", multiprocessing.cpu_count())
+        self.db_concurrency = env.get_int("CRY_INSPECT_PRECOMPUTE_DB_CONCURRENCY", 2)
+        self.batch_size = env.get_int("CRY_INSPECT_PRECOMPUTE_BATCH_SIZE", 50)
+        self.windows = tuple(int(window) for window in env.get_list(
+            "CRY_INSPECT_PRECOMPUTE_WINDOWS")) or allowed_inspect_window_days
+        self.granularities = tuple(env.get_list(
+            "CRY_INSPECT_PRECOMPUTE_GRANULARITIES")) or allowed_inspect_granularity
+        self.checkpoint_path = CRY_INSPECT_PRECOMPUTE_CHECKPOINT
+
+    # ---------- checkpoint ----------
+    def _load_checkpoint(self, run_date: str) -> Optional[int]:
+        """같은 날짜의 실행 기록이 있으면 마지막으로 끝난 반려동물 id를 반환한다."""
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                checkpoint = json.loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if checkpoint.get('run_date') != run_date:
+            return None
+        return checkpoint.get('last_pet_id')
+
+    def _save_checkpoint(self, run_date: str, last_pet_id: int, done: int, finished: bool = False) -> None:
+        atomic_write_text(self.checkpoint_path, json.dumps({
+            'run_date': run_date,
+            'last_pet_id': last_pet_id,
+            'done': done,
+            'finished': finished,
+            'updated_at': datetime.now().isoformat(),
+        }))
+
+    def _pet_ids(self, after_pet_id: Optional[int]) -> List[int]:
+        from db import SessionLocal
+
+        with SessionLocal() as db:
+            query = select(PetTable.id).order_by(PetTable.id)
+            if after_pet_id is not None:
+                query = query.where(PetTable.id > after_pet_id)
+            return list(db.execute(query).scalars())
+
+    # ---------- 실행 ----------
+    def run(self, resume: bool = True) -> dict:
+        if inspect_cache.disk is None:
+            logger.warning(
+                "Inspect cache disk tier is disabled (CRY_INSPECT_CACHE_DISK); precomputed results will not be shared with the API processes")
+
+        # 캐시 key의 분석 기간은 날짜 단위이므로, 오늘 날짜 기준으로 계산한 결과를 오늘 요청이 그대로 읽는다
+        end_date = datetime.now()
+        run_date = end_date.strftime('%Y-%m-%d')
+        last_pet_id = self._load_checkpoint(run_date) if resume else None
+        if last_pet_id is not None:
+            logger.info(f"Resuming inspect precompute after pet {last_pet_id}")
+
+        pet_ids = self._pet_ids(last_pet_id)
+        batches = [pet_ids[i:i + self.batch_size]
+                   for i in range(0, len(pet_ids), self.batch_size)]
+        logger.info(
+            f"Inspect precompute: {len(pet_ids)} pets in {len(batches)} batches "
+            f"(workers={self.workers}, db_concurrency={self.db_concurrency})")
+
+        started = time.perf_counter()
+        done_pets, stored, failed = 0, 0, 0
+        # batch는 순서와 상관없이 끝나므로, 앞에서부터 연속으로 끝난 batch까지만 checkpoint로 기록
+        finished_batches = set()
+        next_checkpoint = 0
+
+        db_semaphore = multiprocessing.Semaphore(self.db_concurrency)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(db_semaphore,)) as executor:
+            pending = {
+                executor.submit(_precompute_pets, batch, end_date,
+                                self.windows, self.granularities): index
+                for index, batch in enumerate(batches)
+            }
+            while pending:
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    index = pending.pop(future)
+                    try:
+                        n_pets, n_stored = future.result()
+                        done_pets += n_pets
+                        stored += n_stored
+                        finished_batches.add(index)
+                    except Exception as e:
+                        failed += len(batches[index])
+                        logger.error(f"Inspect precompute batch {index} failed: {e}")
+
+                while next_checkpoint in finished_batches:
+                    next_checkpoint += 1
+                if next_checkpoint:
+                    self._save_checkpoint(
+                        run_date, batches[next_checkpoint - 1][-1], done_pets)
+
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"Inspect precompute progress: {done_pets}/{len(pet_ids)} pets "
+                    f"({done_pets / elapsed:.1f} pets/sec)")
+
+        elapsed = time.perf_counter() - started
+        if batches and next_checkpoint == len(batches):
+            self._save_checkpoint(run_date, batches[-1][-1], done_pets, finished=True)
+
+        summary = {
+            'pets': done_pets,
+            'failed_pets': failed,
+            'results': stored,
+            'seconds': round(elapsed, 3),
+            'pets_per_sec': round(done_pets / elapsed, 1) if elapsed else 0.0,
+        }
+        logger.info(f"Inspect precompute finished: {summary}")
+        return summary
+
+
+cry_inspect_precompute_job = CryInspectPrecomputeJob()
+
+
+if __name__ == '__main__':
+    # 사용법: python -m services.cry_inspect_precompute [--no-resume]
+    # 매일 밤(자정 이후) cron 등으로 실행한다
+    cry_inspect_precompute_job.run(resume='--no-resume' not in sys.argv[1:])
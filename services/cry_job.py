@@ -0,0 +1,339 @@
+# services/cry_job.py
+import os
+import uuid
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import update, or_
+from sqlalchemy.orm import Session
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from schemas.cry import CryJob, CreateCryInput
+from model.cry import CryTable
+from model.cry_job import CryJobTable
+from error.exceptions import (
+    CryJobNotFoundError, CryJobLeaseLostError, QueueFullError, UnauthorizedError,
+    WrongCryOfSpeciesError)
+from utils.converters import cry_job_table_to_schema
+from utils.os_utils import save_upload_to_temp, atomic_move, remove_file
+from utils.async_db import DBSession, run_db, run_db_write
+from constants.path import CRY_JOB_DIR
+from services.cry import cry_service, UPLOAD_CHUNK_SIZE
+from services.pet_owner_cache import PetOwner
+from core.env import env
+from log import logger
+
+FINISHED_STATUSES = ('done', 'failed')
+
+
+class CryJobService:
+    """
+    /cry/predict 비동기 모드의 작업 큐.
+    업로드 파일과 작업 정보를 DB(cry_job 테이블)에 저장한 뒤 바로 job id를 돌려주고,
+    제한된 수의 로컬 worker가 큐에서 작업을 꺼내 분석한다. 실패한 작업은 backoff 후 재시도한다.
+    작업을 가져간 프로세스는 처리하는 동안 lease를 갱신하고, lease가 만료된 running 작업만 다른 프로세스가 복구한다.
+    """
+
+    def __init__(self):
+        self.workers = env.get_int("CRY_JOB_WORKERS", 2)
+        self.max_queue = env.get_int("CRY_JOB_MAX_QUEUE", 100)
+        self.max_attempts = env.get_int("CRY_JOB_MAX_ATTEMPTS", 3)
+        self.retry_backoff = env.get_float("CRY_JOB_RETRY_BACKOFF", 5.0)
+        self.poll_interval = env.get_float("CRY_JOB_POLL_INTERVAL", 1.0)
+        self.lease_seconds = env.get_float("CRY_JOB_LEASE_SECONDS", 60.0)
+        # 이 프로세스의 worker들이 가져간 작업에 기록하는 id
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+        self._session_factory = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._finished: Dict[str, asyncio.Event] = {}
+
+    # ---------- 요청 처리 ----------
+    def _check_enqueue(self, db: Session, pet_id: int, user_id: str) -> None:
+        pet = cry_service._get_user_pet(db, pet_id, user_id)
+        if not pet:
+            raise UnauthorizedError(
+                "You are not authorized to view cries for this pet")
+
+        pending = db.query(CryJobTable).filter(
+            CryJobTable.status.in_(('queued', 'running'))).count()
+        if pending >= self.max_queue:
+            raise QueueFullError("Cry prediction queue is full. Try again later")
+
+    def _insert_job(self, db: Session, job_id: str, pet_id: int, user_id: str,
+                    audio_path: str, digest: str) -> CryJob:
+        job_table = CryJobTable(
+            id=job_id, pet_id=pet_id, user_id=user_id,
+            audio_path=audio_path, digest=digest, status='queued')
+        db.add(job_table)
+        db.commit()
+        db.refresh(job_table)
+        return cry_job_table_to_schema(job_table)
+
+    async def enqueue(self, db: DBSession, file: UploadFile, pet_id: int, user_id: str) -> CryJob:
+        await run_db(db, self._check_enqueue, pet_id, user_id)
+
+        # 업로드 파일을 job 디렉토리에 보관 (재시작 후에도 처리할 수 있도록)
+        job_id = uuid.uuid4().hex
+        tmp_path, digest, _ = await save_upload_to_temp(
+            file, CRY_JOB_DIR, UPLOAD_CHUNK_SIZE)
+        audio_path = os.path.join(CRY_JOB_DIR, f"{job_id}.wav")
+        atomic_move(tmp_path, audio_path)
+
+        job = await run_db_write(
+            db, self._insert_job, job_id, pet_id, user_id, audio_path, digest)
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def _get_job(self, db: Session, job_id: str, user_id: str) -> CryJob:
+        db.expire_all()
+        job_table = db.query(CryJobTable).filter(
+            CryJobTable.id == job_id,
+            CryJobTable.user_id == user_id
+        ).first()
+        if not job_table:
+            raise CryJobNotFoundError(f"Cry job with id {job_id} not found")
+
+        cry_table = None
+        if job_table.cry_id is not None:
+            cry_table = db.query(CryTable).filter(
+                CryTable.id == job_table.cry_id).first()
+        return cry_job_table_to_schema(job_table, cry_table)
+
+    async def get_job(self, db: DBSession, job_id: str, user_id: str, wait: float = 0) -> CryJob:
+        """작업 상태를 조회한다. wait > 0 이면 작업이 끝나거나 wait초가 지날 때까지 기다린다 (long-poll)."""
+        job = await run_db(db, self._get_job, job_id, user_id)
+        deadline = asyncio.get_running_loop().time() + wait
+
+        while job.status not in FINISHED_STATUSES:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            # 이 프로세스에서 끝난 작업은 즉시 깨우고, 다른 프로세스의 작업은 DB를 주기적으로 확인
+            event = self._finished.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), min(remaining, self.poll_interval))
+            except asyncio.TimeoutError:
+                pass
+            job = await run_db(db, self._get_job, job_id, user_id)
+
+        self._finished.pop(job_id, None)
+        return job
+
+    # ---------- worker ----------
+    async def startup(self, session_factory) -> None:
+        self._session_factory = session_factory
+        self._wakeup = asyncio.Event()
+
+        self._tasks = [asyncio.create_task(self._worker(i))
+                       for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recovery_loop()))
+        logger.info(f"Cry job workers started (workers={self.workers})")
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _recover_expired_jobs(self) -> int:
+        """
+        lease가 만료된 running 작업(처리하던 프로세스가 종료되었거나 멈춘 작업)을 다시 대기 상태로 되돌린다.
+        lease가 없는(NULL) running 작업은 lease 도입 이전에 가져간 작업이다.
+        """
+        with self._session_factory() as db:
+            result = db.execute(
+                update(CryJobTable)
+                .where(CryJobTable.status == 'running',
+                       or_(CryJobTable.lease_until.is_(None),
+                           CryJobTable.lease_until < datetime.now()))
+                .values(status='queued', claimed_by=None, lease_until=None,
+                        updated_at=datetime.now()))
+            db.commit()
+            return result.rowcount
+
+    async def _recovery_loop(self) -> None:
+        while True:
+            try:
+                recovered = await run_in_threadpool(self._recover_expired_jobs)
+                if recovered:
+                    logger.info(f"Recovered {recovered} cry jobs with expired leases")
+                    self._wakeup.set()
+            except Exception as e:
+                logger.error(f"Failed to recover cry jobs with expired leases: {e}")
+            await asyncio.sleep(self.lease_seconds)
+
+    def _claim_next_job(self) -> Optional[Tuple[str, int]]:
+        """대기 중인 작업 하나를 이 프로세스 이름으로 가져온다. (job id, 가져간 attempt) 또는 None"""
+        with self._session_factory() as db:
+            job_table = db.query(CryJobTable).filter(
+                CryJobTable.status == 'queued',
+                CryJobTable.next_run_at <= datetime.now()
+            ).order_by(CryJobTable.created_at).first()
+            if job_table is None:
+                return None
+
+            # 여러 worker/프로세스가 같은 작업을 가져가지 않도록 조건부 UPDATE로 선점
+            attempt = job_table.attempts + 1
+            now = datetime.now()
+            result = db.execute(
+                update(CryJobTable)
+                .where(CryJobTable.id == job_table.id, CryJobTable.status == 'queued',
+                       CryJobTable.attempts == job_table.attempts)
+                .values(status='running', attempts=attempt,
+                        claimed_by=self.worker_id,
+                        lease_until=now + timedelta(seconds=self.lease_seconds),
+                        updated_at=now))
+            db.commit()
+            return (job_table.id, attempt) if result.rowcount == 1 else None
+
+    def _owned_by_me(self, job_id: str, attempt: int):
+        """이 프로세스가 attempt번째로 가져가 아직 처리 중인 작업의 조건"""
+        return (CryJobTable.id == job_id,
+                CryJobTable.status == 'running',
+                CryJobTable.claimed_by == self.worker_id,
+                CryJobTable.attempts == attempt)
+
+    def _renew_lease(self, job_id: str, attempt: int) -> bool:
+        with self._session_factory() as db:
+            result = db.execute(
+                update(CryJobTable)
+                .where(*self._owned_by_me(job_id, attempt))
+                .values(lease_until=datetime.now() + timedelta(seconds=self.lease_seconds)))
+            db.commit()
+            return result.rowcount == 1
+
+    async def _keep_lease(self, job_id: str, attempt: int) -> None:
+        """처리하는 동안 lease 기간의 1/3마다 lease를 갱신한다"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await run_in_threadpool(self._renew_lease, job_id, attempt):
+                    logger.warning(f"Cry job {job_id} lease was lost (attempt {attempt})")
+                    return
+            except Exception as e:
+                logger.error(f"Failed to renew cry job {job_id} lease: {e}")
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            try:
+                claimed = await run_in_threadpool(self._claim_next_job)
+            except Exception as e:
+                logger.error(f"Cry job worker {worker_id} failed to claim a job: {e}")
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(*claimed)
+
+    def _load_job(self, job_id: str) -> Tuple[Optional[CryJobTable], Optional[PetOwner]]:
+        """
+        처리할 작업과 반려동물 정보. 세션은 AI 서버 요청 전에 닫는다 (반환한 job_table은 읽기 전용).
+        반려동물과 함께 작업이 삭제되었으면 (None, None).
+        """
+        with self._session_factory() as db:
+            job_table = db.query(CryJobTable).filter(
+                CryJobTable.id == job_id).first()
+            if job_table is None:
+                return None, None
+            pet = cry_service._get_user_pet(
+                db, job_table.pet_id, job_table.user_id)
+            return job_table, pet
+
+    def _complete_job(self, job_id: str, attempt: int, create_cry_input: CreateCryInput, user_id: str) -> None:
+        """
+        울음 저장과 작업 완료(done, cry_id)를 한 트랜잭션으로 커밋한다.
+        둘 사이에서 프로세스가 죽어도 복구된 작업이 같은 울음을 다시 저장하지 않는다.
+        그 사이 lease가 만료되어 작업이 다른 worker에게 넘어갔으면 울음 저장도 롤백한다 (CryJobLeaseLostError).
+        """
+        def mark_done(cry_table) -> None:
+            result = db.execute(
+                update(CryJobTable)
+                .where(*self._owned_by_me(job_id, attempt))
+                .values(status='done', cry_id=cry_table.id, error=None, lease_until=None,
+                        updated_at=datetime.now()))
+            if result.rowcount == 0:
+                raise CryJobLeaseLostError(
+                    f"Cry job {job_id} is no longer held by this worker (attempt {attempt})")
+
+        with self._session_factory() as db:
+            cry_service._create_cry(
+                db, create_cry_input, user_id, before_commit=mark_done)
+
+    def _fail_job(self, job_id: str, attempt: int, error: Exception) -> bool:
+        """
+        실패한 작업을 재시도 대기 상태 또는 failed로 바꾼다. 작업이 끝났으면(failed) True.
+        작업이 이미 다른 worker에게 넘어갔으면 아무것도 바꾸지 않는다.
+        """
+        with self._session_factory() as db:
+            job_table = db.query(CryJobTable).filter(
+                CryJobTable.id == job_id).first()
+            if job_table is None:
+                return True
+            if (job_table.status != 'running' or job_table.claimed_by != self.worker_id
+                    or job_table.attempts != attempt):
+                logger.warning(f"Cry job {job_id} failed after its lease was lost (attempt {attempt}): {error}")
+                return False
+            retryable = not isinstance(
+                error, (UnauthorizedError, WrongCryOfSpeciesError))
+            if retryable and job_table.attempts < self.max_attempts:
+                backoff = self.retry_backoff * \
+                    (2 ** (job_table.attempts - 1))
+                job_table.update(
+                    status='queued', error=str(error), claimed_by=None, lease_until=None,
+                    next_run_at=datetime.now() + timedelta(seconds=backoff))
+                logger.warning(
+                    f"Cry job {job_id} failed (attempt {job_table.attempts}), retrying in {backoff}s: {error}")
+            else:
+                job_table.update(status='failed', error=str(error), lease_until=None)
+                remove_file(job_table.audio_path)
+                logger.error(f"Cry job {job_id} failed: {error}")
+            db.commit()
+            return job_table.status in FINISHED_STATUSES
+
+    async def _process(self, job_id: str, attempt: int) -> None:
+        # DB 작업은 짧은 세션으로 threadpool에서 실행하고, AI 서버 요청 동안에는 세션을 잡지 않는다
+        lease = asyncio.create_task(self._keep_lease(job_id, attempt))
+        try:
+            job_table, pet = await run_in_threadpool(self._load_job, job_id)
+            if job_table is None:
+                return
+            if not pet:
+                raise UnauthorizedError(
+                    "You are not authorized to view cries for this pet")
+
+            create_cry_input, cache_entry = await cry_service._predict_input(
+                pet, job_table.audio_path, job_table.digest,
+                job_table.user_id, job_table.created_at)
+            # 작업 파일은 울음과 작업 완료가 커밋된 뒤에 지운다 (실패하면 재시도에서 다시 사용)
+            await cry_service._save_prediction(
+                job_table.audio_path, create_cry_input, cache_entry,
+                lambda: run_in_threadpool(
+                    self._complete_job, job_id, attempt, create_cry_input, job_table.user_id))
+            remove_file(job_table.audio_path)
+            finished = True
+        except CryJobLeaseLostError as e:
+            # 작업 파일은 작업을 넘겨받은 worker가 사용한다
+            logger.warning(str(e))
+            finished = False
+        except Exception as e:
+            finished = await run_in_threadpool(self._fail_job, job_id, attempt, e)
+        finally:
+            lease.cancel()
+
+        event = self._finished.get(job_id)
+        if finished and event is not None:
+            event.set()
+
+
+cry_job_service = CryJobService()
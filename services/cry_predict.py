@@ -1,12 +1,61 @@
-import os
-from typing import Dict
-import requests
+import asyncio
+import json
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+import httpx
 
-from constants.path import ASSET_DIR
 from enums.cry_state import allowed_cry_state_en, allowed_cat_cry_state_en, allowed_dog_cry_state_en
 from core.env import env
+from error.exceptions import PredictionServerError
+from services.ai_backend_pool import AIBackendPool
+from log import logger
+
+# AI 서버 label -> 서비스 label
+AI_SERVER_LABELS = {
+    'whining': 'sad',
+    'relax': 'happy',
+    'hostile': 'anger',
+}
+
 
 class CryPredictService:
+    def __init__(self):
+        self.timeout = env.get_float("AI_SERVER_TIMEOUT", 30.0)
+        self.connect_timeout = env.get_float("AI_SERVER_CONNECT_TIMEOUT", 5.0)
+        self.max_connections = env.get_int("AI_SERVER_MAX_CONNECTIONS", 20)
+        self.max_keepalive_connections = env.get_int(
+            "AI_SERVER_MAX_KEEPALIVE_CONNECTIONS", 10)
+        self.max_concurrency = env.get_int("AI_SERVER_MAX_CONCURRENCY", 8)
+        self.batch_path = env.get("AI_SERVER_BATCH_PATH") or "/batch"
+        self.pool = AIBackendPool.from_env()
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def startup(self) -> None:
+        """앱 시작 시 AI 서버와의 keep-alive 커넥션 풀을 생성한다."""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.info(
+            f"AI server client started (max_connections={self.max_connections}, max_concurrency={self.max_concurrency})")
+
+    async def shutdown(self) -> None:
+        """앱 종료 시 커넥션 풀을 닫는다."""
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+        logger.info("AI server client closed")
+
     def get_cry_classes(self, species):
         if species == 'dog':
             return allowed_dog_cry_state_en
@@ -15,18 +64,84 @@ class CryPredictService:
         else:
             return allowed_cry_state_en
 
-    async def __call__(self, bytes: bytes, species: str, user_id: str) -> Dict[str, float]:
-        url = env.get("AI_SERVER_API")
-
-        files = {'file': ('file.wav', bytes, 'audio/wav')}
-        data = {'user_id': user_id if user_id != "yTKx5CWGvLbjKVCRgve6K5Ne8cv2" else "owner", 'species': species}
+    def _request_user_id(self, user_id: str) -> str:
+        return user_id if user_id != "yTKx5CWGvLbjKVCRgve6K5Ne8cv2" else "owner"
 
-        response = requests.post(url, files=files, data=data)
-        response_json = response.json()
-        response_json['sad'] = response_json.pop('whining')
-        response_json['happy'] = response_json.pop('relax')
-        response_json['anger'] = response_json.pop('hostile')
+    def _request_timeout(self, timeout: Optional[float]):
+        if timeout is None:
+            return httpx.USE_CLIENT_DEFAULT
+        return httpx.Timeout(timeout, connect=self.connect_timeout)
 
+    def _normalize_labels(self, response_json: Dict[str, float]) -> Dict[str, float]:
+        if not isinstance(response_json, dict):
+            raise PredictionServerError(
+                f"AI server returned an unexpected response: {response_json}")
+        for server_label, label in AI_SERVER_LABELS.items():
+            if server_label in response_json:
+                response_json[label] = response_json.pop(server_label)
+            elif label not in response_json:
+                raise PredictionServerError(
+                    f"AI server response is missing label '{server_label}': {response_json}")
         return response_json
 
-cry_predict = CryPredictService()
\ No newline at end of file
+    async def _post(self, url: str, files, data: dict, timeout: Optional[float]):
+        # lifespan 밖에서 호출된 경우(스크립트 등)에도 동작하도록 지연 생성
+        if self._client is None:
+            await self.startup()
+
+        async with self._semaphore:
+            response = await self._client.post(
+                url, files=files, data=data, timeout=self._request_timeout(timeout))
+        response.raise_for_status()
+        return response.json()
+
+    async def __call__(self, file_path: str, species: str, user_id: str,
+                       timeout: Optional[float] = None) -> Dict[str, float]:
+        data = {'user_id': self._request_user_id(user_id), 'species': species}
+
+        async def send(url: str) -> Dict[str, float]:
+            # 파일 객체를 넘겨 httpx가 청크 단위로 스트리밍 전송하도록 한다
+            # (hedged 요청/재시도마다 파일을 새로 연다)
+            with open(file_path, 'rb') as f:
+                files = {'file': ('file.wav', f, 'audio/wav')}
+                response_json = await self._post(url, files, data, timeout)
+            return self._normalize_labels(response_json)
+
+        return await self.pool.request(species, send)
+
+    async def predict_batch(self, file_paths: List[str], species: str, user_ids: List[str],
+                            timeout: Optional[float] = None) -> Optional[List[Dict[str, float]]]:
+        """
+        여러 울음 파일을 하나의 multi-file 요청으로 분석한다. 결과는 file_paths 순서를 따른다.
+        AI 서버에 batch endpoint가 없으면(404/405) None. 이때 replica는 정상이므로 circuit breaker 실패로 세지 않고, 지연 시간 표본에도 넣지 않는다.
+        """
+        data = {
+            'user_ids': json.dumps([self._request_user_id(uid) for uid in user_ids]),
+            'species': species,
+        }
+
+        async def send(url: str) -> Optional[List[Dict[str, float]]]:
+            with ExitStack() as stack:
+                files = [('files', (f'file_{i}.wav', stack.enter_context(open(file_path, 'rb')), 'audio/wav'))
+                         for i, file_path in enumerate(file_paths)]
+                try:
+                    response_json = await self._post(
+                        f'{url.rstrip("/")}{self.batch_path}', files, data, timeout)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code in (404, 405):
+                        return None
+                    raise
+            results = response_json['results'] if isinstance(
+                response_json, dict) else response_json
+            if len(results) != len(file_paths):
+                raise PredictionServerError(
+                    f"AI server returned {len(results)} results for {len(file_paths)} clips")
+            return [self._normalize_labels(result) for result in results]
+
+        return await self.pool.request(species, send)
+
+    def backend_stats(self) -> dict:
+        return self.pool.stats()
+
+
+cry_predict = CryPredictService()
@@ -0,0 +1,17 @@
+# services/cry_predict_cache.py
+from core.env import env
+from constants.path import CRY_PREDICT_CACHE_DIR
+from utils.cache import LRUCache, DiskCache, TwoTierCache
+
+_ttl = env.get_float("CRY_PREDICT_CACHE_TTL", 24 * 60 * 60)
+
+# 같은 울음 파일(바이트 동일)과 종에 대한 예측 결과 캐시: {'predictMap': ..., 'audioId': ...}
+predict_cache = TwoTierCache(
+    LRUCache(max_size=env.get_int("CRY_PREDICT_CACHE_SIZE", 1024), ttl=_ttl),
+    DiskCache(CRY_PREDICT_CACHE_DIR, ttl=_ttl)
+    if env.get_bool("CRY_PREDICT_CACHE_DISK", True) else None,
+)
+
+
+def make_predict_cache_key(digest: str, species: str) -> str:
+    return f'{species}_{digest}'
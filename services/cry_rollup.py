@@ -0,0 +1,124 @@
+# services/cry_rollup.py
+import sys
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import Table, and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from model.cry import CryTable
+from model.cry_rollup import CryHourlyRollupTable, CryDailyRollupTable
+from utils.sql import sql_date, sql_hour, upsert_add
+from log import logger
+
+RollupKey = Tuple[int, object, int, str]
+
+
+class CryRollupService:
+    """
+    울음 기록의 횟수/지속시간 합계를 두 단계 bucket으로 유지한다.
+    - cry_rollup_hourly: (pet_id, 날짜, 시간, 울음 원인)
+    - cry_rollup_daily: (pet_id, 날짜, 울음 원인)
+    create/update/delete와 같은 트랜잭션 안에서 호출되어야 하며, commit은 호출자가 한다.
+    """
+
+    def _key(self, pet_id: int, time: datetime, state: str) -> RollupKey:
+        return (pet_id, time.date(), time.hour, state)
+
+    def _tables(self, key: RollupKey) -> List[Tuple[Table, dict]]:
+        """key가 속한 (집계 테이블, 해당 행의 key 컬럼) 목록."""
+        pet_id, date, hour, state = key
+        return [
+            (CryHourlyRollupTable.__table__,
+             dict(pet_id=pet_id, date=date, hour=hour, state=state)),
+            (CryDailyRollupTable.__table__,
+             dict(pet_id=pet_id, date=date, state=state)),
+        ]
+
+    def _where(self, table: Table, keys: dict):
+        return [table.c[column] == value for column, value in keys.items()]
+
+    def _decrement(self, db: Session, table: Table, keys: dict, count: int, duration_sum: float) -> None:
+        db.execute(update(table).where(*self._where(table, keys)).values(
+            count=table.c.count - count,
+            duration_sum=table.c.duration_sum - duration_sum))
+        db.execute(delete(table).where(
+            *self._where(table, keys), table.c.count <= 0))
+
+    def add(self, db: Session, cries: Iterable[CryTable]) -> None:
+        """새로 저장되는 울음들을 집계에 더한다. 같은 bucket은 한 번의 upsert로 묶는다."""
+        deltas = {}
+        for cry in cries:
+            for table, keys in self._tables(self._key(cry.pet_id, cry.time, cry.state)):
+                bucket = (table.name, tuple(keys.items()))
+                _, count, duration_sum = deltas.get(bucket, (table, 0, 0.0))
+                deltas[bucket] = (table, count + 1,
+                                  duration_sum + (cry.duration or 0.0))
+        for (_, keys), (table, count, duration_sum) in deltas.items():
+            upsert_add(db, table, dict(keys),
+                       dict(count=count, duration_sum=duration_sum))
+
+    def remove(self, db: Session, pet_id: int, time: datetime, state: str, duration: Optional[float]) -> None:
+        for table, keys in self._tables(self._key(pet_id, time, state)):
+            self._decrement(db, table, keys, 1, duration or 0.0)
+
+    def rebuild(self, db: Session, pet_id: Optional[int] = None) -> int:
+        """울음 원본 테이블로부터 집계를 다시 만든다. pet_id가 없으면 전체를 다시 만든다."""
+        hourly = CryHourlyRollupTable.__table__
+        daily = CryDailyRollupTable.__table__
+        dialect_name = db.get_bind().dialect.name
+        cry_date = sql_date(CryTable.time, dialect_name)
+        cry_hour = sql_hour(CryTable.time, dialect_name)
+
+        hourly_source = select(
+            CryTable.pet_id, cry_date, cry_hour, CryTable.state,
+            func.count(CryTable.id), func.coalesce(func.sum(CryTable.duration), 0.0)
+        ).group_by(CryTable.pet_id, cry_date, cry_hour, CryTable.state)
+        # 일 단위 집계는 방금 만든 시간 단위 집계를 합쳐서 만든다
+        daily_source = select(
+            hourly.c.pet_id, hourly.c.date, hourly.c.state,
+            func.sum(hourly.c.count), func.sum(hourly.c.duration_sum)
+        ).group_by(hourly.c.pet_id, hourly.c.date, hourly.c.state)
+
+        remove_hourly, remove_daily = delete(hourly), delete(daily)
+        if pet_id is not None:
+            hourly_source = hourly_source.where(CryTable.pet_id == pet_id)
+            daily_source = daily_source.where(hourly.c.pet_id == pet_id)
+            remove_hourly = remove_hourly.where(hourly.c.pet_id == pet_id)
+            remove_daily = remove_daily.where(daily.c.pet_id == pet_id)
+
+        db.execute(remove_hourly)
+        db.execute(remove_daily)
+        result = db.execute(insert(hourly).from_select(
+            ['pet_id', 'date', 'hour', 'state', 'count', 'duration_sum'], hourly_source))
+        db.execute(insert(daily).from_select(
+            ['pet_id', 'date', 'state', 'count', 'duration_sum'], daily_source))
+        db.commit()
+        return result.rowcount
+
+    def hour_range_filter(self, start_hour: datetime, end_hour: datetime):
+        """[start_hour, end_hour) 구간의 시간 단위 bucket을 고르는 조건. 두 시각은 정시여야 한다."""
+        table = CryHourlyRollupTable.__table__
+        return and_(
+            or_(table.c.date > start_hour.date(),
+                and_(table.c.date == start_hour.date(), table.c.hour >= start_hour.hour)),
+            or_(table.c.date < end_hour.date(),
+                and_(table.c.date == end_hour.date(), table.c.hour < end_hour.hour)),
+        )
+
+
+cry_rollup_service = CryRollupService()
+
+
+if __name__ == '__main__':
+    # 사용법: python -m services.cry_rollup rebuild [pet_id]
+    from db import SessionLocal
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'rebuild':
+        print("usage: python -m services.cry_rollup rebuild [pet_id]")
+        sys.exit(1)
+
+    target_pet_id = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with SessionLocal() as db:
+        rows = cry_rollup_service.rebuild(db, target_pet_id)
+    logger.info(
+        f"Rebuilt cry rollups ({'all pets' if target_pet_id is None else f'pet {target_pet_id}'}): {rows} rows")
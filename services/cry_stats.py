@@ -0,0 +1,336 @@
+# services/cry_stats.py
+import math
+import time
+import asyncio
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+
+from model.cry import CryTable
+from model.cry_stats_snapshot import CryStatsSnapshotTable
+from model.pet_cry_version import PetCryVersionTable
+from core.env import env
+from log import logger
+
+
+class DecayingRate:
+    """
+    지수 가중 이동 평균(EWMA) 발생률. 이벤트마다 1/tau를 더하고 시간에 따라 exp(-dt/tau)로 감쇠한다.
+    선형이므로 과거 시각의 이벤트를 더하거나(순서가 뒤바뀐 입력) 뺄 수 있다.
+    """
+
+    def __init__(self, tau: float, value: float = 0.0, updated_at: float = 0.0):
+        self.tau = tau
+        self.value = value
+        self.updated_at = updated_at
+
+    def at(self, now: float) -> float:
+        """now 시점의 초당 발생률."""
+        if now <= self.updated_at:
+            return self.value
+        return self.value * math.exp(-(now - self.updated_at) / self.tau)
+
+    def add(self, event_time: float, weight: float = 1.0) -> None:
+        if event_time >= self.updated_at:
+            self.value = self.at(event_time) + weight / self.tau
+            self.updated_at = event_time
+        else:
+            self.value += weight * \
+                math.exp(-(self.updated_at - event_time) / self.tau) / self.tau
+        self.value = max(self.value, 0.0)
+
+
+class PetCryStats:
+    """반려동물 한 마리의 울음 통계 누적값. 모든 갱신은 O(1)이다."""
+
+    def __init__(self, short_tau: float, baseline_tau: float, version: int = 0):
+        self.version = version
+        self.count = 0
+        self.short_rate = DecayingRate(short_tau)
+        self.baseline_rate = DecayingRate(baseline_tau)
+        self.hour_counts = [0] * 24
+        self.state_counts: Dict[str, int] = {}
+        # Welford 알고리즘: 지속시간의 평균과 분산(M2)을 누적
+        self.duration_count = 0
+        self.duration_mean = 0.0
+        self.duration_m2 = 0.0
+
+    def add(self, cry_time: datetime, state: str, duration: Optional[float]) -> None:
+        event_time = cry_time.timestamp()
+        self.count += 1
+        self.short_rate.add(event_time)
+        self.baseline_rate.add(event_time)
+        self.hour_counts[cry_time.hour] += 1
+        self.state_counts[state] = self.state_counts.get(state, 0) + 1
+        if duration is not None:
+            self.duration_count += 1
+            delta = duration - self.duration_mean
+            self.duration_mean += delta / self.duration_count
+            self.duration_m2 += delta * (duration - self.duration_mean)
+
+    def remove(self, cry_time: datetime, state: str, duration: Optional[float]) -> None:
+        event_time = cry_time.timestamp()
+        self.count = max(self.count - 1, 0)
+        self.short_rate.add(event_time, -1.0)
+        self.baseline_rate.add(event_time, -1.0)
+        self.hour_counts[cry_time.hour] = max(self.hour_counts[cry_time.hour] - 1, 0)
+        remaining = self.state_counts.get(state, 0) - 1
+        if remaining > 0:
+            self.state_counts[state] = remaining
+        else:
+            self.state_counts.pop(state, None)
+        if duration is not None and self.duration_count > 0:
+            # Welford 역연산
+            if self.duration_count == 1:
+                self.duration_count, self.duration_mean, self.duration_m2 = 0, 0.0, 0.0
+                return
+            previous_mean = (self.duration_count * self.duration_mean -
+                             duration) / (self.duration_count - 1)
+            self.duration_m2 -= (duration - previous_mean) * \
+                (duration - self.duration_mean)
+            self.duration_m2 = max(self.duration_m2, 0.0)
+            self.duration_mean = previous_mean
+            self.duration_count -= 1
+
+    def summary(self, now: float, spike_ratio: float, spike_min_cries: float) -> dict:
+        short_rate = self.short_rate.at(now) * 3600
+        baseline_rate = self.baseline_rate.at(now) * 3600
+        variance = self.duration_m2 / (self.duration_count - 1) \
+            if self.duration_count > 1 else 0.0
+        # 최근 발생률이 평소 발생률보다 spike_ratio배 이상 높고, 최근 울음 수가 충분할 때 급증으로 본다
+        recent_cries = self.short_rate.at(now) * self.short_rate.tau
+        spike = recent_cries >= spike_min_cries and short_rate >= baseline_rate * spike_ratio
+        return {
+            'count': self.count,
+            'rate_per_hour': round(short_rate, 4),
+            'baseline_rate_per_hour': round(baseline_rate, 4),
+            'spike': spike,
+            'hour_counts': list(self.hour_counts),
+            'state_counts': dict(self.state_counts),
+            'duration_mean': round(self.duration_mean, 3),
+            'duration_std': round(math.sqrt(variance), 3),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'short_rate': [self.short_rate.value, self.short_rate.updated_at],
+            'baseline_rate': [self.baseline_rate.value, self.baseline_rate.updated_at],
+            'hour_counts': self.hour_counts,
+            'state_counts': self.state_counts,
+            'duration': [self.duration_count, self.duration_mean, self.duration_m2],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, short_tau: float, baseline_tau: float, version: int) -> 'PetCryStats':
+        stats = cls(short_tau, baseline_tau, version)
+        stats.count = data['count']
+        stats.short_rate = DecayingRate(short_tau, *data['short_rate'])
+        stats.baseline_rate = DecayingRate(baseline_tau, *data['baseline_rate'])
+        stats.hour_counts = list(data['hour_counts'])
+        stats.state_counts = dict(data['state_counts'])
+        stats.duration_count, stats.duration_mean, stats.duration_m2 = data['duration']
+        return stats
+
+
+class CryStatsEngine:
+    """
+    반려동물별 실시간 울음 통계를 프로세스 메모리에 유지한다.
+    CryService의 create/update/delete가 commit된 뒤 bump된 데이터 버전과 함께 호출되어 누적값을 O(1)로 갱신한다.
+
+    누적값에는 마지막으로 반영한 데이터 버전(pet_cry_version)을 함께 기록한다.
+    쓰기는 누적값 버전의 바로 다음 버전일 때만 반영하고, 사이에 빠진 버전이 있으면 (다른 프로세스의 쓰기 등) 누적값을 버린다.
+    조회할 때마다 DB 버전(기본 키 조회 한 번)과 비교해 다르면 원본 울음 기록으로 다시 만든다.
+    시작 시에는 버전이 일치하는 스냅샷만 복원한다.
+    """
+
+    def __init__(self):
+        self.short_tau = env.get_float("CRY_STATS_SHORT_TAU_MINUTES", 60) * 60
+        self.baseline_tau = env.get_float("CRY_STATS_BASELINE_TAU_HOURS", 24 * 7) * 3600
+        self.spike_ratio = env.get_float("CRY_STATS_SPIKE_RATIO", 3.0)
+        self.spike_min_cries = env.get_float("CRY_STATS_SPIKE_MIN_CRIES", 3.0)
+        self.snapshot_interval = env.get_float("CRY_STATS_SNAPSHOT_INTERVAL", 60.0)
+
+        self._stats: Dict[int, PetCryStats] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._session_factory = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _new(self, version: int) -> PetCryStats:
+        return PetCryStats(self.short_tau, self.baseline_tau, version)
+
+    # ---------- 쓰기 경로 (commit 이후 호출) ----------
+    # version은 쓰기 트랜잭션에서 bump된 데이터 버전이다.
+    # 메모리에 없는 반려동물은 건너뛴다. 조회할 때 DB에서 만들면 방금 commit된 울음도 포함된다.
+    def _apply(self, pet_id: int, version: int, apply: Callable[[PetCryStats], None]) -> None:
+        with self._lock:
+            stats = self._stats.get(pet_id)
+            # 이미 이 쓰기를 포함해 다시 만든 누적값이면 그대로 둔다
+            if stats is None or stats.version >= version:
+                return
+            if stats.version != version - 1:
+                # 반영하지 못한 버전이 있다: 다음 조회 때 다시 만든다
+                del self._stats[pet_id]
+                self._dirty.discard(pet_id)
+                return
+            apply(stats)
+            stats.version = version
+            self._dirty.add(pet_id)
+
+    def on_create(self, pet_id: int, cries: Iterable[tuple], version: int) -> None:
+        """cries: (time, state, duration) 목록."""
+        def apply(stats: PetCryStats) -> None:
+            for cry in cries:
+                stats.add(*cry)
+        self._apply(pet_id, version, apply)
+
+    def on_update(self, pet_id: int, previous: tuple, current: tuple, version: int) -> None:
+        def apply(stats: PetCryStats) -> None:
+            stats.remove(*previous)
+            stats.add(*current)
+        self._apply(pet_id, version, apply)
+
+    def on_delete(self, pet_id: int, cry_time: datetime, state: str, duration: Optional[float],
+                  version: int) -> None:
+        self._apply(pet_id, version,
+                    lambda stats: stats.remove(cry_time, state, duration))
+
+    def on_version(self, pet_id: int, version: int) -> None:
+        """울음이 바뀌지 않은 bump (반려동물 정보 변경)."""
+        self._apply(pet_id, version, lambda stats: None)
+
+    def forget(self, pet_id: int) -> None:
+        with self._lock:
+            self._stats.pop(pet_id, None)
+            self._dirty.discard(pet_id)
+
+    def _forget_stale(self, pet_id: int, version: int) -> None:
+        with self._lock:
+            stats = self._stats.get(pet_id)
+            # 스냅샷을 만드는 동안 이 프로세스에서 더 반영된 쓰기가 있으면 다음 스냅샷에서 다시 확인
+            if stats is not None and stats.version == version:
+                del self._stats[pet_id]
+
+    # ---------- 조회 ----------
+    def get(self, db: Session, pet_id: int) -> dict:
+        version = self._version(db, pet_id)
+        with self._lock:
+            stats = self._stats.get(pet_id)
+            if stats is not None and stats.version == version:
+                return stats.summary(time.time(), self.spike_ratio, self.spike_min_cries)
+
+        stats = self._bootstrap(db, pet_id, version)
+        with self._lock:
+            current = self._stats.get(pet_id)
+            # 다시 만드는 동안 이 프로세스의 쓰기로 더 새 버전이 들어왔으면 그것을 유지한다
+            if stats.version >= 0 and (current is None or current.version < stats.version):
+                self._stats[pet_id] = stats
+            return stats.summary(time.time(), self.spike_ratio, self.spike_min_cries)
+
+    def _version(self, db: Session, pet_id: int) -> int:
+        return db.execute(
+            select(PetCryVersionTable.version)
+            .where(PetCryVersionTable.pet_id == pet_id)
+        ).scalar() or 0
+
+    def _bootstrap(self, db: Session, pet_id: int, version: int) -> PetCryStats:
+        """
+        version 시점의 원본 울음 기록으로 누적값을 만든다.
+        읽는 동안 다른 쓰기가 commit되어 버전이 바뀌었으면 어느 버전인지 알 수 없으므로 버전을 -1로 둔다 (저장하지 않음).
+        """
+        stats = self._new(version)
+        rows = db.execute(
+            select(CryTable.time, CryTable.state, CryTable.duration)
+            .where(CryTable.pet_id == pet_id)
+            .order_by(CryTable.time)
+        )
+        for cry_time, state, duration in rows:
+            stats.add(cry_time, state, duration)
+        if self._version(db, pet_id) != version:
+            stats.version = -1
+        return stats
+
+    # ---------- 스냅샷 ----------
+    def snapshot(self, db: Session) -> int:
+        """변경된 누적값을 DB에 저장한다. DB 버전과 다른 누적값은 저장하지 않고 버린다."""
+        with self._lock:
+            dirty = {pet_id: self._stats[pet_id] for pet_id in self._dirty
+                     if pet_id in self._stats}
+            self._dirty.clear()
+            payloads = {pet_id: (stats.version, stats.to_dict())
+                        for pet_id, stats in dirty.items()}
+        if not payloads:
+            return 0
+
+        versions = dict(db.execute(
+            select(PetCryVersionTable.pet_id, PetCryVersionTable.version)
+            .where(PetCryVersionTable.pet_id.in_(list(payloads)))
+        ).all())
+
+        saved = 0
+        for pet_id, (version, data) in payloads.items():
+            if versions.get(pet_id, 0) != version:
+                self._forget_stale(pet_id, version)
+                continue
+            db.merge(CryStatsSnapshotTable(
+                pet_id=pet_id, version=version, data=data, updated_at=datetime.now()))
+            saved += 1
+        db.commit()
+        return saved
+
+    def restore(self, db: Session) -> int:
+        """DB 버전과 일치하는 스냅샷만 메모리로 불러온다."""
+        rows = db.execute(
+            select(CryStatsSnapshotTable.pet_id, CryStatsSnapshotTable.version,
+                   CryStatsSnapshotTable.data, PetCryVersionTable.version)
+            .outerjoin(PetCryVersionTable,
+                       PetCryVersionTable.pet_id == CryStatsSnapshotTable.pet_id)
+        ).all()
+
+        restored = {}
+        for pet_id, snapshot_version, data, version in rows:
+            if snapshot_version != (version or 0):
+                continue
+            restored[pet_id] = PetCryStats.from_dict(
+                data, self.short_tau, self.baseline_tau, snapshot_version)
+        with self._lock:
+            self._stats.update(restored)
+        return len(restored)
+
+    def _snapshot_with_session(self) -> int:
+        with self._session_factory() as db:
+            return self.snapshot(db)
+
+    def _restore_with_session(self) -> int:
+        with self._session_factory() as db:
+            return self.restore(db)
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await run_in_threadpool(self._snapshot_with_session)
+            except Exception as e:
+                logger.error(f"Failed to snapshot cry stats: {e}")
+
+    async def startup(self, session_factory) -> None:
+        self._session_factory = session_factory
+        restored = await run_in_threadpool(self._restore_with_session)
+        logger.info(f"Restored cry stats for {restored} pets")
+        self._task = asyncio.create_task(self._snapshot_loop())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._session_factory is not None:
+            saved = await run_in_threadpool(self._snapshot_with_session)
+            logger.info(f"Saved cry stats snapshot for {saved} pets")
+
+
+cry_stats_engine = CryStatsEngine()
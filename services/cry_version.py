@@ -0,0 +1,41 @@
+# services/cry_version.py
+from typing import List, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from model.pet import PetTable
+from model.pet_cry_version import PetCryVersionTable
+from utils.sql import upsert_add
+
+
+class CryVersionService:
+    """
+    반려동물별 데이터 버전을 관리한다. 버전은 DB에 있으므로 여러 프로세스가 같은 값을 본다.
+    bump는 울음 create/update/delete, 반려동물 update와 같은 트랜잭션 안에서 호출되어야 하며, commit은 호출자가 한다.
+    """
+
+    def bump(self, db: Session, pet_id: int) -> int:
+        """버전을 1 올리고 새 버전을 돌려준다. 같은 반려동물의 bump는 행 잠금으로 직렬화되어 commit 순서와 버전 순서가 같다."""
+        table = PetCryVersionTable.__table__
+        return upsert_add(db, table, dict(pet_id=pet_id), dict(version=1),
+                          returning=[table.c.version]).version
+
+    def get(self, db: Session, pet_id: int) -> int:
+        version = db.execute(
+            select(PetCryVersionTable.version)
+            .where(PetCryVersionTable.pet_id == pet_id)
+        ).scalar()
+        return version or 0
+
+    def get_user_versions(self, db: Session, user_id: str) -> List[Tuple[int, int]]:
+        """user_id의 반려동물마다 (pet_id, 버전). 반려동물 목록 ETag에 쓰이므로 반려동물이 생기거나 없어져도 값이 바뀐다."""
+        rows = db.execute(
+            select(PetTable.id, func.coalesce(PetCryVersionTable.version, 0))
+            .outerjoin(PetCryVersionTable, PetCryVersionTable.pet_id == PetTable.id)
+            .where(PetTable.user_id == user_id)
+            .order_by(PetTable.id)
+        ).all()
+        return [tuple(row) for row in rows]
+
+
+cry_version_service = CryVersionService()
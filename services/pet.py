@@ -1,16 +1,22 @@
 # services/pet.py
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional, Tuple
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image
 import os
 
 from schemas.pet import *
 from model.pet import PetTable
+from model.cry import CryTable
 from enums.species import SpeciesEnum, SPECIES_KR_TO_EN
 from error.exceptions import (
     NegativeAgeError, PetNotFoundError, WrongFileTypeError)
 from utils.converters import pet_table_to_schema
+from utils.async_db import DBSession, run_db, run_db_write
+from services.pet_owner_cache import PetOwner, pet_owner_cache
+from services.cry_stats import cry_stats_engine
+from services.cry_version import cry_version_service
 from constants.path import PET_PROFILE_DIR
 
 
@@ -27,6 +33,8 @@ class PetService:
         db.add(pet_table)
         db.commit()
         db.refresh(pet_table)
+        pet_owner_cache.set(
+            PetOwner(pet_table.id, pet_table.user_id, pet_table.species))
 
         return pet_table_to_schema(pet_table)
 
@@ -36,10 +44,19 @@ class PetService:
             raise PetNotFoundError(f"Pet with id {pet_id} not found")
         return pet_table_to_schema(pet_table)
 
-    def get_all_pets_by_user(self, db: Session, user_id: str) -> list[Pet]:
-        pet_tables = db.query(PetTable).filter(
-            PetTable.user_id == user_id).all()
-        return [pet_table_to_schema(pet) for pet in pet_tables]
+    def get_all_pets_by_user(self, db: Session, user_id: str, fields: Optional[Tuple[str, ...]] = None) -> list[Pet]:
+        """fields가 있으면 그 필드의 컬럼만 읽어 그 필드만 있는 Pet을 돌려준다."""
+        query = db.query(PetTable).filter(PetTable.user_id == user_id)
+        if fields is None:
+            return [pet_table_to_schema(pet) for pet in query.all()]
+        columns = {'id': PetTable.id}
+        columns.update((field, getattr(PetTable, field)) for field in fields if field != 'cries')
+        pets = [Pet.trusted(**row._asdict()) for row in query.with_entities(*columns.values())]
+        if 'cries' in fields:
+            # PetTable.cries는 lazy='noload'라 전체 조회에서도 항상 빈 목록이다
+            for pet in pets:
+                pet.cries = []
+        return pets
 
     def update_pet(self, db: Session, pet_id: int, update_pet_input: UpdatePetInput, user_id: str) -> Pet:
         pet_table = self._get_pet_by_id(db, pet_id, user_id)
@@ -50,7 +67,12 @@ class PetService:
             raise NegativeAgeError("Age cannot be negative")
 
         pet_table.update(**update_pet_input.model_dump(exclude_unset=True))
+        # 반려동물 응답의 ETag가 바뀌도록 데이터 버전을 올린다
+        version = cry_version_service.bump(db, pet_id)
         db.commit()
+        cry_stats_engine.on_version(pet_id, version)
+        # 종(species)이나 소유자가 바뀌었을 수 있다
+        pet_owner_cache.invalidate([pet_id])
         db.refresh(pet_table)
 
         return pet_table_to_schema(pet_table)
@@ -60,14 +82,36 @@ class PetService:
         if not pet_table:
             raise PetNotFoundError(f"Pet with id {pet_id} not found")
 
-        db.delete(pet_table)
+        self._delete_pets(db, [pet_id])
         db.commit()
+        self._forget_pets([pet_id])
+
+    def _delete_pets(self, db: Session, pet_ids: List[int]) -> None:
+        """
+        반려동물과 그 울음을 지운다 (commit은 호출하는 쪽에서).
+        cry.pet_id에는 ON DELETE CASCADE가 없으므로 울음을 먼저 지우고, 집계/버전/작업 테이블은 외래 키 CASCADE로 지워진다.
+        """
+        if not pet_ids:
+            return
+        db.query(CryTable).filter(CryTable.pet_id.in_(pet_ids)).delete(
+            synchronize_session=False)
+        db.query(PetTable).filter(PetTable.id.in_(pet_ids)).delete(
+            synchronize_session=False)
+
+    def _forget_pets(self, pet_ids: List[int]) -> None:
+        """삭제가 commit된 뒤 프로세스 메모리에 남은 반려동물 정보를 지운다."""
+        pet_owner_cache.invalidate(pet_ids)
+        for pet_id in pet_ids:
+            cry_stats_engine.forget(pet_id)
 
     def uploadProfileImage(self, file: UploadFile, db: Session, pet_id: int, user_id: str):
         pet_table = self._get_pet_by_id(db, pet_id, user_id)
         if not pet_table:
             raise PetNotFoundError(f"Pet with id {pet_id} not found")
 
+        return self._save_profile_image(file, pet_id)
+
+    def _save_profile_image(self, file: UploadFile, pet_id: int):
         # 파일 확장자를 file.filename에서 추출
         filename = file.filename
         if "." in filename:
@@ -96,3 +140,36 @@ class PetService:
 
 
 pet_service = PetService()
+
+
+class AsyncPetService:
+    """PetService의 async 버전. DB 작업은 run_db로, 이미지 변환은 threadpool에서 실행되어 이벤트 루프를 막지 않는다."""
+
+    async def create_pet(self, db: DBSession, create_pet_input: CreatePetInput, user_id: str) -> Pet:
+        return await run_db_write(db, pet_service.create_pet, create_pet_input, user_id)
+
+    async def get_pet_by_id(self, db: DBSession, pet_id: int, user_id: str) -> Pet:
+        return await run_db(db, pet_service.get_pet_by_id, pet_id, user_id)
+
+    async def get_all_pets_by_user(self, db: DBSession, user_id: str,
+                                   fields: Optional[Tuple[str, ...]] = None) -> list[Pet]:
+        return await run_db(db, pet_service.get_all_pets_by_user, user_id, fields)
+
+    async def get_user_versions(self, db: DBSession, user_id: str) -> List[Tuple[int, int]]:
+        return await run_db(db, cry_version_service.get_user_versions, user_id)
+
+    async def update_pet(self, db: DBSession, pet_id: int, update_pet_input: UpdatePetInput, user_id: str) -> Pet:
+        return await run_db_write(db, pet_service.update_pet, pet_id, update_pet_input, user_id)
+
+    async def delete_pet(self, db: DBSession, pet_id: int, user_id: str) -> None:
+        return await run_db_write(db, pet_service.delete_pet, pet_id, user_id)
+
+    async def uploadProfileImage(self, file: UploadFile, db: DBSession, pet_id: int, user_id: str):
+        pet_table = await run_db(db, pet_service._get_pet_by_id, pet_id, user_id)
+        if not pet_table:
+            raise PetNotFoundError(f"Pet with id {pet_id} not found")
+
+        return await run_in_threadpool(pet_service._save_profile_image, file, pet_id)
+
+
+async_pet_service = AsyncPetService()
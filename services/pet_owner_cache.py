@@ -0,0 +1,56 @@
+# services/pet_owner_cache.py
+from typing import Dict, Iterable, NamedTuple, Optional
+from sqlalchemy.orm import Session
+
+from core.env import env
+from model.pet import PetTable
+from utils.cache import LRUCache
+
+
+class PetOwner(NamedTuple):
+    """소유권 확인과 울음 상태 검증에 필요한 반려동물 정보"""
+    id: int
+    user_id: str
+    species: str
+
+
+class PetOwnerCache:
+    """
+    pet_id -> PetOwner 프로세스 메모리 캐시. 울음 API가 요청마다 pet을 다시 조회하지 않도록 한다.
+    이 프로세스에서 반려동물을 수정/삭제하면 바로 invalidate하고, 다른 프로세스의 변경은 ttl 안에 반영된다.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def get(self, pet_id: int) -> Optional[PetOwner]:
+        return self._cache.get(pet_id)
+
+    def set(self, pet: PetOwner) -> None:
+        self._cache.set(pet.id, pet)
+
+    def invalidate(self, pet_ids: Iterable[int]) -> None:
+        for pet_id in pet_ids:
+            self._cache.delete(pet_id)
+
+    def load(self, db: Session, pet_ids: Iterable[int]) -> Dict[int, PetOwner]:
+        """pet_ids의 PetOwner. 캐시에 없는 반려동물만 쿼리 한 번으로 읽어 채우며, 없는 반려동물은 결과에서 빠진다."""
+        pets, missing = {}, []
+        for pet_id in set(pet_ids):
+            pet = self.get(pet_id)
+            if pet is None:
+                missing.append(pet_id)
+            else:
+                pets[pet_id] = pet
+        if missing:
+            for row in db.query(PetTable.id, PetTable.user_id, PetTable.species).filter(
+                    PetTable.id.in_(missing)):
+                pet = PetOwner(*row)
+                self.set(pet)
+                pets[pet.id] = pet
+        return pets
+
+
+pet_owner_cache = PetOwnerCache(
+    max_size=env.get_int("PET_OWNER_CACHE_SIZE", 10000),
+    ttl=env.get_float("PET_OWNER_CACHE_TTL", 60))
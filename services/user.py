@@ -3,11 +3,14 @@ from typing import Optional
 
 from schemas.user import *
 from model.user import UserTable
+from model.pet import PetTable
 from error.exceptions import (
     UserNotFoundError, UnauthorizedError,
     DuplicateEmailError, DuplicateUidError
 )
 from utils.converters import user_table_to_schema
+from utils.async_db import DBSession, run_db, run_db_write
+from services.pet import pet_service
 
 
 class UserService:
@@ -53,8 +56,13 @@ class UserService:
         user_table = self._get_user_by_uid(db, user_id)
         if not user_table:
             raise UserNotFoundError(f"User with id {user_id} not found")
+        # pets 관계는 noload라 ORM cascade로는 지워지지 않는다
+        pet_ids = [pet_id for pet_id, in db.query(PetTable.id).filter(
+            PetTable.user_id == user_id)]
+        pet_service._delete_pets(db, pet_ids)
         db.delete(user_table)
         db.commit()
+        pet_service._forget_pets(pet_ids)
 
     def login(self, db: Session, login_user_input: LoginUserInput) -> User:
         user_table = self._get_user_by_email(db, login_user_input.email)
@@ -68,3 +76,25 @@ class UserService:
 
 
 user_service = UserService()
+
+
+class AsyncUserService:
+    """UserService의 async 버전. DB 작업은 run_db로 실행되어 이벤트 루프를 막지 않는다."""
+
+    async def create_user(self, db: DBSession, create_user_input: CreateUserInput) -> User:
+        return await run_db_write(db, user_service.create_user, create_user_input)
+
+    async def get_user_by_id(self, db: DBSession, user_id: str) -> User:
+        return await run_db(db, user_service.get_user_by_id, user_id)
+
+    async def update_user(self, db: DBSession, user_id: str, update_user_input: UpdateUserInput) -> User:
+        return await run_db_write(db, user_service.update_user, user_id, update_user_input)
+
+    async def delete_user(self, db: DBSession, user_id: str) -> None:
+        return await run_db_write(db, user_service.delete_user, user_id)
+
+    async def login(self, db: DBSession, login_user_input: LoginUserInput) -> User:
+        return await run_db(db, user_service.login, login_user_input)
+
+
+async_user_service = AsyncUserService()
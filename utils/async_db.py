@@ -0,0 +1,50 @@
+# utils/async_db.py
+import asyncio
+import weakref
+from typing import Union
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.concurrency import run_in_threadpool
+
+DBSession = Union[Session, AsyncSession]
+
+# 이벤트 루프별 SQLite 쓰기 lock
+_sqlite_write_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+async def run_db(db: DBSession, func, *args, **kwargs):
+    """
+    동기 서비스 함수 func(session, *args, **kwargs)를 이벤트 루프를 막지 않고 실행한다.
+    AsyncSession이면 run_sync로 async 드라이버(aiosqlite/aiomysql)를 통해, Session이면 threadpool에서 실행한다.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(func, *args, **kwargs)
+    return await run_in_threadpool(func, db, *args, **kwargs)
+
+
+async def run_db_write(db: DBSession, func, *args, **kwargs):
+    """
+    쓰기 트랜잭션을 여는 func용 run_db.
+    SQLite는 writer가 하나뿐이라, AsyncSession에서는 쓰기를 프로세스 안에서 줄 세운다.
+    (그렇지 않으면 lock을 잡은 트랜잭션이 statement마다 이벤트 루프 차례를 기다리는 동안
+    나머지 writer들이 busy_timeout까지 polling하다 'database is locked'로 실패한다)
+    """
+    if isinstance(db, AsyncSession) and db.bind.dialect.name == 'sqlite':
+        loop = asyncio.get_running_loop()
+        lock = _sqlite_write_locks.get(loop)
+        if lock is None:
+            lock = _sqlite_write_locks[loop] = asyncio.Lock()
+        async with lock:
+            return await run_db(db, func, *args, **kwargs)
+    return await run_db(db, func, *args, **kwargs)
+
+
+async def release_connection(db: DBSession) -> None:
+    """
+    AI 서버 요청처럼 오래 기다리기 전에 조회로 시작된 트랜잭션을 끝내 connection을 pool에 돌려준다.
+    (MySQL에서는 그대로 두면 기다리는 동안 트랜잭션과 snapshot이 유지된다)
+    """
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        await run_in_threadpool(db.rollback)
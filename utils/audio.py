@@ -0,0 +1,160 @@
+# utils/audio.py
+import wave
+from typing import List, NamedTuple, Tuple
+import numpy as np
+
+from enums.cry_intensity import CryIntensityEnum
+
+FRAME_MS = 25
+HOP_MS = 10
+SILENCE_DB = -60.0
+ACTIVE_OVER_NOISE_DB = 10.0
+INTENSITY_LOW_DB = -35.0
+INTENSITY_HIGH_DB = -20.0
+
+
+class AudioAnalysis(NamedTuple):
+    duration: float
+    rms_db: float
+    peak_db: float
+    active_ratio: float
+    intensity: str
+
+
+def decode_wav(file_path: str) -> Tuple[np.ndarray, int]:
+    """PCM wav 파일을 [-1, 1] 범위의 mono float32 배열과 sample rate로 디코딩한다."""
+    with wave.open(file_path, 'rb') as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        raw = wav.readframes(wav.getnframes())
+
+    if sample_width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768
+    elif sample_width == 3:
+        # 24bit: 3바이트를 상위 바이트에 채운 int32로 변환
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(b), 4), dtype=np.uint8)
+        padded[:, 1:] = b
+        samples = padded.view('<i4').reshape(-1).astype(np.float32) / 2147483648
+    elif sample_width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    if channels > 1:
+        samples = samples[:len(samples) - len(samples) % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def frame_rms(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """프레임별 RMS. 샘플 단위 Python 루프 없이 strided view로 계산한다."""
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(
+        samples, frame_length)[::hop_length]
+    return np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+
+
+def to_db(value: np.ndarray) -> np.ndarray:
+    return 20 * np.log10(np.maximum(value, 1e-10))
+
+
+def classify_intensity(rms_db: float) -> str:
+    if rms_db < INTENSITY_LOW_DB:
+        return CryIntensityEnum.LOW.value
+    if rms_db >= INTENSITY_HIGH_DB:
+        return CryIntensityEnum.HIGH.value
+    return CryIntensityEnum.MEDIUM.value
+
+
+def active_frames(frame_db: np.ndarray) -> np.ndarray:
+    # 소음 바닥(하위 10%)보다 충분히 큰 프레임을 울음 소리가 있는 구간으로 본다
+    noise_floor = np.percentile(frame_db, 10)
+    return frame_db > max(noise_floor + ACTIVE_OVER_NOISE_DB, SILENCE_DB)
+
+
+def analyze_samples(samples: np.ndarray, sample_rate: int) -> AudioAnalysis:
+    frame_length = max(1, sample_rate * FRAME_MS // 1000)
+    hop_length = max(1, sample_rate * HOP_MS // 1000)
+
+    frame_db = to_db(frame_rms(samples, frame_length, hop_length))
+
+    active = active_frames(frame_db)
+    active_ratio = float(active.mean())
+
+    # 울음 강도는 소리가 있는 프레임의 평균 에너지로 판단
+    active_db = frame_db[active] if active.any() else frame_db
+    rms_db = float(to_db(np.sqrt(np.mean(10 ** (active_db / 10)))))
+    peak_db = float(to_db(np.max(np.abs(samples)))) if len(samples) else SILENCE_DB
+
+    return AudioAnalysis(
+        duration=round(len(samples) / sample_rate, 3),
+        rms_db=round(rms_db, 2),
+        peak_db=round(peak_db, 2),
+        active_ratio=round(active_ratio, 3),
+        intensity=classify_intensity(rms_db),
+    )
+
+
+def analyze_wav(file_path: str) -> AudioAnalysis:
+    """wav 파일을 한 번 디코딩해 실제 길이, 에너지 기반 강도, 소리 구간 비율을 계산한다."""
+    samples, sample_rate = decode_wav(file_path)
+    return analyze_samples(samples, sample_rate)
+
+
+def detect_segments(samples: np.ndarray, sample_rate: int,
+                    min_duration: float = 0.3, min_gap: float = 0.3,
+                    max_duration: float = 10.0) -> List[Tuple[int, int]]:
+    """
+    긴 녹음에서 에너지 기반 VAD로 개별 울음 구간을 찾아 (시작 샘플, 끝 샘플) 목록으로 반환한다.
+    min_gap보다 짧은 무음으로 나뉜 구간은 합치고, min_duration보다 짧은 구간은 버리며,
+    max_duration보다 긴 구간은 나눈다.
+    """
+    frame_length = max(1, sample_rate * FRAME_MS // 1000)
+    hop_length = max(1, sample_rate * HOP_MS // 1000)
+
+    active = active_frames(to_db(frame_rms(samples, frame_length, hop_length)))
+
+    # 활성 구간의 시작/끝 프레임 인덱스
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return []
+
+    # 짧은 무음으로 나뉜 구간 병합
+    min_gap_frames = int(np.ceil(min_gap * 1000 / HOP_MS))
+    keep = np.concatenate(([True], starts[1:] - ends[:-1] >= min_gap_frames))
+    starts = starts[keep]
+    ends = ends[np.concatenate((keep[1:], [True]))]
+
+    # 프레임 인덱스 -> 샘플 인덱스
+    start_samples = starts * hop_length
+    end_samples = np.minimum((ends - 1) * hop_length + frame_length, len(samples))
+
+    lengths = end_samples - start_samples
+    long_enough = lengths >= int(min_duration * sample_rate)
+    start_samples, end_samples = start_samples[long_enough], end_samples[long_enough]
+
+    # 너무 긴 구간은 max_duration 단위로 분할
+    max_samples = int(max_duration * sample_rate)
+    n_parts = np.maximum(1, np.ceil((end_samples - start_samples) / max_samples).astype(int))
+    part_starts = np.repeat(start_samples, n_parts) + max_samples * (
+        np.arange(n_parts.sum()) - np.repeat(np.cumsum(n_parts) - n_parts, n_parts))
+    part_ends = np.minimum(part_starts + max_samples, np.repeat(end_samples, n_parts))
+
+    return list(zip(part_starts.tolist(), part_ends.tolist()))
+
+
+def write_wav(file_path: str, samples: np.ndarray, sample_rate: int) -> None:
+    """[-1, 1] 범위의 mono float 배열을 16bit PCM wav 파일로 저장한다."""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(file_path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
@@ -0,0 +1,200 @@
+# utils/cache.py
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+
+class LRUCache:
+    """프로세스 메모리 캐시. max_size를 넘으면 가장 오래 사용되지 않은 항목부터 제거하며, ttl(초)이 지나면 만료된다."""
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskCache:
+    """
+    디렉토리에 key별 JSON 파일로 저장하는 캐시. 프로세스 재시작 후에도 유지된다.
+    ttl(초)이 지난 파일과, 전체 크기가 max_bytes를 넘을 때 가장 오래된 파일부터 정리한다.
+    """
+
+    def __init__(self, dir_path: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.dir_path = dir_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        os.makedirs(dir_path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._last_evicted_at = time.time()
+        # 같은 key를 덮어쓴 경우도 더해지는 근사값이며, 정리할 때 실제 크기로 다시 맞춘다
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.dir_path, f'{key}.json')
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """(파일 경로, 수정 시각, 크기) 목록. 쓰는 중인 임시 파일은 제외한다."""
+        entries = []
+        with os.scandir(self.dir_path) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def get(self, key: str) -> Optional[Any]:
+        file_path = self._path(key)
+        try:
+            if self.ttl and os.path.getmtime(file_path) + self.ttl < time.time():
+                os.remove(file_path)
+                return None
+            with open(file_path, 'r') as f:
+                return json.loads(f.read())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        file_path = self._path(key)
+        tmp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        data = json.dumps(value, ensure_ascii=False)
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+
+        with self._lock:
+            self._size += len(data.encode())
+            over_size = self.max_bytes is not None and self._size > self.max_bytes
+            ttl_sweep_due = self.ttl and self._last_evicted_at + self.ttl < time.time()
+        if over_size or ttl_sweep_due:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> int:
+        """만료된 파일을 지우고, max_bytes를 넘으면 오래된 파일부터 max_bytes의 80%까지 지운다."""
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.8 if self.max_bytes is not None else None
+
+        removed = 0
+        for file_path, mtime, size in entries:
+            expired = self.ttl and mtime + self.ttl < now
+            if not expired and (target is None or total <= target):
+                continue
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._size = total
+            self._last_evicted_at = now
+            self.evictions += removed
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            'disk_entries': len(entries),
+            'disk_size_bytes': sum(size for _, _, size in entries),
+            'disk_max_bytes': self.max_bytes,
+            'disk_evictions': self.evictions,
+        }
+
+
+class TwoTierCache:
+    """메모리(LRU/TTL) 캐시 뒤에 선택적인 디스크 캐시를 둔 2단 캐시. 적중/실패 횟수를 집계한다."""
+
+    def __init__(self, memory: LRUCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'memory_size': len(self.memory),
+            'memory_max_size': self.memory.max_size,
+            **(self.disk.stats() if self.disk is not None else {}),
+        }
@@ -1,11 +1,14 @@
 # utils/converters.py
+from typing import Tuple
+
 from model.user import UserTable
 from model.pet import PetTable
 from model.cry import CryTable
+from model.cry_job import CryJobTable
 
 from schemas.user import User
 from schemas.pet import Pet
-from schemas.cry import Cry
+from schemas.cry import Cry, CryJob
 
 
 def user_table_to_schema(user_table: UserTable) -> User:
@@ -37,7 +40,8 @@ def pet_table_to_schema(pet_table: PetTable) -> Pet:
 
 
 def cry_table_to_schema(cry_table: CryTable) -> Cry:
-    return Cry(
+    # DB 값은 저장할 때 이미 검증했으므로 validator를 다시 돌리지 않는다
+    return Cry.trusted(
         id=cry_table.id,
         pet_id=cry_table.pet_id,
         time=cry_table.time,
@@ -47,3 +51,26 @@ def cry_table_to_schema(cry_table: CryTable) -> Cry:
         intensity=cry_table.intensity,
         duration=cry_table.duration
     )
+
+
+def cry_row_to_schema(row, fields: Tuple[str, ...]) -> Cry:
+    """fields에 필요한 컬럼만 읽은 Row(CryService._cry_columns)로 fields만 있는 Cry를 만든다."""
+    values = row._mapping
+    cry = {field: values[field] for field in fields if field != 'predictMap'}
+    if 'predictMap' in fields:
+        cry['predictMap'] = CryTable.decode_predict_columns(
+            values['predict_schema'], values['predict_probs'], values['predict_map_json'])
+    return Cry.trusted(**cry)
+
+
+def cry_job_table_to_schema(cry_job_table: CryJobTable, cry_table: CryTable = None) -> CryJob:
+    return CryJob(
+        id=cry_job_table.id,
+        pet_id=cry_job_table.pet_id,
+        status=cry_job_table.status,
+        attempts=cry_job_table.attempts,
+        error=cry_job_table.error,
+        created_at=cry_job_table.created_at,
+        updated_at=cry_job_table.updated_at,
+        cry=cry_table_to_schema(cry_table).to_korean() if cry_table else None
+    )
@@ -0,0 +1,45 @@
+# utils/etag.py
+import hashlib
+from typing import Optional
+
+# 응답 JSON 형식이 바뀌는 배포에서 올려 클라이언트에 남은 예전 ETag가 맞지 않게 한다
+ETAG_FORMAT_VERSION = 1
+# CompressionMiddleware가 압축한 응답의 ETag에 붙이는 접미사 (content-coding마다 표현이 다르므로 strong ETag도 달라야 한다)
+ETAG_ENCODING_SUFFIXES = ('-gzip', '-br')
+
+
+def make_etag(*parts, weak: bool = False) -> str:
+    """
+    parts(경로, 쿼리, 사용자, 데이터 버전 등)로 ETag를 만든다.
+    strong ETag는 parts가 같으면 응답 body도 byte 단위로 같아야 한다.
+    다시 계산하면 body가 조금 달라질 수 있지만 의미는 같은 응답이면 weak=True (W/ 접두사).
+    """
+    digest = hashlib.sha256(repr((ETAG_FORMAT_VERSION,) + parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_with_encoding(etag: str, encoding: str) -> str:
+    """'"<tag>"' -> '"<tag>-<encoding>"'"""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def match_etag(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    If-None-Match의 ETag 중 etag와 같은 것을 돌려준다 (없으면 None).
+    If-None-Match는 weak 비교를 하므로 W/를 무시하고, 압축 접미사가 붙은 ETag도 같은 것으로 본다.
+    """
+    if not if_none_match:
+        return None
+    etag = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return etag
+        tag = candidate[2:] if candidate.startswith('W/') else candidate
+        for suffix in ETAG_ENCODING_SUFFIXES:
+            if tag.endswith(f'{suffix}"'):
+                tag = f'{tag[:-len(suffix) - 1]}"'
+                break
+        if tag == etag:
+            return candidate
+    return None
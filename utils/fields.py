@@ -0,0 +1,19 @@
+# utils/fields.py
+from typing import Optional, Sequence, Tuple
+
+from error.exceptions import ValidationError
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    목록 API의 fields= 쿼리 값('id,time,state')을 응답에 넣을 필드 이름들로 바꾼다 (sparse fieldset).
+    값이 없으면 None(모든 필드)이고, 순서는 allowed 순서를 따른다. 모르는 필드가 있으면 ValidationError.
+    """
+    if fields is None or not fields.strip():
+        return None
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValidationError(
+            f"Unknown fields {sorted(unknown)} (allowed: {', '.join(allowed)})")
+    return tuple(field for field in allowed if field in requested)
@@ -1,4 +1,9 @@
 import os
+import uuid
+import hashlib
+from typing import Tuple
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 
 def search_filename(file_id: str, dir_path: str):
@@ -30,3 +35,59 @@ def get_image_path(file_id: str, search_in_dir: str):
         return None
 
     return search_filename(file_id, dir_path)
+
+
+async def save_upload_to_temp(file: UploadFile, dir_path: str, chunk_size: int = 1024 * 1024) -> Tuple[str, str, int]:
+    """
+    업로드 파일을 chunk_size 단위로 읽어 dir_path 안의 임시 파일에 기록한다.
+    파일 전체를 메모리에 올리지 않으며, 쓰기는 threadpool에서 수행한다.
+    (임시 파일 경로, sha256 hex digest, 파일 크기)를 반환한다.
+    """
+    tmp_path = os.path.join(dir_path, f'.{uuid.uuid4().hex}.part')
+    digest = hashlib.sha256()
+    size = 0
+
+    f = await run_in_threadpool(open, tmp_path, 'wb')
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+            await run_in_threadpool(f.write, chunk)
+    except Exception:
+        await run_in_threadpool(f.close)
+        remove_file(tmp_path)
+        raise
+    await run_in_threadpool(f.close)
+
+    return tmp_path, digest.hexdigest(), size
+
+
+def atomic_move(src_path: str, dst_path: str, replace: bool = True) -> None:
+    # 같은 파일시스템 안에서의 rename은 원자적이므로 읽는 쪽이 쓰다 만 파일을 보지 않는다
+    if replace:
+        os.replace(src_path, dst_path)
+        return
+    link_file(src_path, dst_path)
+    os.remove(src_path)
+
+
+def link_file(src_path: str, dst_path: str) -> None:
+    # link는 dst_path가 이미 있으면 FileExistsError로 실패하므로 다른 녹음을 덮어쓰지 않는다
+    os.link(src_path, dst_path)
+
+
+def remove_file(file_path: str) -> None:
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def atomic_write_text(file_path: str, text: str) -> None:
+    tmp_path = f'{file_path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    atomic_move(tmp_path, file_path)
@@ -0,0 +1,38 @@
+# utils/pagination.py
+import base64
+from datetime import datetime
+from typing import Tuple
+
+from error.exceptions import ValidationError
+
+
+def encode_cursor(time: datetime, row_id: int) -> str:
+    """(time, id) keyset 위치를 클라이언트에 넘길 불투명한 문자열로 만든다."""
+    raw = f"{time.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        time_text, row_id = raw.split('|')
+        return datetime.fromisoformat(time_text), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValidationError("Invalid cursor") from e
+
+
+def encode_change_cursor(change_seq: int, cry_id: int) -> str:
+    """변경 feed에서 마지막으로 받은 (change_seq, cry id) 위치를 불투명한 문자열로 만든다."""
+    raw = f"c{change_seq}|{cry_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        if not raw.startswith('c'):
+            raise ValueError(raw)
+        change_seq, cry_id = raw[1:].split('|')
+        return int(change_seq), int(cry_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValidationError("Invalid cursor") from e
@@ -0,0 +1,34 @@
+# utils/response.py
+from typing import Optional, Sequence
+from fastapi.responses import ORJSONResponse
+
+from schemas.common import BaseOutput
+from schemas.cry import localize_cry_dict
+
+
+def sparse_include(output: BaseOutput, list_field: str, fields: Optional[Sequence[str]]) -> Optional[dict]:
+    """output.list_field의 항목마다 fields만 남기는 model_dump include. fields가 None이면 None(모든 필드)."""
+    if fields is None:
+        return None
+    include = {name: True for name in type(output).model_fields}
+    include[list_field] = {'__all__': set(fields)}
+    return include
+
+
+def sparse_response(output: BaseOutput, list_field: str, fields: Optional[Sequence[str]]) -> ORJSONResponse:
+    """fields만 남긴 목록 응답. 일부 필드만 있는 항목은 response_model 검증을 통과하지 못하므로 Response로 바로 돌려준다."""
+    return ORJSONResponse(output.model_dump(include=sparse_include(output, list_field, fields)))
+
+
+def cry_response(output: BaseOutput, fields: Optional[Sequence[str]] = None) -> ORJSONResponse:
+    """
+    울음 응답 output(cry 또는 cries 필드)을 직렬화하면서 state, intensity를 한국어로 바꾸고 orjson으로 인코딩한다.
+    Response를 바로 돌려주므로 FastAPI가 response_model로 응답을 다시 검증하지 않는다 (response_model은 문서용).
+    fields가 있으면 cries의 각 울음에 그 필드만 남긴다.
+    """
+    content = output.model_dump(include=sparse_include(output, 'cries', fields))
+    if content.get('cry') is not None:
+        localize_cry_dict(content['cry'])
+    for cry in content.get('cries') or ():
+        localize_cry_dict(cry)
+    return ORJSONResponse(content)
@@ -0,0 +1,50 @@
+# utils/sql.py
+from typing import Optional, Sequence
+from sqlalchemy import Integer, Row, cast, func, insert, select, update
+from sqlalchemy.dialects import mysql, sqlite
+
+
+def sql_date(column, dialect_name: str):
+    """datetime 컬럼의 날짜 부분 (SQLite: 'YYYY-MM-DD' 문자열, MySQL: DATE)."""
+    return func.date(column)
+
+
+def sql_hour(column, dialect_name: str):
+    """datetime 컬럼의 시(0~23)."""
+    if dialect_name == 'sqlite':
+        return cast(func.strftime('%H', column), Integer)
+    return func.hour(column)
+
+
+def upsert_add(db, table, keys: dict, deltas: dict, returning: Sequence = ()) -> Optional[Row]:
+    """
+    keys 행이 없으면 deltas 값으로 만들고, 있으면 각 컬럼에 deltas를 더한다 (SQLite/MySQL은 한 문장으로).
+    returning 컬럼이 있으면 반영된 행의 그 값들을 돌려준다 (SQLite는 RETURNING, 그 외는 같은 트랜잭션에서 다시 읽는다).
+    """
+    dialect_name = db.get_bind().dialect.name
+    values = {**keys, **deltas}
+
+    if dialect_name == 'sqlite':
+        stmt = sqlite.insert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + stmt.excluded[column] for column in deltas})
+        if returning:
+            return db.execute(stmt.returning(*returning)).first()
+        db.execute(stmt)
+        return None
+    elif dialect_name == 'mysql':
+        stmt = mysql.insert(table).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            **{column: table.c[column] + stmt.inserted[column] for column in deltas})
+        db.execute(stmt)
+    else:
+        where = [table.c[column] == value for column, value in keys.items()]
+        result = db.execute(update(table).where(*where).values(
+            **{column: table.c[column] + delta for column, delta in deltas.items()}))
+        if result.rowcount == 0:
+            db.execute(insert(table).values(**values))
+    if returning:
+        return db.execute(select(*returning).where(
+            *(table.c[column] == value for column, value in keys.items()))).first()
+    return None